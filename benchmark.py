@@ -0,0 +1,487 @@
+"""Offline-Benchmark für export_enhanced_v2.py
+
+Startet einen lokalen HTTP-Server mit synthetischen ChatGPT-ähnlichen Seiten
+(Sidebar, Projektseiten unter /g/g-p-..., Chats unter /c/... und das
+Conversation-JSON unter /backend-api/conversation/...) und misst den Exporter
+headless dagegen - ohne Account und ohne echte Website.
+
+Beispiele:
+  python benchmark.py                                   # Alle Szenarien, Standardgrößen
+  python benchmark.py --chats 100 --turns 40 --workers 4
+  python benchmark.py --scenarios keywords extract      # Nur ausgewählte Szenarien
+  python benchmark.py --output neu.json --compare alt.json
+"""
+
+import asyncio, argparse, builtins, functools, inspect, json, os, pathlib, platform, random, re
+import sys, tempfile, threading, time, zlib
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import export_enhanced_v2 as exporter
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ============================================================================
+# SYNTHETISCHE INHALTE
+# ============================================================================
+
+VOCABULARY = (
+    "projekt export playwright browser sidebar markdown screenshot metadaten keyword "
+    "analyse daten server netzwerk antwort frage beispiel konfiguration datei ordner "
+    "python script funktion parameter ergebnis fehler warnung backup archiv suche "
+    "index dokument kontext sitzung nutzer assistent modell training prompt tabelle "
+    "bitwig synthesizer musik studio aufnahme mischung plugin effekt kanal spur "
+    "nordrhein westfalen stadt gemeinde verwaltung bericht planung termin kosten"
+).split()
+
+PROPER_NOUNS = ["Bad Sassendorf", "OWL", "NRW", "MCP", "Bitwig", "Playwright", "Soest"]
+
+def synthetic_text(rng, chars):
+    """Erzeugt deutschen Fließtext ungefähr der gewünschten Länge"""
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(PROPER_NOUNS) if rng.random() < 0.03 else rng.choice(VOCABULARY)
+        words.append(word)
+        length += len(word) + 1
+    sentences = []
+    for i in range(0, len(words), 12):
+        sentence = " ".join(words[i:i + 12])
+        sentences.append(sentence[:1].upper() + sentence[1:] + ".")
+    return " ".join(sentences)
+
+class MockSite:
+    """Beschreibt den synthetischen Account: normale Chats und Projekte mit Chats"""
+
+    def __init__(self, chats=20, projects=2, project_chats=5, turns=20, turn_chars=600, seed=1):
+        self.turns = turns
+        self.turn_chars = turn_chars
+        self.seed = seed
+        self.chat_ids = [f"bench-{i:06d}" for i in range(chats)]
+        self.projects = {}
+        for p in range(projects):
+            project_slug = f"g-p-bench{p}-projekt-{p}"
+            ids = [f"bench-p{p}-{i:06d}" for i in range(project_chats)]
+            self.projects[project_slug] = {"name": f"Benchmark Projekt {p}", "chat_ids": ids}
+        self._cache = {}
+
+    def chat_urls(self, base_url):
+        return [f"{base_url}/c/{chat_id}" for chat_id in self.chat_ids]
+
+    def project_chat_urls(self, base_url):
+        return [f"{base_url}/g/{project_slug}/c/{chat_id}"
+                for project_slug, project in self.projects.items() for chat_id in project["chat_ids"]]
+
+    def total_chats(self):
+        return len(self.chat_ids) + sum(len(p["chat_ids"]) for p in self.projects.values())
+
+    def conversation(self, chat_id):
+        """Turns eines Chats (deterministisch pro ID, gecacht)"""
+        if chat_id not in self._cache:
+            rng = random.Random(zlib.crc32(chat_id.encode()) ^ self.seed)
+            turns = []
+            for n in range(self.turns):
+                role = "user" if n % 2 == 0 else "assistant"
+                # Nutzerfragen kürzer als Antworten
+                chars = self.turn_chars // 3 if role == "user" else self.turn_chars
+                turns.append({"id": f"{chat_id}-m{n}", "role": role, "text": synthetic_text(rng, chars)})
+            self._cache[chat_id] = turns
+        return self._cache[chat_id]
+
+# ============================================================================
+# MOCK-SERVER
+# ============================================================================
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="de"><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ display: flex; margin: 0; font-family: sans-serif; }}
+nav {{ width: 260px; height: 100vh; overflow-y: auto; background: #f4f4f4; }}
+main {{ flex: 1; padding: 16px; }}
+[data-message-author-role="user"] {{ background: #eef; margin: 8px 0; padding: 8px; }}
+[data-message-author-role="assistant"] {{ margin: 8px 0; padding: 8px; }}
+</style></head>
+<body>
+<nav><div data-testid="project-list">{projects}</div>
+<div data-testid="conversation-list">{sidebar}</div></nav>
+<main>{main}</main>
+{script}
+</body></html>"""
+
+def escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def make_handler(site, latency_ms=0):
+    """Request-Handler für die synthetische Seite"""
+
+    chat_path_re = re.compile(r"^(?:/g/([^/]+))?/c/([0-9a-zA-Z-]+)$")
+    project_path_re = re.compile(r"^/g/([^/]+)/project$")
+    api_path_re = re.compile(r"^/backend-api/conversation/([0-9a-zA-Z-]+)$")
+
+    def sidebar():
+        return "".join(f'<a href="/c/{chat_id}">Chat {chat_id}</a><br>' for chat_id in site.chat_ids)
+
+    def project_links():
+        return "".join(f'<a href="/g/{project_slug}/project">{project["name"]}</a><br>'
+                       for project_slug, project in site.projects.items())
+
+    def page(title, main="", script=""):
+        return PAGE_TEMPLATE.format(title=escape(title), projects=project_links(), sidebar=sidebar(),
+                                    main=main, script=script)
+
+    def chat_page(chat_id):
+        turns = "".join(
+            f'<div data-testid="conversation-turn" data-message-author-role="{t["role"]}" '
+            f'data-message-id="{t["id"]}"><p>{escape(t["text"])}</p></div>'
+            for t in site.conversation(chat_id))
+        # Wie die echte Web-App: Inhalt zusätzlich als JSON nachladen
+        script = f'<script>fetch("/backend-api/conversation/{chat_id}").then((r) => r.json());</script>'
+        return page(f"Benchmark Chat {chat_id}", turns, script)
+
+    def conversation_json(chat_id):
+        mapping = {"root": {"id": "root", "parent": None, "message": None}}
+        parent = "root"
+        for t in site.conversation(chat_id):
+            mapping[t["id"]] = {"id": t["id"], "parent": parent, "message": {
+                "id": t["id"],
+                "author": {"role": t["role"]},
+                "create_time": 1700000000.0,
+                "content": {"content_type": "text", "parts": [t["text"]]},
+                "metadata": {},
+            }}
+            parent = t["id"]
+        return {"title": f"Benchmark Chat {chat_id}", "mapping": mapping, "current_node": parent}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            path = self.path.split("?", 1)[0].rstrip("/") or "/"
+
+            match = api_path_re.match(path)
+            if match:
+                return self.send(json.dumps(conversation_json(match.group(1))), "application/json")
+            match = chat_path_re.match(path)
+            if match:
+                return self.send(chat_page(match.group(2)))
+            match = project_path_re.match(path)
+            if match and match.group(1) in site.projects:
+                project_slug = match.group(1)
+                chats = "".join(f'<a href="/g/{project_slug}/c/{chat_id}">Projekt-Chat {chat_id}</a><br>'
+                                for chat_id in site.projects[project_slug]["chat_ids"])
+                return self.send(page(site.projects[project_slug]["name"], chats))
+            if path == "/":
+                return self.send(page("ChatGPT"))
+            self.send_error(404)
+
+        def send(self, body, content_type="text/html; charset=utf-8"):
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+class MockServer:
+    """Lokaler HTTP-Server im Hintergrund-Thread (als Context-Manager)"""
+
+    def __init__(self, site, latency_ms=0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(site, latency_ms))
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+# ============================================================================
+# MESSUNG
+# ============================================================================
+
+# Exporter-Funktionen, deren Laufzeit pro Aufruf gemessen wird
+STAGES = [
+    "export_chat_url", "export_chat", "wait_for_conversation_ready", "goto_and_capture_turns",
+    "extract_turns", "as_markdown", "render_markdown", "extract_auto_keywords", "save_chat_metadata",
+    "save_pdf", "save_screenshots_for_chat", "save_raw_html",
+]
+
+class StageTimer:
+    """Ersetzt Exporter-Funktionen durch zeitmessende Wrapper (Modul-Attribute)"""
+
+    def __init__(self, module, names=STAGES):
+        self.module = module
+        self.names = names
+        self.samples = {}
+        self.originals = {}
+
+    def __enter__(self):
+        for name in self.names:
+            original = getattr(self.module, name)
+            self.originals[name] = original
+            setattr(self.module, name, self._wrap(name, original))
+        return self
+
+    def __exit__(self, *exc):
+        for name, original in self.originals.items():
+            setattr(self.module, name, original)
+
+    def _wrap(self, name, fn):
+        samples = self.samples.setdefault(name, [])
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    samples.append(time.perf_counter() - start)
+        else:
+            @functools.wraps(fn)
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    samples.append(time.perf_counter() - start)
+        return timed
+
+    def summary(self):
+        return {name: percentiles(values) for name, values in self.samples.items() if values}
+
+def percentiles(values):
+    """Anzahl, Summe und Perzentile in Millisekunden (Nearest-Rank)"""
+    ordered = sorted(values)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))] * 1000
+
+    return {
+        "count": len(ordered),
+        "total_ms": round(sum(ordered) * 1000, 2),
+        "p50_ms": round(rank(50), 2),
+        "p90_ms": round(rank(90), 2),
+        "p99_ms": round(rank(99), 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+def peak_rss_mb():
+    """Höchster Speicherverbrauch (Python-Prozess und beendete Kindprozesse, z.B. Browser)"""
+    if resource is None:
+        return None
+    # Linux meldet KB, macOS Bytes
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+def scenario_result(duration, chats, timer):
+    result = {"duration_s": round(duration, 3), "chats": chats, "stages": timer.summary()}
+    if chats:
+        result["chats_per_min"] = round(chats / duration * 60, 2)
+    return result
+
+# ============================================================================
+# SZENARIEN
+# ============================================================================
+
+def bench_keywords(site, args):
+    """extract_auto_keywords (einzeln und als Batch) auf den Markdown-Texten aller synthetischen Chats"""
+    texts = [exporter.as_markdown(site.conversation(chat_id)) for chat_id in site.chat_ids]
+    with StageTimer(exporter, ["extract_auto_keywords"]) as timer:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for text in texts:
+                exporter.extract_auto_keywords(text)
+        duration = time.perf_counter() - start
+    result = scenario_result(duration, 0, timer)
+    
+    # Dieselben Texte über die Batch-API (ab KEYWORD_BATCH_MIN_PARALLEL im Prozess-Pool)
+    start = time.perf_counter()
+    exporter.extract_auto_keywords_batch(texts * args.repeat)
+    result["batch_duration_s"] = round(time.perf_counter() - start, 3)
+    return result
+
+async def bench_extract(site, server, args, pw):
+    """extract_turns wiederholt auf einer geladenen Chatseite"""
+    browser = await pw.chromium.launch(headless=True)
+    try:
+        page = await browser.new_page()
+        await page.goto(site.chat_urls(server.url)[0], wait_until="domcontentloaded")
+        await exporter.wait_for_conversation_ready(page)
+        with StageTimer(exporter, ["extract_turns"]) as timer:
+            start = time.perf_counter()
+            for _ in range(args.repeat * 10):
+                await exporter.extract_turns(page)
+            duration = time.perf_counter() - start
+    finally:
+        await browser.close()
+    return scenario_result(duration, 0, timer)
+
+async def bench_export_list(site, server, args, pw, workdir):
+    """export_chat_list über alle normalen Chats (eigener headless Kontext)"""
+    browser = await pw.chromium.launch(headless=True)
+    exporter.OUTPUT_WRITER = exporter.OutputWriter()
+    try:
+        page = await browser.new_page()
+        await page.goto(f"{server.url}/", wait_until="domcontentloaded")
+        dirs = exporter.create_directory_structure(workdir / "export_chat_list")
+        urls = site.chat_urls(server.url)
+        with StageTimer(exporter) as timer:
+            start = time.perf_counter()
+            exported = await exporter.export_chat_list(page, urls, dirs, None, args.keywords, None,
+                                                       workers=args.workers)
+            await exporter.OUTPUT_WRITER.close()
+            duration = time.perf_counter() - start
+    finally:
+        exporter.OUTPUT_WRITER = None
+        await browser.close()
+    return scenario_result(duration, exported, timer)
+
+async def bench_run(site, server, args, workdir):
+    """Kompletter run() mit --all gegen den Mock-Server (neues Profil, headless)"""
+    exporter.USER_DATA_DIR = str(workdir / "profile")
+    exporter.BROWSER_CHANNEL = None
+    exporter.BROWSER_HEADLESS = True
+    exporter.BACKUP_LOCATIONS = []
+
+    # run() fragt nach Login und vor dem Schließen per ENTER
+    original_input = builtins.input
+    builtins.input = lambda prompt="": ""
+    try:
+        with StageTimer(exporter) as timer:
+            start = time.perf_counter()
+            await exporter.run(export_all=True, keywords=args.keywords, workers=args.workers)
+            duration = time.perf_counter() - start
+    finally:
+        builtins.input = original_input
+    exported = timer.samples.get("export_chat", [])
+    return scenario_result(duration, len(exported), timer)
+
+async def run_browser_scenarios(site, server, args, workdir, results):
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as pw:
+        if "extract" in args.scenarios:
+            results["extract"] = await bench_extract(site, server, args, pw)
+        if "list" in args.scenarios:
+            results["list"] = await bench_export_list(site, server, args, pw, workdir)
+    # run() startet seinen eigenen Playwright-Treiber
+    if "run" in args.scenarios:
+        results["run"] = await bench_run(site, server, args, workdir)
+
+# ============================================================================
+# AUSGABE & VERGLEICH
+# ============================================================================
+
+def print_summary(report):
+    print("\n" + "="*60)
+    print("BENCHMARK-ERGEBNIS")
+    print("="*60)
+    for name, result in report["results"].items():
+        rate = f", {result['chats_per_min']} Chats/min" if "chats_per_min" in result else ""
+        batch = f" (Batch: {result['batch_duration_s']:.2f}s)" if "batch_duration_s" in result else ""
+        print(f"{name}: {result['duration_s']:.2f}s{rate}{batch}")
+        for stage, stats in sorted(result["stages"].items()):
+            print(f"  {stage:28s} {stats['count']:5d}x  p50 {stats['p50_ms']:8.1f} ms  "
+                  f"p90 {stats['p90_ms']:8.1f} ms  p99 {stats['p99_ms']:8.1f} ms")
+    if report["peak_rss_mb"]:
+        print(f"Peak RSS: {report['peak_rss_mb']['self']} MB (Python), "
+              f"{report['peak_rss_mb']['children']} MB (Kindprozesse)")
+
+def print_comparison(report, baseline_path):
+    """Vergleicht Chats/min und p50 pro Stufe mit einem früheren Ergebnis"""
+    baseline = json.loads(pathlib.Path(baseline_path).read_text(encoding="utf-8"))
+    print(f"\nVergleich mit {baseline_path}:")
+    for name, result in report["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            continue
+        if "chats_per_min" in result and old.get("chats_per_min"):
+            change = (result["chats_per_min"] / old["chats_per_min"] - 1) * 100
+            print(f"  {name}: {old['chats_per_min']} -> {result['chats_per_min']} Chats/min ({change:+.1f}%)")
+        for stage, stats in sorted(result["stages"].items()):
+            old_stats = old.get("stages", {}).get(stage)
+            if old_stats and old_stats["p50_ms"]:
+                change = (stats["p50_ms"] / old_stats["p50_ms"] - 1) * 100
+                print(f"    {stage:28s} p50 {old_stats['p50_ms']:.1f} -> {stats['p50_ms']:.1f} ms ({change:+.1f}%)")
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+SCENARIOS = ["keywords", "extract", "list", "run"]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline-Benchmark für den ChatGPT-Export (lokaler Mock-Server, headless)")
+    parser.add_argument('--chats', type=int, default=20, help='Normale Chats in der Sidebar (Standard: 20)')
+    parser.add_argument('--projects', type=int, default=2, help='Anzahl Projekte (Standard: 2)')
+    parser.add_argument('--project-chats', type=int, default=5, help='Chats pro Projekt (Standard: 5)')
+    parser.add_argument('--turns', type=int, default=20, help='Turns pro Chat (Standard: 20)')
+    parser.add_argument('--turn-chars', type=int, default=600, help='Zeichen pro Assistant-Turn (Standard: 600)')
+    parser.add_argument('--latency-ms', type=int, default=0, help='Künstliche Server-Latenz pro Request')
+    parser.add_argument('--workers', type=int, default=1, help='Parallele Tabs wie --workers im Exporter')
+    parser.add_argument('--engine', choices=['dom', 'network'], default=exporter.EXTRACT_ENGINE,
+                        help='Extraktions-Engine des Exporters')
+    parser.add_argument('--keywords', nargs='+', default=["NRW", "Bitwig"], help='Tagging-Keywords')
+    parser.add_argument('--repeat', type=int, default=3, help='Wiederholungen für keywords/extract')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--output', default='benchmark_results.json', help='Ergebnis-Datei (JSON)')
+    parser.add_argument('--compare', help='Früheres Ergebnis zum Vergleich')
+    parser.add_argument('--keep', action='store_true', help='Arbeitsordner mit den Exporten behalten')
+    args = parser.parse_args()
+
+    site = MockSite(args.chats, args.projects, args.project_chats, args.turns, args.turn_chars)
+    exporter.EXTRACT_ENGINE = args.engine
+    output_path = pathlib.Path(args.output).absolute()
+
+    workdir = pathlib.Path(tempfile.mkdtemp(prefix="chatgpt_export_bench_"))
+    cwd = os.getcwd()
+    results = {}
+    with MockServer(site, args.latency_ms) as server:
+        exporter.CHATGPT_URL = server.url
+        print(f"Mock-Server: {server.url} ({site.total_chats()} Chats)")
+        print(f"Arbeitsordner: {workdir}")
+        # Exportordner, Manifest, Suchindex usw. landen im Arbeitsordner
+        os.chdir(workdir)
+        try:
+            if "keywords" in args.scenarios:
+                results["keywords"] = bench_keywords(site, args)
+            asyncio.run(run_browser_scenarios(site, server, args, workdir, results))
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "keep")},
+        "results": results,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    output_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print_summary(report)
+    print(f"\nGespeichert: {output_path}")
+    if args.compare:
+        print_comparison(report, args.compare)
+
+    if not args.keep:
+        import shutil
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
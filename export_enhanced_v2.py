@@ -1,6 +1,8 @@
-import asyncio, re, pathlib, json, hashlib, platform, socket, argparse, os
+import asyncio, re, pathlib, json, hashlib, platform, socket, argparse, os, sys, time, sqlite3, functools, weakref
+import shutil, threading, contextlib, itertools, io, tempfile, subprocess
 from datetime import datetime
-from playwright.async_api import async_playwright
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from collections import Counter
 
 # ============================================================================
@@ -36,6 +38,38 @@ USER_DATA_DIR = get_default_chrome_profile()
 # USER_DATA_DIR = "/Users/USERNAME/Library/Application Support/Google/Chrome/Default"  # macOS
 # USER_DATA_DIR = "/home/USERNAME/.config/google-chrome/Default"  # Linux
 
+# === ChatGPT-Adresse (für Tests auch ein lokaler Server mit gleichen Pfaden) ===
+CHATGPT_URL = "https://chatgpt.com"
+
+# === Browser ===
+# Standard: echtes Chrome sichtbar (Login/CAPTCHA von Hand); None = mitgeliefertes Chromium
+BROWSER_CHANNEL = "chrome"
+BROWSER_HEADLESS = False
+
+# === Unbeaufsichtigter Modus (--unattended) ===
+# Login einmal mit "login" sichern; danach läuft der Export headless mit diesem
+# Storage-State (Cookies + Local Storage) statt mit dem vollen Chrome-Profil.
+STORAGE_STATE_PATH = "chatgpt_storage_state.json"
+LOGIN_DETECT_MS = 10000   # So lange nach der Chatliste suchen, bevor "nicht eingeloggt" gilt
+LOGIN_WAIT_MS = 300000    # "login": max. Zeit für den manuellen Login
+
+# Exit-Codes (für Aufgabenplanung/cron)
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_NOT_LOGGED_IN = 2
+EXIT_PARTIAL = 3          # Lauf fertig, aber einzelne Chats sind fehlgeschlagen
+
+# === Daemon ("serve") ===
+# Hält Browser und Tabs warm und nimmt Export-Jobs per HTTP an (nur localhost)
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 8765
+DAEMON_PAGE_POOL = 8      # Max. freie Tabs, die zwischen Jobs offen bleiben
+
+# === Sharding (--shards K) ===
+# Ein Koordinator liest alle Chat-URLs, verteilt sie auf K Prozesse mit eigenem
+# Browser (gespeicherter Login) und führt am Ende alles in einem Exportordner zusammen
+SHARD_BY = "hash"         # "hash" (Conversation-ID) oder "project" (ganze Projekte pro Prozess)
+
 # === Zusätzliche Backup-Orte (optional - leer lassen wenn nicht gewünscht) ===
 BACKUP_LOCATIONS = [
     # Hier kannst du optional weitere Pfade eintragen:
@@ -43,11 +77,113 @@ BACKUP_LOCATIONS = [
     # r"E:\USB_Stick\ChatGPT",
 ]
 
+# Backups sind inkrementell: pro Ziel merkt sich ein Hash-Manifest, was schon
+# dort liegt. Nur neue/geänderte Dateien werden kopiert (und danach geprüft),
+# identische Inhalte aus früheren Exporten werden wenn möglich hart verlinkt.
+BACKUP_THREADS = 4
+BACKUP_CREATE_MISSING = False  # Fehlende Backup-Ordner anlegen statt überspringen
+BACKUP_MANIFEST_NAME = ".backup_manifest.json"
+
 # === Erweiterte Features ===
 SAVE_SCREENSHOTS = True
 SAVE_RAW_HTML = True
+SAVE_PDF = True
 SAVE_METADATA = True  # Jetzt IMMER für alle Chats
 
+# === Vollbild-Screenshots ===
+# "full":     ein page.screenshot(full_page=True) - bei Fehler (z.B. Texturgrenze) Kacheln
+# "tiles":    Scroll-Bereich des Chats bildschirmweise abfotografieren (-full-001, -002, ...)
+# "stitched": Kacheln zu Bildern von max. SCREENSHOT_STITCH_MAX_PX Höhe zusammensetzen (Pillow)
+SCREENSHOT_MODE = "full"
+SCREENSHOT_FORMAT = "png"       # "png", "jpeg" oder "webp" (webp braucht Pillow)
+SCREENSHOT_QUALITY = 80         # Für jpeg/webp (1-100)
+SCREENSHOT_MAX_TILES = 300      # Obergrenze pro Chat
+SCREENSHOT_STITCH_MAX_PX = 8000 # Höhe pro zusammengesetztem Bild (WebP erlaubt max. 16383)
+
+# === Keyword-Screenshots ===
+# Ausschnitte werden aus dem Vollbild-Screenshot geschnitten (mit Pillow, sonst per clip)
+KEYWORD_SCREENSHOT_ALL = False  # True = jedes Vorkommen (Absatz) statt nur das erste
+KEYWORD_SCREENSHOT_MAX = 10     # Max. Ausschnitte pro Keyword bei KEYWORD_SCREENSHOT_ALL
+KEYWORD_SCREENSHOT_PADDING = 16 # Rand um den Absatz in CSS-Pixeln
+
+# === Render-Pipeline ===
+# 0 = PDF/Screenshots direkt auf dem Chat-Tab (langsamster Schritt bestimmt das Tempo)
+# N = Chat-Tab macht nur einen Snapshot, N eigene Render-Tabs erzeugen PDF/Screenshots
+#     daraus, während der Chat-Tab schon zum nächsten Chat navigiert
+RENDER_WORKERS = 0
+RENDER_QUEUE_SIZE = 8  # Max. wartende Snapshots (Gegendruck auf den Crawl)
+
+# === Dateiausgabe ===
+# Markdown/Metadaten/HTML werden in einem Thread-Pool kodiert, gehasht und
+# atomar geschrieben (Temp-Datei + Umbenennen), damit der Event-Loop frei bleibt
+OUTPUT_WRITER_THREADS = 4
+OUTPUT_MAX_PENDING = 32  # Max. offene Schreibvorgänge, danach wartet der Export (Gegendruck)
+OUTPUT_FSYNC = False     # True = vor dem Umbenennen auf Platte erzwingen (langsamer, sicherer)
+MARKDOWN_CHUNK_CHARS = 256 * 1024  # Markdown wird in Stücken dieser Größe geschrieben, gehasht und durchsucht
+
+# === Ausgabeformat ===
+# "files":  bisherige Ordnerstruktur (markdown/, pdf/, metadata/, ...)
+# "bundle": alle Chat-Dateien in einer einzigen SQLite-Datei (chats.bundle) mit
+#           komprimierten Blobs und Index; "unpack" stellt die Ordnerstruktur her
+OUTPUT_FORMAT = "files"
+BUNDLE_NAME = "chats.bundle"
+
+# === Artifact-Store (Deduplizierung über Läufe) ===
+# Screenshots, PDFs und HTML landen einmal pro Inhalt (SHA256) im Store; die
+# Exportordner enthalten nur Hardlinks darauf. "gc" löscht Blobs, auf die kein
+# Export mehr verweist. Ohne Hardlink-Unterstützung wird normal geschrieben.
+DEDUP_ARTIFACTS = True
+ARTIFACT_STORE_DIR = "chatgpt_export_store"
+DEDUP_DIRS = ("screenshots", "pdf", "raw_html")
+
+# === Capture-Profil (Request-Routing) ===
+# "text-only": keine Bilder/Fonts/Medien, keine Fremd-Hosts (reicht für Markdown/Metadaten/HTML)
+# "archival":  Bilder/Fonts/CSS für PDF/Screenshots, aber keine Medien und Fremd-Hosts
+# "full":      alles laden (kein Routing)
+# "auto":      text-only ohne PDF/Screenshots, sonst full
+# Achtung: Routing schaltet den HTTP-Cache des Browsers ab (jeder Chat lädt JS/CSS neu).
+# "archival" lohnt sich daher nur, wenn Fremd-Hosts/Medien teurer sind als der Cache.
+CAPTURE_PROFILE = "auto"
+
+# === Extraktions-Engine ===
+# "dom":     Chat-Inhalt aus der gerenderten Seite lesen
+# "network": Conversation-JSON abfangen, das die Web-App ohnehin lädt
+#            (Fallback auf DOM wenn keine Antwort abgefangen wurde)
+EXTRACT_ENGINE = "dom"
+
+# === Manifest für inkrementellen Export / Resume ===
+# Liegt neben den Exportordnern und überlebt einzelne Läufe
+MANIFEST_PATH = "chatgpt_export_manifest.jsonl"
+
+# === Gelernte Selektoren ===
+# Welcher Selektor einer Fallback-Kette zuletzt gegriffen hat, wird zuerst
+# probiert und über Läufe hinweg gemerkt (ersetzt, sobald er nicht mehr passt).
+# Ausnahme: Turn-Selektoren behalten ihre feste Rangfolge (RANKED_CHAINS).
+LEARN_SELECTORS = True
+SELECTOR_PROFILE_PATH = "chatgpt_selector_profile.json"
+
+# === Korpus-Keywords (TF-IDF über alle exportierten Chats) ===
+CORPUS_TFIDF = True
+TFIDF_STATE_PATH = "chatgpt_export_tfidf.json"
+TFIDF_MAX_TERMS_PER_DOC = 100  # Nur die häufigsten Terme pro Chat merken (Speichergrenze)
+
+# === Volltext-Suchindex (SQLite FTS5, pro Turn) ===
+FULLTEXT_INDEX = True
+SEARCH_INDEX_PATH = "chatgpt_export_search.db"
+
+# === Wartezeiten (Obergrenzen in Millisekunden) ===
+# Statt fester Pausen wird auf DOM-Signale gewartet: Turn-Anzahl stabil,
+# kein Streaming-Indikator, Netzwerk ruhig. Die Werte sind nur Obergrenzen.
+WAIT_MAX_MS = 15000          # Max. Wartezeit bis ein Chat als "bereit" gilt
+WAIT_STABLE_MS = 500         # So lange muss die Turn-Anzahl unverändert bleiben
+WAIT_EMPTY_MS = 2000        # Chat ohne Turns gilt nach so langer Ruhe (Seite geladen) als leer
+WAIT_POLL_MS = 100           # Prüfintervall im Browser
+
+# === Tracing (Spans pro Stufe) ===
+# Schreibt trace.json (Chrome Trace-Event-Format, z.B. für chrome://tracing oder
+# Perfetto) und trace_summary.json neben export_info.json. Aus = kein Overhead.
+TRACE_ENABLED = False
+
 # ============================================================================
 # HILFSFUNKTIONEN
 # ============================================================================
@@ -58,6 +194,116 @@ def slug(s: str) -> str:
     s = re.sub(r"[^-\w]", "", s, flags=re.UNICODE)
     return s.lower()[:120] or "chat"
 
+# Deutsche und englische Stopwörter (einmal beim Import aufgebaut)
+STOPWORDS = frozenset({
+    # Deutsch
+    'der', 'die', 'das', 'und', 'oder', 'aber', 'ist', 'sind', 'war', 'waren',
+    'ein', 'eine', 'einer', 'einem', 'einen', 'ich', 'du', 'er', 'sie', 'es',
+    'wir', 'ihr', 'mit', 'von', 'zu', 'auf', 'für', 'nicht', 'auch', 'wenn',
+    'dass', 'als', 'wie', 'bei', 'nach', 'über', 'nur', 'noch', 'dann', 'kann',
+    'was', 'hat', 'haben', 'wird', 'werden', 'können', 'sollte', 'würde', 'hier',
+    'dort', 'jetzt', 'dann', 'mehr', 'sehr', 'ganz', 'immer', 'alle', 'meine',
+    'deine', 'seine', 'ihre', 'diese', 'dieses', 'dieser', 'welche', 'welches',
+    'welcher', 'bitte', 'danke', 'ja', 'nein', 'okay', 'ok',
+    # English
+    'the', 'and', 'or', 'but', 'is', 'are', 'was', 'were', 'a', 'an', 'i',
+    'you', 'he', 'she', 'it', 'we', 'they', 'with', 'from', 'to', 'for',
+    'not', 'also', 'if', 'that', 'as', 'like', 'at', 'after', 'about', 'only',
+    'can', 'will', 'would', 'should', 'could', 'has', 'have', 'had', 'do',
+    'does', 'did', 'be', 'been', 'being', 'here', 'there', 'now', 'then',
+    'more', 'very', 'all', 'my', 'your', 'his', 'her', 'its', 'our', 'their',
+    'this', 'that', 'these', 'those', 'which', 'what', 'please', 'thanks',
+    'yes', 'no', 'okay', 'ok'
+})
+
+# Wörter (mehr als 3 Zeichen), auf kleingeschriebenem Text.
+# Der Lookahead vorne lässt die Regex-Engine Nicht-Kandidaten schnell überspringen.
+WORD_RE = re.compile(r'(?=[a-zäöüß])\b[a-zäöüß]{4,}\b')
+
+# Ein Durchlauf über den Originaltext für Großgeschriebenes:
+# Gruppe 1 = Eigennamen (nicht am Satzanfang), Gruppe 2 = Akronyme (2+ Großbuchstaben)
+CAPITALIZED_RE = re.compile(r'(?=[A-ZÄÖÜ])\b(?:(?<!^)(?<!\. )([A-ZÄÖÜ][a-zäöüß]{2,})|([A-Z]{2,}))\b')
+
+# Ab so vielen Texten lohnt sich ein Prozess-Pool
+KEYWORD_BATCH_MIN_PARALLEL = 64
+
+class AutoKeywords:
+    """Zählungen für extract_auto_keywords, Stück für Stück fütterbar (feed)
+
+    Die letzten zwei Zeichen des vorigen Stücks bleiben als Kontext erhalten,
+    damit Wortgrenzen und "nicht am Satzanfang" wie im Gesamttext geprüft werden.
+    Stücke sollten an Leerraum enden (siehe markdown_chunks).
+    """
+    
+    def __init__(self):
+        self.words = Counter()
+        self.proper_nouns = Counter()  # kleingeschrieben, in Reihenfolge des ersten Auftretens
+        self.first_spelling = {}
+        self.acronyms = Counter()
+        self.first_acronyms = []
+        self.tail = ""
+    
+    def feed(self, text):
+        tail_lower = self.tail.lower()
+        self.words.update(WORD_RE.findall(tail_lower + text.lower(), len(tail_lower)))
+        
+        # Eigennamen und Akronyme in einem Durchlauf
+        window = self.tail + text
+        for pn, ac in CAPITALIZED_RE.findall(window, len(self.tail)):
+            if pn:
+                pn_lower = pn.lower()
+                self.proper_nouns[pn_lower] += 1
+                self.first_spelling.setdefault(pn_lower, pn)
+            else:
+                self.acronyms[ac.lower()] += 1
+                if len(self.first_acronyms) < 2:
+                    self.first_acronyms.append(ac)
+        self.tail = window[-2:]
+    
+    def keywords(self, num_keywords: int = 5) -> list:
+        # Stopwörter nur einmal pro Wort entfernen (Reihenfolge der übrigen bleibt erhalten)
+        word_freq = Counter(self.words)
+        for word in STOPWORDS.intersection(word_freq):
+            del word_freq[word]
+        
+        # Bonus für Eigennamen und Akronyme
+        for word, count in self.proper_nouns.items():
+            if word not in STOPWORDS:
+                word_freq[word] += 5 * count
+        
+        for word, count in self.acronyms.items():
+            if word not in STOPWORDS:
+                word_freq[word] += 3 * count
+        
+        # Keywords sammeln
+        keywords = []
+        keywords_lower = set()
+        
+        def add(keyword):
+            keywords.append(keyword)
+            keywords_lower.add(keyword.lower())
+        
+        # Top Akronyme (max 2)
+        for acronym in self.first_acronyms:
+            if acronym not in keywords:
+                add(acronym)
+        
+        # Top Eigennamen (max 3) in Original-Schreibweise (erstes Vorkommen)
+        for word, _ in self.proper_nouns.most_common(3):
+            pn = self.first_spelling[word]
+            if pn not in keywords and len(keywords) < num_keywords:
+                add(pn)
+        
+        # Top häufige Wörter auffüllen
+        for word, freq in word_freq.most_common(20):
+            if len(keywords) >= num_keywords:
+                break
+            # Mindestens 2x vorkommen
+            if word not in keywords_lower and freq >= 2:
+                add(word.capitalize())
+        
+        return keywords[:num_keywords]
+
 def extract_auto_keywords(text: str, num_keywords: int = 5) -> list:
     """
     Extrahiert automatisch Keywords aus Text.
@@ -67,96 +313,631 @@ def extract_auto_keywords(text: str, num_keywords: int = 5) -> list:
     - Erkennung von Eigennamen (Großschreibung)
     - Technischen Begriffen
     """
+    counts = AutoKeywords()
+    counts.feed(text)
+    return counts.keywords(num_keywords)
+
+def extract_auto_keywords_batch(texts, num_keywords: int = 5, max_workers=None) -> list:
+    """Keywords für viele Texte; große Mengen laufen in einem Prozess-Pool"""
+    texts = list(texts)
+    if max_workers == 1 or len(texts) < KEYWORD_BATCH_MIN_PARALLEL:
+        return [extract_auto_keywords(text, num_keywords) for text in texts]
     
-    # Deutsche und englische Stopwörter
-    stopwords = {
-        # Deutsch
-        'der', 'die', 'das', 'und', 'oder', 'aber', 'ist', 'sind', 'war', 'waren',
-        'ein', 'eine', 'einer', 'einem', 'einen', 'ich', 'du', 'er', 'sie', 'es',
-        'wir', 'ihr', 'mit', 'von', 'zu', 'auf', 'für', 'nicht', 'auch', 'wenn',
-        'dass', 'als', 'wie', 'bei', 'nach', 'über', 'nur', 'noch', 'dann', 'kann',
-        'was', 'hat', 'haben', 'wird', 'werden', 'können', 'sollte', 'würde', 'hier',
-        'dort', 'jetzt', 'dann', 'mehr', 'sehr', 'ganz', 'immer', 'alle', 'meine',
-        'deine', 'seine', 'ihre', 'diese', 'dieses', 'dieser', 'welche', 'welches',
-        'welcher', 'bitte', 'danke', 'ja', 'nein', 'okay', 'ok',
-        # English
-        'the', 'and', 'or', 'but', 'is', 'are', 'was', 'were', 'a', 'an', 'i',
-        'you', 'he', 'she', 'it', 'we', 'they', 'with', 'from', 'to', 'for',
-        'not', 'also', 'if', 'that', 'as', 'like', 'at', 'after', 'about', 'only',
-        'can', 'will', 'would', 'should', 'could', 'has', 'have', 'had', 'do',
-        'does', 'did', 'be', 'been', 'being', 'here', 'there', 'now', 'then',
-        'more', 'very', 'all', 'my', 'your', 'his', 'her', 'its', 'our', 'their',
-        'this', 'that', 'these', 'those', 'which', 'what', 'please', 'thanks',
-        'yes', 'no', 'okay', 'ok'
-    }
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(texts) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(partial(extract_auto_keywords, num_keywords=num_keywords),
+                             texts, chunksize=chunksize))
+
+class KeywordMatcher:
+    """Findet alle Keywords (Groß-/Kleinschreibung egal) in einem Durchlauf
+
+    Aho-Corasick-Prinzip mit einem Trie über alle Begriffe: Eine aus dem Trie
+    erzeugte Regex findet in C-Geschwindigkeit alle Startpositionen, an denen
+    irgendein Begriff beginnen kann; dort liefert der Trie alle Treffer
+    (auch überlappende, z.B. "Bad" und "Bad Sassendorf").
+    """
+    
+    def __init__(self, terms):
+        self.terms = {}  # kleingeschrieben -> Originalschreibweisen
+        for term in terms:
+            if term:
+                self.terms.setdefault(term.lower(), []).append(term)
+        
+        self.trie = {}
+        for term_lower in self.terms:
+            node = self.trie
+            for ch in term_lower:
+                node = node.setdefault(ch, {})
+            node[""] = term_lower
+        
+        self.regex = re.compile(f"(?=({self._pattern(self.trie)}))") if self.terms else None
+        self.max_len = max(map(len, self.terms), default=0)
+    
+    @classmethod
+    def _pattern(cls, node):
+        alternatives = [re.escape(ch) + cls._pattern(child) for ch, child in node.items() if ch != ""]
+        if not alternatives:
+            return ""
+        body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+        return f"(?:{body})?" if "" in node else body
+    
+    def scan(self, text):
+        """Positionen pro Begriff (kleingeschrieben) im kleingeschriebenen Text"""
+        hits = {}
+        if self.regex:
+            self._scan_into(text.lower(), hits)
+        return hits
+    
+    def _scan_into(self, text_lower, hits, offset=0, min_end=0):
+        """Treffer, die nach min_end enden, mit Position + offset in hits eintragen"""
+        n = len(text_lower)
+        for match in self.regex.finditer(text_lower):
+            pos = i = match.start()
+            node = self.trie
+            while i < n and text_lower[i] in node:
+                node = node[text_lower[i]]
+                i += 1
+                if "" in node and i > min_end:
+                    hits.setdefault(node[""], []).append(offset + pos)
+    
+    def scanner(self):
+        """Inkrementelles scan() für Text in Stücken (feed), Treffer auch über Stückgrenzen"""
+        return KeywordScan(self)
+    
+    @staticmethod
+    def count(hits, term):
+        return len(hits.get(term.lower(), ()))
+
+class KeywordScan:
+    """Ergebnis wie KeywordMatcher.scan über alle gefütterten Stücke zusammen
+
+    Vom vorigen Stück bleiben die letzten (längster Begriff - 1) Zeichen stehen;
+    Treffer, die ganz darin liegen, wurden schon gezählt.
+    """
+    
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.hits = {}
+        self.carry = ""
+        self.offset = 0  # Position von carry im Gesamttext
+    
+    def feed(self, text):
+        if not self.matcher.regex:
+            return
+        window = self.carry + text.lower()
+        self.matcher._scan_into(window, self.hits, self.offset, len(self.carry))
+        keep = min(len(window), self.matcher.max_len - 1)
+        self.offset += len(window) - keep
+        self.carry = window[len(window) - keep:]
+
+@functools.lru_cache(maxsize=8)
+def keyword_matcher(terms):
+    """Matcher pro Keyword-Kombination nur einmal bauen (terms als Tupel)"""
+    return KeywordMatcher(terms)
+
+def text_pieces(text, size=MARKDOWN_CHUNK_CHARS):
+    """Zerlegt langen Text in Stücke von max. size Zeichen, möglichst nach Leerraum"""
+    start = 0
+    while len(text) - start > size:
+        cut = max(text.rfind("\n", start, start + size), text.rfind(" ", start, start + size))
+        end = cut + 1 if cut > start else start + size
+        yield text[start:end]
+        start = end
+    yield text[start:] if start else text
+
+def markdown_chunks(turns, size=MARKDOWN_CHUNK_CHARS):
+    """Markdown eines Chats Stück für Stück (zusammengesetzt identisch mit as_markdown)"""
+    for i, t in enumerate(turns):
+        who = "User" if t["role"] == "user" else "Assistant"
+        yield ("\n" if i else "") + f"### {who}\n\n"
+        yield from text_pieces(t["text"], size)
+        yield "\n"
+
+def as_markdown(turns):
+    """Konvertiert Chat-Turns zu Markdown"""
+    return "".join(markdown_chunks(turns))
+
+# ============================================================================
+# DATEIAUSGABE (HINTERGRUND-SCHREIBER)
+# ============================================================================
+
+def restrict_to_owner(path):
+    """Windows: vererbte Rechte entfernen, nur der aktuelle Benutzer hat Zugriff
+
+    (os.chmod setzt unter Windows nur das Schreibschutz-Flag.)
+    """
+    if platform.system() != 'Windows':
+        return
+    subprocess.run(["icacls", str(path), "/inheritance:r", "/grant:r", f"{os.environ['USERNAME']}:F"],
+                   check=True, capture_output=True)
+
+def atomic_write_bytes(path, data, private=False):
+    """Schreibt über eine Temp-Datei und benennt dann um - nie halb geschriebene Dateien
+
+    Mit private ist schon die (noch leere) Temp-Datei nur für den Besitzer
+    lesbar; os.replace übernimmt die Rechte für die Zieldatei.
+    """
+    path = pathlib.Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        if private:
+            tmp_path.unlink(missing_ok=True)  # Rest eines abgebrochenen Laufs
+            fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0), 0o600)
+            try:
+                restrict_to_owner(tmp_path)
+            except BaseException:
+                os.close(fd)
+                raise
+            f = os.fdopen(fd, "wb")
+        else:
+            f = open(tmp_path, "wb")
+        with f:
+            f.write(data)
+            if OUTPUT_FSYNC:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def store_bytes(path, data):
+    """Legt eine Export-Datei ab - im Bundle, im Artifact-Store oder als Datei"""
+    with span("disk_write"):
+        if OUTPUT_BUNDLE is not None:
+            OUTPUT_BUNDLE.add(path, data)
+        elif ARTIFACT_STORE is not None and ARTIFACT_STORE.covers(path):
+            ARTIFACT_STORE.put(path, data)
+        else:
+            atomic_write_bytes(path, data)
+
+def _encode_and_write(path, text, want_hash):
+    data = text.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest() if want_hash else None
+    store_bytes(path, data)
+    return digest
+
+class OutputWriter:
+    """Begrenzte Schreib-Queue, abgearbeitet von einem Thread-Pool
+
+    write_text() wartet nur, wenn bereits OUTPUT_MAX_PENDING Schreibvorgänge
+    offen sind. flush()/close() warten, bis alles auf der Platte ist.
+    """
+    
+    def __init__(self, threads=OUTPUT_WRITER_THREADS, max_pending=OUTPUT_MAX_PENDING):
+        from concurrent.futures import ThreadPoolExecutor
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="export-writer")
+        self.slots = asyncio.Semaphore(max_pending)
+        self.pending = set()
+        self.errors = 0
+    
+    async def write_text(self, path, text, want_hash=False):
+        """Plant einen Schreibvorgang ein und gibt dessen Future zurück (Ergebnis: SHA256 oder None)"""
+        return await self._submit(path, _encode_and_write, path, text, want_hash)
+    
+    async def write_bytes(self, path, data):
+        return await self._submit(path, store_bytes, path, data)
+    
+    async def run(self, label, fn, *args):
+        """Plant sonstige blockierende Arbeit ein (z.B. Suchindex), ebenfalls mit Gegendruck"""
+        return await self._submit(label, fn, *args)
+    
+    async def _submit(self, path, fn, *args):
+        await self.slots.acquire()
+        future = asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+        self.pending.add(future)
+        future.add_done_callback(functools.partial(self._done, path))
+        return future
+    
+    def _done(self, path, future):
+        self.pending.discard(future)
+        self.slots.release()
+        if not future.cancelled() and future.exception():
+            self.errors += 1
+            print(f"  Schreiben fehlgeschlagen ({pathlib.Path(path).name}): {future.exception()}")
+    
+    async def sha256(self, text):
+        """SHA256 eines Textes im Thread-Pool berechnen"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.pool, lambda: hashlib.sha256(text.encode("utf-8")).hexdigest())
+    
+    async def flush(self):
+        if self.pending:
+            await asyncio.gather(*list(self.pending), return_exceptions=True)
     
-    # Text vorverarbeiten
-    text_lower = text.lower()
+    async def close(self):
+        await self.flush()
+        self.pool.shutdown(wait=True)
+        if self.errors:
+            print(f"WARNUNG: {self.errors} Dateien konnten nicht geschrieben werden")
+
+# Wird in run() gestartet; ohne Schreiber wird direkt (aber ebenfalls atomar) geschrieben
+OUTPUT_WRITER = None
+
+async def write_output(path, text, want_hash=False):
+    """Schreibt Text über den Hintergrund-Schreiber; mit want_hash wird auf das Ergebnis gewartet"""
+    if OUTPUT_WRITER is None:
+        return _encode_and_write(path, text, want_hash)
+    future = await OUTPUT_WRITER.write_text(path, text, want_hash)
+    return await future if want_hash else None
+
+async def write_output_bytes(path, data):
+    """Schreibt Binärdaten (PDF, PNG) über den Hintergrund-Schreiber"""
+    if OUTPUT_WRITER is None:
+        store_bytes(path, data)
+    else:
+        await OUTPUT_WRITER.write_bytes(path, data)
+
+async def sha256_text(text):
+    """SHA256 eines Textes (im Thread-Pool wenn der Schreiber läuft)"""
+    if OUTPUT_WRITER is None:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return await OUTPUT_WRITER.sha256(text)
+
+async def run_in_background(label, fn, *args):
+    """Blockierende Arbeit ohne Ergebnis an den Schreiber übergeben (ohne Schreiber direkt)"""
+    if OUTPUT_WRITER is None:
+        fn(*args)
+    else:
+        await OUTPUT_WRITER.run(label, fn, *args)
+
+async def run_in_writer(fn, *args):
+    """Führt blockierende Arbeit im Thread-Pool des Schreibers aus (ohne Schreiber direkt)"""
+    if OUTPUT_WRITER is None:
+        return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(OUTPUT_WRITER.pool, fn, *args)
+
+class MarkdownRender:
+    """Schreibt einen Chat in einem Durchlauf als Markdown
+
+    Jedes Stück aus markdown_chunks geht direkt in eine Temp-Datei und
+    gleichzeitig in SHA256, Keyword-Matcher und Auto-Keywords - der Chat liegt
+    nie komplett als String oder Bytes im Speicher, egal wie lang er ist.
+    place() verschiebt die Datei ans Ziel, discard() verwirft sie.
+    """
+    
+    def __init__(self, tmp_dir, matcher=None):
+        self.tmp_dir = tmp_dir
+        self.matcher = matcher
+        self.tmp_path = None
+        self.buffer = None  # Bundle: jede Datei ist ein Blob, daher im Speicher
+        self.sha256 = None
+        self.keyword_hits = {}
+        self.auto_keywords = []
+        self.size = 0
     
-    # Wörter extrahieren (mindestens 3 Zeichen)
-    words = re.findall(r'\b[a-zäöüß]{3,}\b', text_lower)
+    def render(self, turns):
+        digest = hashlib.sha256()
+        scan = self.matcher.scanner() if self.matcher else None
+        counts = AutoKeywords()
+        if OUTPUT_BUNDLE is not None:
+            self.buffer = out = io.BytesIO()
+        else:
+            fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".md.tmp", dir=self.tmp_dir)
+            self.tmp_path = pathlib.Path(tmp_path)
+            out = os.fdopen(fd, "wb")
+        try:
+            for chunk in markdown_chunks(turns):
+                data = chunk.encode("utf-8")
+                digest.update(data)
+                out.write(data)
+                self.size += len(data)
+                counts.feed(chunk)
+                if scan:
+                    scan.feed(chunk)
+            if self.tmp_path and OUTPUT_FSYNC:
+                out.flush()
+                os.fsync(out.fileno())
+        except BaseException:
+            if self.tmp_path:
+                out.close()
+            self.discard()
+            raise
+        if self.tmp_path:
+            out.close()
+        
+        self.sha256 = digest.hexdigest()
+        self.keyword_hits = scan.hits if scan else {}
+        self.auto_keywords = counts.keywords(num_keywords=5)
+        return self
     
-    # Eigennamen finden (Großbuchstaben am Anfang, nicht am Satzanfang)
-    proper_nouns = re.findall(r'(?<!^)(?<!\. )\b([A-ZÄÖÜ][a-zäöüß]{2,})\b', text)
-    proper_nouns_lower = [w.lower() for w in proper_nouns]
+    def place(self, path):
+        """Legt das Markdown unter path ab (Bundle, Artifact-Store oder Umbenennen)"""
+        with span("disk_write"):
+            if self.buffer is not None:
+                OUTPUT_BUNDLE.add(path, self.buffer.getvalue())
+            elif ARTIFACT_STORE is not None and ARTIFACT_STORE.covers(path):
+                ARTIFACT_STORE.put(path, self.tmp_path.read_bytes())
+            else:
+                os.replace(self.tmp_path, path)
+                self.tmp_path = None
+        self.discard()
     
-    # Technische Begriffe / Akronyme (2+ Großbuchstaben)
-    acronyms = re.findall(r'\b[A-Z]{2,}\b', text)
-    acronyms_lower = [w.lower() for w in acronyms]
+    def discard(self):
+        self.buffer = None
+        if self.tmp_path:
+            self.tmp_path.unlink(missing_ok=True)
+            self.tmp_path = None
+
+def render_markdown(turns, tmp_dir, matcher=None):
+    """Markdown in einem Durchlauf schreiben, hashen und durchsuchen (siehe MarkdownRender)"""
+    return MarkdownRender(tmp_dir, matcher).render(turns)
+
+# ============================================================================
+# BUNDLE-AUSGABE (EINE DATEI STATT TAUSENDER)
+# ============================================================================
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Bereits komprimierte Formate werden unverändert abgelegt
+UNCOMPRESSED_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".pdf"}
+
+class ExportBundle:
+    """Append-only Container (SQLite) für alle Dateien eines Exports
+
+    Jede Datei ist ein Eintrag mit relativem Pfad, Codec, SHA256 und Blob
+    (zstd wenn installiert, sonst zlib). Wird eine Datei erneut geschrieben,
+    kommt ein neuer Eintrag hinzu; gelesen wird immer der neueste.
+    """
     
-    # Zahlen mit Einheiten (z.B. "20kg", "5cm")
-    units = re.findall(r'\b\d+\s*(?:kg|g|cm|m|km|mm|ml|l|°c|grad|prozent|%)\b', text_lower)
+    def __init__(self, path, root=None):
+        self.path = pathlib.Path(path)
+        self.root = (pathlib.Path(root) if root else self.path.parent).resolve()
+        self.lock = threading.Lock()
+        # timeout: Shard-Prozesse schreiben gleichzeitig in dieselbe Datei
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=60)
+        self.conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                added TEXT NOT NULL,
+                data BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_path ON entries (path, id);
+        """)
     
-    # Häufigkeit zählen (ohne Stopwörter)
-    word_freq = Counter([w for w in words if w not in stopwords and len(w) > 3])
+    def relpath(self, path):
+        """Pfad relativ zum Exportordner (bereits relative Bundle-Pfade bleiben)"""
+        path = pathlib.Path(path)
+        try:
+            return path.resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix()
     
-    # Bonus für Eigennamen und Akronyme
-    for word in proper_nouns_lower:
-        if word not in stopwords:
-            word_freq[word] += 5
+    @staticmethod
+    def _compress(relpath, data):
+        if pathlib.PurePosixPath(relpath).suffix.lower() in UNCOMPRESSED_SUFFIXES:
+            return "raw", data
+        if zstandard is not None:
+            return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+        import zlib
+        return "zlib", zlib.compress(data, 6)
     
-    for word in acronyms_lower:
-        if word not in stopwords:
-            word_freq[word] += 3
+    @staticmethod
+    def _decompress(codec, blob):
+        if codec == "raw":
+            return bytes(blob)
+        if codec == "zlib":
+            import zlib
+            return zlib.decompress(blob)
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("Bundle enthält zstd-Daten - bitte 'pip install zstandard'")
+            return zstandard.ZstdDecompressor().decompress(blob)
+        raise ValueError(f"Unbekannter Codec: {codec}")
     
-    # Keywords sammeln
-    keywords = []
+    def add(self, path, data):
+        relpath = self.relpath(path)
+        # Komprimieren außerhalb des Locks (zlib/zstd geben den GIL frei)
+        codec, blob = self._compress(relpath, data)
+        entry = (relpath, codec, len(data), hashlib.sha256(data).hexdigest(),
+                 datetime.now().isoformat(timespec="seconds"), blob)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO entries (path, codec, size, sha256, added, data) VALUES (?, ?, ?, ?, ?, ?)", entry)
     
-    # Top Akronyme (max 2)
-    for acronym in acronyms[:2]:
-        if acronym not in keywords:
-            keywords.append(acronym)
+    def read(self, path):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT codec, data FROM entries WHERE path = ? ORDER BY id DESC LIMIT 1",
+                (self.relpath(path),)).fetchone()
+        if row is None:
+            raise FileNotFoundError(path)
+        return self._decompress(*row)
     
-    # Top Eigennamen (max 3)
-    proper_freq = Counter(proper_nouns_lower)
-    for word, _ in proper_freq.most_common(3):
-        # Original-Schreibweise finden
-        for pn in proper_nouns:
-            if pn.lower() == word:
-                if pn not in keywords and len(keywords) < num_keywords:
-                    keywords.append(pn)
-                break
+    def index(self):
+        """Neuester Eintrag pro Pfad: (path, size, sha256, added)"""
+        with self.lock:
+            return self.conn.execute("""
+                SELECT path, size, sha256, added FROM entries
+                WHERE id IN (SELECT MAX(id) FROM entries GROUP BY path)
+                ORDER BY path
+            """).fetchall()
     
-    # Top häufige Wörter auffüllen
-    for word, freq in word_freq.most_common(20):
-        if len(keywords) >= num_keywords:
-            break
-        if word not in [k.lower() for k in keywords]:
-            # Mindestens 2x vorkommen
-            if freq >= 2:
-                keywords.append(word.capitalize())
+    def unpack(self, target_dir):
+        """Stellt die gewohnte Ordnerstruktur wieder her"""
+        target_dir = pathlib.Path(target_dir)
+        count = 0
+        for relpath, _, sha, _ in self.index():
+            data = self.read(relpath)
+            if hashlib.sha256(data).hexdigest() != sha:
+                print(f"  WARNUNG: Prüfsumme stimmt nicht: {relpath}")
+            out_path = target_dir / relpath
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(out_path, data)
+            count += 1
+        return count
     
-    return keywords[:num_keywords]
+    def close(self):
+        with self.lock:
+            self.conn.close()
 
-def as_markdown(turns):
-    """Konvertiert Chat-Turns zu Markdown"""
-    lines = []
-    for t in turns:
-        who = "User" if t["role"] == "user" else "Assistant"
-        lines.append(f"### {who}\n")
-        lines.append(t["text"])
-        lines.append("")
-    return "\n".join(lines)
+# Wird in run() geöffnet wenn OUTPUT_FORMAT == "bundle"
+OUTPUT_BUNDLE = None
+
+def _with_bundle(bundle_path, action, bundles=None):
+    """Führt action(bundle) mit dem laufenden oder einem frisch geöffneten Bundle aus
+
+    bundles: dict für einen ganzen Durchlauf geöffneter Bundles (schließt der Aufrufer)
+    """
+    if OUTPUT_BUNDLE is not None and OUTPUT_BUNDLE.path == pathlib.Path(bundle_path):
+        return action(OUTPUT_BUNDLE)
+    if bundles is not None:
+        bundle = bundles.get(str(bundle_path))
+        if bundle is None:
+            bundle = bundles[str(bundle_path)] = ExportBundle(bundle_path)
+        return action(bundle)
+    bundle = ExportBundle(bundle_path)
+    try:
+        return action(bundle)
+    finally:
+        bundle.close()
+
+def artifact_exists(path, artifacts=None):
+    bundle_path = (artifacts or {}).get("bundle")
+    return pathlib.Path(bundle_path or path).exists()
+
+def read_artifact(path, artifacts=None, bundles=None):
+    """Liest eine Export-Datei - direkt oder aus dem Bundle (artifacts["bundle"])"""
+    bundle_path = (artifacts or {}).get("bundle")
+    if not bundle_path:
+        return pathlib.Path(path).read_bytes()
+    return _with_bundle(bundle_path, lambda bundle: bundle.read(path), bundles)
+
+def write_artifact(path, data, artifacts=None, bundles=None):
+    """Ersetzt eine Export-Datei - direkt oder als neuer Eintrag im Bundle"""
+    bundle_path = (artifacts or {}).get("bundle")
+    if not bundle_path:
+        atomic_write_bytes(path, data)
+    else:
+        _with_bundle(bundle_path, lambda bundle: bundle.add(path, data), bundles)
+
+def unpack_command(bundle_path, target_dir=None):
+    """CLI: Entpackt ein Bundle in die gewohnte Ordnerstruktur"""
+    bundle_path = pathlib.Path(bundle_path)
+    if not bundle_path.exists():
+        print(f"Bundle nicht gefunden: {bundle_path}")
+        return 1
+    bundle = ExportBundle(bundle_path)
+    target = pathlib.Path(target_dir) if target_dir else bundle.root
+    count = bundle.unpack(target)
+    bundle.close()
+    print(f"{count} Dateien entpackt nach: {target.absolute()}")
+    return 0
+
+# ============================================================================
+# ARTIFACT-STORE (INHALTSADRESSIERT, ÜBER LÄUFE GETEILT)
+# ============================================================================
+
+class ArtifactStore:
+    """Blobs unter objects/<ab>/<sha256><endung>, Exportdateien sind Hardlinks darauf
+    
+    Die Referenzzählung übernimmt das Dateisystem: ein Blob mit nur noch einem
+    Link gehört keinem Export mehr und kann von gc() entfernt werden.
+    """
+    
+    def __init__(self, root):
+        self.root = pathlib.Path(root)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.dirs = set()
+        self.linkable = True
+        self.lock = threading.Lock()
+        self.stats = Counter()
+    
+    def track(self, dirs):
+        """Registriert Exportordner, deren Dateien über den Store laufen"""
+        self.dirs.update(pathlib.Path(d) for d in dirs)
+    
+    def covers(self, path):
+        """Liegt path in einem registrierten Ordner (auch in Projekt-Unterordnern)?"""
+        return self.linkable and not self.dirs.isdisjoint(pathlib.Path(path).parents)
+    
+    def blob_path(self, sha, suffix):
+        return self.objects / sha[:2] / f"{sha}{suffix.lower()}"
+    
+    def put(self, path, data):
+        path = pathlib.Path(path)
+        sha = hashlib.sha256(data).hexdigest()
+        blob = self.blob_path(sha, path.suffix)
+        reused = blob.exists()
+        if not reused:
+            blob.parent.mkdir(exist_ok=True)
+            atomic_write_bytes(blob, data)
+        
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.link")
+        try:
+            os.link(blob, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            # Dateisystem ohne Hardlinks: Store abschalten, ab jetzt normal schreiben
+            with self.lock:
+                if self.linkable:
+                    print(f"  Artifact-Store deaktiviert (keine Hardlinks möglich: {e})")
+                self.linkable = False
+            if not reused:
+                blob.unlink(missing_ok=True)
+            atomic_write_bytes(path, data)
+            return
+        
+        with self.lock:
+            if reused:
+                self.stats["reused"] += 1
+                self.stats["bytes_saved"] += len(data)
+            else:
+                self.stats["stored"] += 1
+    
+    def summary(self):
+        saved_mb = self.stats["bytes_saved"] / (1024 * 1024)
+        return (f"{self.stats['stored']} neu, {self.stats['reused']} wiederverwendet "
+                f"({saved_mb:.1f} MB gespart)")
+    
+    def gc(self, dry_run=False):
+        """Entfernt Blobs ohne Verweis aus einem Export; gibt (Anzahl, Bytes) zurück"""
+        removed = freed = 0
+        for blob in self.objects.glob("*/*"):
+            try:
+                stat = blob.stat()
+            except FileNotFoundError:
+                continue
+            if stat.st_nlink > 1:
+                continue
+            if not dry_run:
+                blob.unlink(missing_ok=True)
+            removed += 1
+            freed += stat.st_size
+        if not dry_run:
+            for bucket in self.objects.iterdir():
+                if bucket.is_dir() and not any(bucket.iterdir()):
+                    bucket.rmdir()
+        return removed, freed
+
+# Wird in run() geöffnet wenn DEDUP_ARTIFACTS (nur im Ausgabeformat "files")
+ARTIFACT_STORE = None
+
+def gc_command(store_dir=None, dry_run=False):
+    """CLI: Entfernt nicht mehr referenzierte Blobs aus dem Artifact-Store"""
+    store_dir = pathlib.Path(store_dir or ARTIFACT_STORE_DIR)
+    if not (store_dir / "objects").exists():
+        print(f"Kein Artifact-Store gefunden: {store_dir}")
+        return 1
+    removed, freed = ArtifactStore(store_dir).gc(dry_run=dry_run)
+    action = "würden entfernt" if dry_run else "entfernt"
+    print(f"{removed} Blobs {action} ({freed / (1024 * 1024):.1f} MB)")
+    return 0
 
 def save_system_info(outdir):
     """Speichert System-Informationen für Dokumentation"""
@@ -183,52 +964,401 @@ def create_directory_structure(base_path):
     
     subdirs = {
         'markdown': base_path / "markdown",
-        'pdf': base_path / "pdf",
         'metadata': base_path / "metadata",
     }
     
+    if SAVE_PDF:
+        subdirs['pdf'] = base_path / "pdf"
     if SAVE_SCREENSHOTS:
         subdirs['screenshots'] = base_path / "screenshots"
     if SAVE_RAW_HTML:
         subdirs['raw_html'] = base_path / "raw_html"
     
-    for subdir in subdirs.values():
-        subdir.mkdir(exist_ok=True)
+    # Im Bundle-Modus landen die Dateien im Container, nicht in Ordnern
+    if OUTPUT_FORMAT != "bundle":
+        for subdir in subdirs.values():
+            subdir.mkdir(exist_ok=True)
+    
+    # Binär-Artefakte dieser Ordner laufen über den Artifact-Store
+    if ARTIFACT_STORE is not None:
+        ARTIFACT_STORE.track(subdirs[key] for key in DEDUP_DIRS if key in subdirs)
     
     return subdirs
 
-async def save_chat_metadata(page, chat_title, timestamp, content, dirs, project_name=None, keywords=None):
-    """Speichert Metadaten für einen Chat - IMMER"""
+# User-Agent pro Browser-Kontext nur einmal abfragen
+_USER_AGENTS = weakref.WeakKeyDictionary()
+
+async def get_user_agent(page):
+    """User-Agent des Browsers (gecacht pro Kontext)"""
+    ctx = page.context
+    if ctx not in _USER_AGENTS:
+        _USER_AGENTS[ctx] = await page.evaluate("navigator.userAgent")
+    return _USER_AGENTS[ctx]
+
+async def save_chat_metadata(page, chat_title, timestamp, content, dirs, project_name=None, keywords=None,
+                             keyword_hits=None, sha256_markdown=None, auto_keywords=None, display_title=None):
+    """Speichert Metadaten für einen Chat - IMMER
+
+    keyword_hits: Ergebnis von KeywordMatcher.scan für diesen Inhalt (optional)
+    sha256_markdown: bereits berechneter Hash des Inhalts (optional)
+    auto_keywords: bereits extrahierte Keywords (optional)
+    content wird nur gebraucht, wenn eines davon fehlt.
+    display_title: Titel für die Metadaten, falls chat_title (Dateiname) eine ID enthält
+    """
     
     # Automatische Keywords aus Inhalt extrahieren
-    auto_keywords = extract_auto_keywords(content, num_keywords=5)
+    if auto_keywords is None:
+        auto_keywords = extract_auto_keywords(content, num_keywords=5)
     
     meta = {
         "export_timestamp": datetime.now().isoformat(),
         "chat_timestamp": timestamp,
         "chat_url": page.url,
-        "chat_title": chat_title,
+        "chat_title": display_title or chat_title,
         "project": project_name or "None",
-        "user_agent": await page.evaluate("navigator.userAgent"),
+        "user_agent": await get_user_agent(page),
         "account_info": "ChatGPT Business Account",
-        "sha256_markdown": hashlib.sha256(content.encode()).hexdigest(),
+        "sha256_markdown": sha256_markdown or await sha256_text(content),
         "browser": "Chrome",
         "auto_keywords": auto_keywords,  # Automatisch erkannte Keywords
     }
     
     # Prüfe auf manuelle Keywords (nur wenn welche angegeben wurden)
     if keywords:
+        if keyword_hits is None:
+            keyword_hits = keyword_matcher(tuple(keywords)).scan(content)
         meta["manual_keywords_searched"] = keywords
         meta["manual_keywords_found"] = []
-        content_lower = content.lower()
+        meta["manual_keyword_counts"] = {}
         for keyword in keywords:
-            if keyword.lower() in content_lower:
+            count = KeywordMatcher.count(keyword_hits, keyword)
+            meta["manual_keyword_counts"][keyword] = count
+            if count:
                 meta["manual_keywords_found"].append(keyword)
     
     meta_path = dirs['metadata'] / f"{chat_title}-{timestamp}.json"
-    meta_path.write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding='utf-8')
+    await write_output(meta_path, json.dumps(meta, indent=2, ensure_ascii=False))
     return meta
 
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Ein Durchlauf über alle Textknoten in <main>, zusammengefasst pro Absatz: Vorkommen
+# pro Keyword zählen und die Boxen der Absätze (Dokument-Koordinaten) sammeln. Die Absätze
+# werden markiert, damit sie für den Fallback per Element-Screenshot auffindbar sind.
+KEYWORD_BOXES_JS = """
+({keywords, all, max}) => {
+    const root = document.querySelector('main');
+    if (!root) return null;
+    const blocks = 'p,li,pre,td,th,h1,h2,h3,h4,h5,h6,blockquote';
+    const lowered = keywords.map(k => k.toLowerCase());
+    const counts = lowered.map(() => 0);
+    const seen = lowered.map(() => new Set());
+    const targets = [];
+    let markers = 0;
+    // Text pro Block zusammensetzen, damit auch "<strong>Bad</strong> Sassendorf" trifft
+    const container = (node) => {
+        let el = node.parentElement.closest(blocks);
+        if (el && root.contains(el)) return el;
+        el = node.parentElement;
+        while (el !== root && getComputedStyle(el).display.startsWith('inline')) el = el.parentElement;
+        return el;
+    };
+    const texts = new Map();
+    const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        const el = container(node);
+        texts.set(el, (texts.get(el) || '') + node.data);
+    }
+    for (const [el, combined] of texts) {
+        const text = combined.toLowerCase();
+        lowered.forEach((kw, k) => {
+            if (!kw) return;
+            for (let i = text.indexOf(kw); i !== -1; i = text.indexOf(kw, i + 1)) {
+                counts[k]++;
+                if (seen[k].has(el) || seen[k].size >= (all ? max : 1)) continue;
+                const r = el.getBoundingClientRect();
+                if (!r.width || !r.height) continue;
+                seen[k].add(el);
+                if (!el.dataset.exportKw) el.dataset.exportKw = String(markers++);
+                targets.push({keyword: k, marker: el.dataset.exportKw,
+                              x: r.left + window.scrollX, y: r.top + window.scrollY,
+                              width: r.width, height: r.height});
+            }
+        });
+    }
+    const doc = document.documentElement;
+    return {counts, targets, scale: window.devicePixelRatio,
+            width: doc.scrollWidth, height: doc.scrollHeight};
+}
+"""
+
+KEYWORD_MARKERS_CLEAR_JS = """
+() => document.querySelectorAll('[data-export-kw]').forEach(el => delete el.dataset.exportKw)
+"""
+
+def box_in_image(left, top, right, bottom, width, height):
+    """Liegt die Box vollständig (und nicht leer) im Bild?
+
+    Absätze oberhalb des gescrollten Chat-Containers haben negative Koordinaten.
+    """
+    return 0 <= left < right <= width and 0 <= top < bottom <= height
+
+def crop_images(image, boxes, pad):
+    """Schneidet alle Boxen (Pixel: links, oben, rechts, unten) aus einem PNG
+
+    Das Bild wird nur einmal dekodiert. Boxen, die nicht vollständig im Bild
+    liegen, ergeben None (Fallback per Screenshot).
+    """
+    crops = []
+    with Image.open(io.BytesIO(image)) as full:
+        full.load()
+        for left, top, right, bottom in boxes:
+            if not box_in_image(left, top, right, bottom, full.width, full.height):
+                crops.append(None)
+                continue
+            out = io.BytesIO()
+            full.crop((max(0, left - pad), max(0, top - pad),
+                       min(full.width, right + pad), min(full.height, bottom + pad))).save(out, format="PNG")
+            crops.append(out.getvalue())
+    return crops
+
+async def keyword_screenshot(page, target, found):
+    """Einzel-Screenshot eines Absatzes (wenn kein lokaler Ausschnitt möglich ist)"""
+    pad = KEYWORD_SCREENSHOT_PADDING
+    if box_in_image(target["x"], target["y"], target["x"] + target["width"], target["y"] + target["height"],
+                    found["width"], found["height"]):
+        x = max(0, target["x"] - pad)
+        y = max(0, target["y"] - pad)
+        clip = {"x": x, "y": y,
+                "width": min(found["width"], target["x"] + target["width"] + pad) - x,
+                "height": min(found["height"], target["y"] + target["height"] + pad) - y}
+        return await page.screenshot(clip=clip, full_page=True)
+    # Liegt in einem eigenen Scroll-Container: Playwright scrollt das Element selbst ins Bild
+    return await page.locator(f'[data-export-kw="{target["marker"]}"]').screenshot()
+
+async def save_keyword_screenshots(page, chat_title, timestamp, dirs, keywords, full_image=None):
+    """Keyword-Screenshots aus einem Such-Durchlauf im Browser
+
+    Zählt alle Vorkommen pro Keyword und schneidet die Absätze lokal aus dem
+    Vollbild-Screenshot; nur was darin nicht liegt, wird einzeln aufgenommen.
+    """
+    with span("keyword_boxes"):
+        found = await page.evaluate(KEYWORD_BOXES_JS, {
+            "keywords": list(keywords), "all": KEYWORD_SCREENSHOT_ALL, "max": KEYWORD_SCREENSHOT_MAX})
+    if not found:
+        print("  Kein Chat-Content (<main>) für Keyword-Screenshots gefunden")
+        return []
+    
+    found_counts = [f"{kw} ({count}x)" for kw, count in zip(keywords, found["counts"]) if count]
+    if found_counts:
+        print(f"  Keywords im Chat-Content: {', '.join(found_counts)}")
+    
+    targets = found["targets"]
+    scale = found["scale"]
+    crops = [None] * len(targets)
+    if Image is not None and full_image and targets:
+        boxes = [(int(t["x"] * scale), int(t["y"] * scale),
+                  int((t["x"] + t["width"]) * scale), int((t["y"] + t["height"]) * scale)) for t in targets]
+        try:
+            with span("screenshot:crop", count=len(boxes)):
+                crops = await run_in_writer(crop_images, full_image, boxes, int(KEYWORD_SCREENSHOT_PADDING * scale))
+        except Exception as e:
+            print(f"  Ausschneiden aus dem Vollbild fehlgeschlagen, einzelne Screenshots: {e}")
+    
+    paths = []
+    numbers = Counter()
+    try:
+        for target, image in zip(targets, crops):
+            keyword = keywords[target["keyword"]]
+            numbers[keyword] += 1
+            suffix = f"-{numbers[keyword]}" if KEYWORD_SCREENSHOT_ALL else ""
+            kw_path = dirs['screenshots'] / f"{chat_title}-{timestamp}-keyword-{slug(keyword)}{suffix}.png"
+            try:
+                if image is None:
+                    with span("screenshot:keyword", keyword=keyword):
+                        image = await keyword_screenshot(page, target, found)
+                await write_output_bytes(kw_path, image)
+                paths.append(kw_path)
+            except Exception as e:
+                print(f"  Keyword-Screenshot '{keyword}' fehlgeschlagen: {e}")
+    finally:
+        # Markierungen entfernen (sonst landen sie im gespeicherten HTML)
+        with contextlib.suppress(Exception):
+            await page.evaluate(KEYWORD_MARKERS_CLEAR_JS)
+    
+    if paths:
+        print(f"  Keyword-Screenshots gespeichert: {len(paths)}")
+    return paths
+
+SCREENSHOT_SUFFIXES = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+def full_screenshot_path(dirs, chat_title, timestamp, number=None):
+    """Pfad des Vollbild-Screenshots bzw. der Kachel/des Teilbilds number"""
+    part = f"-{number:03d}" if number is not None else ""
+    return dirs['screenshots'] / f"{chat_title}-{timestamp}-full{part}{SCREENSHOT_SUFFIXES[SCREENSHOT_FORMAT]}"
+
+def screenshot_options():
+    """Format-Argumente für page.screenshot (WebP wird nachträglich aus PNG kodiert)"""
+    if SCREENSHOT_FORMAT == "jpeg":
+        return {"type": "jpeg", "quality": SCREENSHOT_QUALITY}
+    return {"type": "png"}
+
+def _encode_image(image, fmt):
+    """Pillow-Bild oder PNG-Bytes im Zielformat kodieren"""
+    if isinstance(image, bytes):
+        image = Image.open(io.BytesIO(image))
+    out = io.BytesIO()
+    if fmt == "png":
+        image.save(out, format="PNG")
+    else:
+        image.convert("RGB").save(out, format=fmt.upper(), quality=SCREENSHOT_QUALITY)
+    return out.getvalue()
+
+async def encode_screenshot(data):
+    """Screenshot-Bytes von page.screenshot ins eingestellte Format bringen"""
+    if SCREENSHOT_FORMAT != "webp":
+        return data
+    return await run_in_writer(_encode_image, data, "webp")
+
+# Größten Scroll-Bereich des Chats suchen (in <main>, dessen Vorfahren oder das Dokument)
+# und für die folgenden Aufrufe merken; Ausschnitt in Viewport-Koordinaten
+SCROLL_AREA_JS = """
+() => {
+    const main = document.querySelector('main');
+    const doc = document.scrollingElement || document.documentElement;
+    const candidates = [doc];
+    for (let el = main; el && el !== doc; el = el.parentElement) candidates.push(el);
+    if (main) candidates.push(...main.querySelectorAll('*'));
+    let best = null;
+    for (const el of candidates) {
+        if (el.scrollHeight <= el.clientHeight + 1) continue;
+        if (el !== doc && !/(auto|scroll|overlay)/.test(getComputedStyle(el).overflowY)) continue;
+        if (!best || el.scrollHeight > best.scrollHeight) best = el;
+    }
+    best = best || doc;
+    window.__exportScrollArea = best;
+    let x = 0, y = 0, width = window.innerWidth, height = window.innerHeight;
+    if (best !== doc) {
+        const r = best.getBoundingClientRect();
+        x = Math.max(0, r.left);
+        y = Math.max(0, r.top);
+        width = Math.min(window.innerWidth, r.right) - x;
+        height = Math.min(window.innerHeight, r.bottom) - y;
+    }
+    return {x, y, width, height, view: best.clientHeight, total: best.scrollHeight,
+            start: best.scrollTop, scale: window.devicePixelRatio};
+}
+"""
+
+# Scrollt den gemerkten Bereich, wartet zwei Frames und gibt die tatsächliche Position zurück
+SCROLL_TO_JS = """
+(top) => new Promise(resolve => {
+    const el = window.__exportScrollArea;
+    el.scrollTop = top;
+    requestAnimationFrame(() => requestAnimationFrame(() => resolve(el.scrollTop)));
+})
+"""
+
+class StitchedImage:
+    """Setzt Kacheln zu Teilbildern von max. SCREENSHOT_STITCH_MAX_PX Höhe zusammen
+
+    Es liegt immer nur ein Teilbild im Speicher; volle Teilbilder werden kodiert
+    und sofort an den Schreiber übergeben.
+    """
+    
+    def __init__(self, width, total_height, path_for):
+        self.width = width
+        self.total_height = total_height
+        self.path_for = path_for
+        self.parts = []
+        self.start = 0
+        self.canvas = None
+    
+    def _new_canvas(self):
+        height = min(SCREENSHOT_STITCH_MAX_PX, self.total_height - self.start)
+        self.canvas = Image.new("RGB", (self.width, height), "white")
+    
+    async def add(self, png, top):
+        """Kachel (PNG-Bytes) an Pixelposition top einsetzen"""
+        tile = await run_in_writer(lambda: Image.open(io.BytesIO(png)).convert("RGB"))
+        bottom = min(top + tile.height, self.total_height)
+        while True:
+            if self.canvas is None:
+                self._new_canvas()
+            self.canvas.paste(tile, (0, top - self.start))
+            if bottom < self.start + self.canvas.height:
+                return
+            await self._flush()
+            if self.start >= self.total_height:
+                return
+    
+    async def _flush(self):
+        path = self.path_for(len(self.parts) + 1)
+        data = await run_in_writer(_encode_image, self.canvas, SCREENSHOT_FORMAT)
+        await write_output_bytes(path, data)
+        self.parts.append(path)
+        self.start += self.canvas.height
+        self.canvas = None
+    
+    async def close(self):
+        """Restliches Teilbild schreiben; gibt die Pfade zurück"""
+        if self.canvas is not None:
+            self.canvas = self.canvas.crop((0, 0, self.width, min(self.canvas.height, self.total_height - self.start)))
+            await self._flush()
+        return self.parts
+
+async def save_tiled_screenshot(page, chat_title, timestamp, dirs, stitch=False):
+    """Vollbild in Kacheln: Scroll-Bereich des Chats bildschirmweise abfotografieren
+
+    Speicher und Dateigröße pro Bild hängen nur von der Fenstergröße ab, nicht
+    von der Chatlänge. Mit stitch werden die Kacheln zu Teilbildern zusammengesetzt.
+    """
+    area = await page.evaluate(SCROLL_AREA_JS)
+    clip = {key: area[key] for key in ("x", "y", "width", "height")}
+    step = max(1, area["view"])
+    scale = area["scale"]
+    stitched = None
+    if stitch:
+        stitched = StitchedImage(round(clip["width"] * scale), round(area["total"] * scale),
+                                 lambda n: full_screenshot_path(dirs, chat_title, timestamp, n))
+    
+    tops = []
+    top = 0
+    previous = None
+    try:
+        while len(tops) < SCREENSHOT_MAX_TILES:
+            actual = await page.evaluate(SCROLL_TO_JS, top)
+            if previous is not None and actual <= previous:
+                break
+            with span("screenshot:tile", top=actual):
+                if stitched:
+                    await stitched.add(await page.screenshot(clip=clip, type="png"), round(actual * scale))
+                else:
+                    tile = await encode_screenshot(await page.screenshot(clip=clip, **screenshot_options()))
+            if not stitched:
+                path = full_screenshot_path(dirs, chat_title, timestamp, len(tops) + 1)
+                await write_output_bytes(path, tile)
+            tops.append(actual)
+            if actual + step >= area["total"]:
+                break
+            previous = actual
+            top = actual + step
+        else:
+            print(f"  Kachel-Limit erreicht ({SCREENSHOT_MAX_TILES}), Rest des Chats fehlt")
+    finally:
+        with contextlib.suppress(Exception):
+            await page.evaluate(SCROLL_TO_JS, area["start"])
+    
+    if stitched:
+        files = await stitched.close()
+    else:
+        files = [full_screenshot_path(dirs, chat_title, timestamp, n) for n in range(1, len(tops) + 1)]
+    print(f"  Vollbild: {len(tops)} Kacheln" + (f" -> {len(files)} Bilder" if stitched else ""))
+    return files
+
 async def save_screenshots_for_chat(page, chat_title, timestamp, dirs, keywords=None):
     """Speichert Screenshots"""
     if not SAVE_SCREENSHOTS:
@@ -236,98 +1366,329 @@ async def save_screenshots_for_chat(page, chat_title, timestamp, dirs, keywords=
     
     screenshot_paths = []
     
-    # Vollbild-Screenshot
-    try:
-        full_path = dirs['screenshots'] / f"{chat_title}-{timestamp}-full.png"
-        await page.screenshot(path=str(full_path), full_page=True)
-        screenshot_paths.append(full_path)
-    except Exception as e:
-        print(f"  Vollbild-Screenshot fehlgeschlagen: {e}")
+    # Vollbild-Screenshot (Bytes bleiben für das Ausschneiden der Keyword-Absätze)
+    image = None
+    if SCREENSHOT_MODE == "full":
+        try:
+            full_path = full_screenshot_path(dirs, chat_title, timestamp)
+            with span("screenshot:full"):
+                image = await page.screenshot(full_page=True, **screenshot_options())
+            await write_output_bytes(full_path, await encode_screenshot(image))
+            screenshot_paths.append(full_path)
+        except Exception as e:
+            print(f"  Vollbild-Screenshot fehlgeschlagen: {e}")
+            print("  Versuche Kacheln...")
+            image = None
+    
+    if SCREENSHOT_MODE != "full" or image is None:
+        try:
+            screenshot_paths += await save_tiled_screenshot(page, chat_title, timestamp, dirs,
+                                                            stitch=SCREENSHOT_MODE == "stitched")
+        except Exception as e:
+            print(f"  Kachel-Screenshots fehlgeschlagen: {e}")
     
     # Keyword-Screenshots (nur wenn Keywords angegeben wurden)
     # WICHTIG: Nur im Main-Content suchen, nicht in Sidebar/UI
     if keywords:
-        for keyword in keywords:
-            try:
-                # Suche nur im Main-Content-Bereich
-                locator = page.locator(f"main >> text={keyword}")
-                count = await locator.count()
-                if count > 0:
-                    print(f"  Keyword '{keyword}' gefunden im Chat-Content!")
-                    element = locator.first
-                    kw_path = dirs['screenshots'] / f"{chat_title}-{timestamp}-keyword-{slug(keyword)}.png"
-                    await element.screenshot(path=str(kw_path))
-                    screenshot_paths.append(kw_path)
-                    print(f"     Screenshot gespeichert: {kw_path.name}")
-            except Exception:
-                pass
+        try:
+            screenshot_paths += await save_keyword_screenshots(page, chat_title, timestamp, dirs, keywords, image)
+        except Exception as e:
+            print(f"  Keyword-Screenshots fehlgeschlagen: {e}")
     
     return screenshot_paths
 
-async def save_raw_html(page, chat_title, timestamp, dirs):
-    """Speichert HTML-Quellcode"""
+async def save_pdf(page, chat_title, timestamp, dirs):
+    """Speichert die Seite als PDF"""
+    try:
+        pdf_path = dirs['pdf'] / f"{chat_title}-{timestamp}.pdf"
+        with span("pdf"):
+            pdf_bytes = await page.pdf(format="A4", print_background=True)
+        await write_output_bytes(pdf_path, pdf_bytes)
+        print(f"  PDF: {pdf_path.name}")
+        return pdf_path
+    except Exception as e:
+        print(f"  PDF nicht möglich: {e}")
+        return None
+
+async def save_raw_html(page, chat_title, timestamp, dirs, html_content=None):
+    """Speichert HTML-Quellcode (optional aus einem bereits erstellten Snapshot)"""
     if not SAVE_RAW_HTML:
         return None
     
     try:
-        html_content = await page.content()
+        if html_content is None:
+            html_content = await page.content()
         html_path = dirs['raw_html'] / f"{chat_title}-{timestamp}.html"
-        html_path.write_text(html_content, encoding='utf-8')
+        await write_output(html_path, html_content)
         return html_path
     except Exception as e:
         print(f"  HTML-Speicherung fehlgeschlagen: {e}")
         return None
 
+def sha256_file(path, chunk_size=1024 * 1024):
+    """SHA256 einer Datei, blockweise gelesen"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class BackupTarget:
+    """Ein Backup-Ziel mit seinem Hash-Manifest (relativer Pfad -> SHA256/Größe)"""
+    
+    def __init__(self, root):
+        self.root = pathlib.Path(root)
+        self.manifest_path = self.root / BACKUP_MANIFEST_NAME
+        self.files = {}
+        if self.manifest_path.exists():
+            try:
+                self.files = json.loads(self.manifest_path.read_text(encoding='utf-8')).get("files", {})
+            except (OSError, json.JSONDecodeError):
+                print(f"  Backup-Manifest unlesbar, prüfe alles neu: {self.manifest_path}")
+        # Inhalt -> vorhandene Kopie (für Hardlinks über Exporte hinweg)
+        self.blobs = {entry["sha256"]: rel for rel, entry in self.files.items()}
+        self.lock = threading.Lock()
+        self.stats = Counter()
+    
+    def backup_file(self, src, rel, sha, size):
+        dest = self.root / rel
+        entry = self.files.get(rel)
+        if entry and entry["sha256"] == sha and dest.exists() and dest.stat().st_size == size:
+            self.stats["unverändert"] += 1
+            return
+        
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{threading.get_ident()}.tmp")
+        try:
+            existing = self.blobs.get(sha)
+            existing_path = self.root / existing if existing else None
+            linked = False
+            if existing_path and existing_path != dest and existing_path.exists() \
+                    and existing_path.stat().st_size == size:
+                try:
+                    os.link(existing_path, tmp)
+                    linked = True
+                except OSError:
+                    pass  # z.B. FAT32/exFAT ohne Hardlinks -> normal kopieren
+            if not linked:
+                shutil.copy2(src, tmp)
+                if sha256_file(tmp) != sha:
+                    raise IOError(f"Prüfsumme nach dem Kopieren falsch: {rel}")
+            os.replace(tmp, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+        
+        with self.lock:
+            self.files[rel] = {"sha256": sha, "size": size}
+            self.blobs.setdefault(sha, rel)
+            self.stats["verlinkt" if linked else "kopiert"] += 1
+    
+    def save(self):
+        data = json.dumps({"updated": datetime.now().isoformat(), "files": self.files}, ensure_ascii=False)
+        atomic_write_bytes(self.manifest_path, data.encode("utf-8"))
+
 def copy_to_backup_locations(source_dir):
-    """Kopiert Export zu zusätzlichen Backup-Orten"""
+    """Kopiert Export inkrementell zu zusätzlichen Backup-Orten (parallel, ohne Rückfragen)"""
     if not BACKUP_LOCATIONS:
         return
     
-    import shutil
+    from concurrent.futures import ThreadPoolExecutor
     
     print("\n" + "="*60)
     print("Erstelle Backups...")
     print("="*60)
     
+    targets = []
     for backup_path in BACKUP_LOCATIONS:
+        backup_path = pathlib.Path(backup_path)
+        if not backup_path.exists():
+            if not BACKUP_CREATE_MISSING:
+                print(f"Backup-Pfad existiert nicht, überspringe: {backup_path}")
+                continue
+            backup_path.mkdir(parents=True, exist_ok=True)
+        targets.append(BackupTarget(backup_path))
+    
+    if not targets:
+        print("="*60)
+        return
+    
+    files = [p for p in source_dir.rglob("*") if p.is_file()]
+    
+    with ThreadPoolExecutor(max_workers=BACKUP_THREADS, thread_name_prefix="backup") as pool:
+        # Quell-Hashes einmal berechnen, für alle Ziele
+        hashes = list(pool.map(sha256_file, files))
+        
+        jobs = []
+        for target in targets:
+            print(f"Sichere nach: {target.root / source_dir.name}")
+            for src, sha in zip(files, hashes):
+                rel = (pathlib.Path(source_dir.name) / src.relative_to(source_dir)).as_posix()
+                jobs.append((target, pool.submit(target.backup_file, src, rel, sha, src.stat().st_size)))
+        
+        for target, job in jobs:
+            try:
+                job.result()
+            except Exception as e:
+                target.stats["fehlgeschlagen"] += 1
+                print(f"  Backup-Fehler ({target.root}): {e}")
+    
+    for target in targets:
         try:
-            backup_path = pathlib.Path(backup_path)
-            target = backup_path / source_dir.name
-            
-            if not backup_path.exists():
-                print(f"Backup-Pfad existiert nicht: {backup_path}")
-                print(f"Soll er erstellt werden? (j/n)")
-                response = input().strip().lower()
-                if response == 'j':
-                    backup_path.mkdir(parents=True, exist_ok=True)
-                else:
-                    continue
-            
-            print(f"Kopiere nach: {target}")
-            shutil.copytree(source_dir, target, dirs_exist_ok=True)
-            print(f"Backup erfolgreich: {target}")
-            
-        except Exception as e:
-            print(f"Backup fehlgeschlagen für {backup_path}: {e}")
+            target.save()
+        except OSError as e:
+            print(f"Backup-Manifest nicht gespeichert für {target.root}: {e}")
+        summary = ", ".join(f"{count} {name}" for name, count in sorted(target.stats.items()))
+        print(f"Backup {target.root}: {summary or 'nichts zu tun'}")
     
     print("="*60)
 
-async def extract_turns(page):
+# Mehrere Selektoren, in dieser Reihenfolge probiert
+TURN_SELECTORS = [
+    'main [data-testid="conversation-turn"]',
+    'main [data-message-author-role]',
+    'main article',
+    'main div[class*="group"]',  # Neue ChatGPT UI
+]
+
+# Notnagel-Selektoren: passen auch auf fremde Elemente, werden deshalb nie gelernt
+# und nie vor die spezifischeren Selektoren gezogen
+GENERIC_SELECTORS = frozenset({
+    'main div[class*="group"]',
+    'div[class*="project"] a:has-text("{name}")',
+})
+
+# Ketten, deren Reihenfolge eine Rangfolge ist: ein anderer Turn-Selektor ändert
+# Granularität und Text der Turns und damit die Hashes für --incremental. Die
+# Kette wird ohnehin in einem evaluate()-Aufruf probiert; gelernt wird nur zur Info.
+RANKED_CHAINS = frozenset({"turns"})
+
+class SelectorProfile:
+    """Merkt sich pro Selektor-Kette den Selektor, der zuletzt gegriffen hat
+
+    order() stellt ihn an den Anfang der Kette, record() bestätigt oder ersetzt
+    ihn. Selektoren, die es im Code nicht mehr gibt, und GENERIC_SELECTORS
+    werden ignoriert; RANKED_CHAINS bleiben in ihrer festen Reihenfolge.
+    """
+    
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.learned = {}
+        self.dirty = False
+        if self.path.exists():
+            try:
+                self.learned = json.loads(self.path.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                print(f"Selektor-Profil nicht lesbar ({e}), lerne neu")
+    
+    def order(self, chain, selectors):
+        """Selektor-Kette mit dem gelernten Selektor vorne"""
+        learned = self.learned.get(chain, {}).get("selector")
+        if (not LEARN_SELECTORS or chain in RANKED_CHAINS or learned not in selectors
+                or learned in GENERIC_SELECTORS):
+            return list(selectors)
+        return [learned] + [selector for selector in selectors if selector != learned]
+    
+    def record(self, chain, selector):
+        """Selektor hat gegriffen - bestätigen oder den bisherigen ersetzen"""
+        if not LEARN_SELECTORS or selector in GENERIC_SELECTORS:
+            return
+        entry = self.learned.get(chain)
+        if entry and entry["selector"] == selector:
+            entry["hits"] += 1
+        else:
+            if entry:
+                print(f"  Selektor für '{chain}' passt nicht mehr, neu gelernt: {selector}")
+            self.learned[chain] = {"selector": selector, "hits": 1,
+                                   "learned_at": datetime.now().isoformat(timespec="seconds")}
+        self.dirty = True
+    
+    def save(self):
+        if self.dirty and LEARN_SELECTORS:
+            atomic_write_bytes(self.path, json.dumps(self.learned, indent=2, ensure_ascii=False).encode("utf-8"))
+            self.dirty = False
+
+# Wird beim ersten Gebrauch geladen und in finish_export() gespeichert
+SELECTOR_PROFILE = None
+
+def selector_profile():
+    global SELECTOR_PROFILE
+    if SELECTOR_PROFILE is None:
+        SELECTOR_PROFILE = SelectorProfile(SELECTOR_PROFILE_PATH)
+    return SELECTOR_PROFILE
+
+# Liest alle Turns in einem einzigen Browser-Roundtrip aus
+# (gleiche Selektor-Kette und Rollen-Fallbacks wie die Einzel-Abfragen)
+EXTRACT_TURNS_JS = """
+(selectors) => {
+    for (const selector of selectors) {
+        const elements = document.querySelectorAll(selector);
+        if (!elements.length) continue;
+        const turns = [];
+        for (const el of elements) {
+            try {
+                let role = el.getAttribute("data-message-author-role");
+                if (!role) {
+                    const classes = (el.getAttribute("class") || "").toLowerCase();
+                    if (classes.includes("user")) role = "user";
+                    else if (classes.includes("assistant")) role = "assistant";
+                }
+                let id = el.getAttribute("data-message-id");
+                if (!id) {
+                    const inner = el.querySelector("[data-message-id]");
+                    id = inner ? inner.getAttribute("data-message-id") : null;
+                }
+                turns.push({role: role || null, text: el.innerText || "", id: id});
+            } catch (e) {}
+        }
+        return {selector: selector, turns: turns};
+    }
+    return null;
+}
+"""
+
+def build_turns(raw_turns):
+    """Baut die Turn-Liste aus rohen Einträgen (role/text/id)"""
+    turns = []
+    for raw in raw_turns:
+        txt = (raw.get("text") or "").strip()
+        if not txt:
+            continue
+        role = raw.get("role")
+        if not role:
+            # Fallback: Wenn keine Rolle, nimm abwechselnd user/assistant
+            role = "user" if len(turns) % 2 == 0 else "assistant"
+        turn = dict(raw, role=role, text=txt)
+        turn.setdefault("id", None)
+        turns.append(turn)
+    return turns
+
+async def extract_turns(page):
     """Extrahiert Chat-Nachrichten - VERBESSERTE VERSION"""
     await page.wait_for_selector("main", timeout=15000)
     
-    # Mehrere Selektoren probieren
-    selectors = [
-        'main [data-testid="conversation-turn"]',
-        'main [data-message-author-role]',
-        'main article',
-        'main div[class*="group"]',  # Neue ChatGPT UI
-    ]
+    profile = selector_profile()
+    try:
+        result = await page.evaluate(EXTRACT_TURNS_JS, profile.order("turns", TURN_SELECTORS))
+    except Exception as e:
+        print(f"  Batch-Extraktion fehlgeschlagen ({e}), nutze Einzel-Abfragen...")
+        return await extract_turns_per_element(page)
+    
+    if not result or not result["turns"]:
+        print("  WARNUNG: Keine Chat-Elemente gefunden!")
+        return []
     
+    profile.record("turns", result["selector"])
+    print(f"  Turns gefunden mit Selektor: {result['selector']} ({len(result['turns'])} Elemente)")
+    return build_turns(result["turns"])
+
+async def extract_turns_per_element(page):
+    """Fallback: Extrahiert Turns mit einzelnen Abfragen pro Element"""
     elements = None
-    for selector in selectors:
+    profile = selector_profile()
+    for selector in profile.order("turns", TURN_SELECTORS):
         elements = await page.locator(selector).all()
         if elements and len(elements) > 0:
+            profile.record("turns", selector)
             print(f"  Turns gefunden mit Selektor: {selector} ({len(elements)} Elemente)")
             break
     
@@ -335,7 +1696,7 @@ async def extract_turns(page):
         print("  WARNUNG: Keine Chat-Elemente gefunden!")
         return []
     
-    turns = []
+    raw_turns = []
     for el in elements:
         try:
             # Rolle ermitteln
@@ -348,22 +1709,699 @@ async def extract_turns(page):
                 elif "assistant" in classes.lower():
                     role_attr = "assistant"
             
+            # Nachrichten-ID (am Element selbst oder im Inneren)
+            msg_id = await el.get_attribute("data-message-id")
+            if not msg_id:
+                inner = el.locator("[data-message-id]")
+                if await inner.count() > 0:
+                    msg_id = await inner.first.get_attribute("data-message-id")
+            
             # Text extrahieren
             txt = await el.inner_text()
-            txt = txt.strip()
-            
-            if txt and role_attr:
-                turns.append({"role": role_attr, "text": txt})
-            elif txt:
-                # Fallback: Wenn keine Rolle, nimm abwechselnd user/assistant
-                role = "user" if len(turns) % 2 == 0 else "assistant"
-                turns.append({"role": role, "text": txt})
+            raw_turns.append({"role": role_attr, "text": txt, "id": msg_id})
         except Exception as e:
             print(f"  Fehler beim Extrahieren eines Elements: {e}")
             continue
     
+    return build_turns(raw_turns)
+
+# ============================================================================
+# NETZWERK-EXTRAKTION (CONVERSATION-JSON)
+# ============================================================================
+
+# Das Web-Frontend lädt jeden Chat als JSON von dieser API
+CONVERSATION_API_RE = re.compile(r"/backend-api/conversation/([0-9a-zA-Z-]+)(?:\?|$)")
+
+def _message_text(content):
+    """Text aus dem content-Objekt einer Nachricht"""
+    if not content:
+        return ""
+    if "parts" not in content:
+        # z.B. content_type "code"
+        return content.get("text") or ""
+    return "\n".join(part for part in content["parts"] or [] if isinstance(part, str))
+
+def turns_from_conversation_json(data):
+    """Baut Turns aus dem Conversation-JSON (aktiver Zweig, nur User/Assistant)"""
+    mapping = data.get("mapping") or {}
+    node_id = data.get("current_node")
+    
+    # Aktiven Zweig von current_node bis zur Wurzel verfolgen
+    chain = []
+    while node_id and node_id in mapping:
+        chain.append(mapping[node_id])
+        node_id = mapping[node_id].get("parent")
+    chain.reverse()
+    
+    raw_turns = []
+    for node in chain:
+        message = node.get("message")
+        if not message:
+            continue
+        role = (message.get("author") or {}).get("role")
+        if role not in ("user", "assistant"):
+            continue
+        if (message.get("metadata") or {}).get("is_visually_hidden_from_conversation"):
+            continue
+        raw_turns.append({
+            "role": role,
+            "text": _message_text(message.get("content")),
+            "id": message.get("id"),
+            "create_time": message.get("create_time"),
+        })
+    
+    return build_turns(raw_turns)
+
+def _is_conversation_response(response):
+    return response.request.method == "GET" and CONVERSATION_API_RE.search(response.url) is not None
+
+async def goto_and_capture_turns(page, url):
+    """Navigiert zum Chat und baut Turns aus der abgefangenen JSON-Antwort.
+
+    Gibt None zurück wenn keine passende Antwort kam (dann DOM-Fallback).
+    """
+    try:
+        async with page.expect_response(_is_conversation_response, timeout=WAIT_MAX_MS) as response_info:
+            await page.goto(url, wait_until="domcontentloaded")
+        response = await response_info.value
+        data = await response.json()
+    except Exception as e:
+        print(f"  Conversation-JSON nicht abgefangen ({e}), nutze DOM...")
+        return None
+    
+    turns = turns_from_conversation_json(data)
+    print(f"  Turns aus Conversation-JSON: {len(turns)}")
     return turns
 
+# ============================================================================
+# WARTEN (READINESS)
+# ============================================================================
+
+# Sichtbar solange eine Antwort noch generiert wird
+STREAMING_SELECTORS = [
+    '[data-testid="stop-button"]',
+    'button[aria-label*="Stop"]',
+    '.result-streaming',
+]
+
+# Wahr, sobald die Turn-Anzahl stable_ms lang gleich bleibt und nichts streamt.
+# Der Zustand liegt im Fenster und ist an ein Token pro Aufruf gebunden.
+CONVERSATION_READY_JS = """
+(args) => {
+    let count = 0;
+    for (const selector of args.selectors) {
+        count = document.querySelectorAll(selector).length;
+        if (count) break;
+    }
+    const busy = args.streaming.some((s) => document.querySelector(s));
+    const now = performance.now();
+    let state = window.__exportWait;
+    if (!state || state.token !== args.token) {
+        state = window.__exportWait = {token: args.token, count: -1, since: now};
+    }
+    if (busy || count !== state.count) {
+        state.count = count;
+        state.since = now;
+        return false;
+    }
+    if (count > 0) return now - state.since >= args.stableMs;
+    // Keine Turns: leerer Chat, sobald die App steht und eine Weile nichts nachkommt
+    return document.readyState === 'complete' && !!document.querySelector('main') &&
+        now - state.since >= args.emptyMs;
+}
+"""
+
+# Gemessene Wartezeiten pro Wartepunkt (Sekunden)
+WAIT_TIMINGS = {}
+
+def record_wait(name, seconds, ready=True):
+    """Merkt sich, wie lange ein Wartepunkt tatsächlich gedauert hat"""
+    entry = WAIT_TIMINGS.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0})
+    entry["count"] += 1
+    entry["total"] += seconds
+    entry["max"] = max(entry["max"], seconds)
+    if not ready:
+        entry["timeouts"] += 1
+
+async def timed_wait(name, awaitable):
+    """Wartet auf awaitable, misst die Dauer und behandelt Timeouts als 'nicht bereit'"""
+    start = time.perf_counter()
+    ready = True
+    try:
+        with span(f"wait:{name}"):
+            await awaitable
+    except PlaywrightTimeoutError:
+        ready = False
+    record_wait(name, time.perf_counter() - start, ready)
+    return ready
+
+async def wait_for_conversation_ready(page, max_ms=None, stable_ms=None):
+    """Wartet bis ein Chat fertig gerendert ist (statt fester Pause)
+
+    Kein Warten auf Netzwerk-Ruhe: chatgpt.com hat ständig Analytics-/Long-Poll-
+    Verkehr. Maßgeblich ist, dass die Turn-Anzahl stabil bleibt.
+    """
+    max_ms = WAIT_MAX_MS if max_ms is None else max_ms
+    stable_ms = WAIT_STABLE_MS if stable_ms is None else stable_ms
+    
+    args = {
+        "selectors": selector_profile().order("turns", TURN_SELECTORS),
+        "streaming": STREAMING_SELECTORS,
+        "stableMs": stable_ms,
+        "emptyMs": WAIT_EMPTY_MS,
+        "token": f"{time.perf_counter_ns()}",
+    }
+    ready = await timed_wait("conversation_ready", page.wait_for_function(
+        CONVERSATION_READY_JS, arg=args, polling=WAIT_POLL_MS, timeout=max_ms))
+    if not ready:
+        print(f"  Chat nach {max_ms} ms nicht stabil, fahre trotzdem fort...")
+    return ready
+
+def save_wait_timings(outdir):
+    """Speichert die gemessenen Wartezeiten neben export_info.json"""
+    summary = {}
+    for name, entry in sorted(WAIT_TIMINGS.items()):
+        summary[name] = {
+            "count": entry["count"],
+            "total_s": round(entry["total"], 3),
+            "avg_s": round(entry["total"] / entry["count"], 3),
+            "max_s": round(entry["max"], 3),
+            "timeouts": entry["timeouts"],
+        }
+    
+    path = outdir / "wait_timings.json"
+    path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding='utf-8')
+    
+    print("\nWartezeiten:")
+    for name, entry in summary.items():
+        print(f"  {name}: {entry['count']}x, Ø {entry['avg_s']:.2f}s, max {entry['max_s']:.2f}s, "
+              f"Timeouts {entry['timeouts']}")
+    return summary
+
+# ============================================================================
+# TRACING (SPANS PRO STUFE)
+# ============================================================================
+
+# Abgeschlossene Spans als Chrome-Trace-Events ("X" = Dauer-Event, Zeiten in µs)
+TRACE_EVENTS = []
+TRACE_ORIGIN = time.perf_counter()
+TRACE_ORIGIN_EPOCH = time.time()  # Zum Zusammenführen der Traces mehrerer Prozesse
+_TRACE_LANES = weakref.WeakKeyDictionary()
+_TRACE_LANE_IDS = itertools.count(1)
+
+_NO_SPAN = contextlib.nullcontext()
+
+def _trace_lane():
+    """Spur im Trace: eine pro asyncio-Task (Tab/Worker) bzw. pro Schreib-Thread"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    key = task if task is not None else threading.current_thread()
+    lane = _TRACE_LANES.get(key)
+    if lane is None:
+        lane = _TRACE_LANES[key] = next(_TRACE_LANE_IDS)
+        label = task.get_name() if task is not None else threading.current_thread().name
+        TRACE_EVENTS.append({"ph": "M", "name": "thread_name", "pid": os.getpid(), "tid": lane,
+                             "args": {"name": label}})
+    return lane
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+    
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        event = {
+            "ph": "X", "name": self.name, "cat": self.name.split(":", 1)[0],
+            "ts": round((self.start - TRACE_ORIGIN) * 1e6, 1),
+            "dur": round((end - self.start) * 1e6, 1),
+            "pid": os.getpid(), "tid": _trace_lane(),
+        }
+        if exc_type is not None:
+            self.args = dict(self.args, error=exc_type.__name__)
+        if self.args:
+            event["args"] = self.args
+        TRACE_EVENTS.append(event)
+        return False
+
+def span(name, **args):
+    """Misst einen Abschnitt (with span("pdf"): ...); ohne TRACE_ENABLED ein No-op"""
+    if not TRACE_ENABLED:
+        return _NO_SPAN
+    return _Span(name, args)
+
+def _percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+def save_trace(outdir):
+    """Schreibt trace.json und trace_summary.json neben export_info.json"""
+    if not TRACE_ENABLED:
+        return None
+    
+    durations = {}
+    for event in TRACE_EVENTS:
+        if event["ph"] == "X":
+            durations.setdefault(event["name"], []).append(event["dur"] / 1000)
+    
+    summary = {}
+    for name, values in sorted(durations.items()):
+        values.sort()
+        summary[name] = {
+            "count": len(values),
+            "total_ms": round(sum(values), 1),
+            "p50_ms": round(_percentile(values, 50), 1),
+            "p95_ms": round(_percentile(values, 95), 1),
+            "max_ms": round(values[-1], 1),
+        }
+    
+    trace = {"traceEvents": TRACE_EVENTS, "displayTimeUnit": "ms",
+             "otherData": {"origin_epoch": TRACE_ORIGIN_EPOCH}}
+    (outdir / "trace.json").write_text(json.dumps(trace), encoding='utf-8')
+    (outdir / "trace_summary.json").write_text(json.dumps(summary, indent=2, ensure_ascii=False),
+                                               encoding='utf-8')
+    
+    print("\nStufen (Trace):")
+    print(f"  {'Stufe':32s} {'Anzahl':>7s} {'Gesamt':>10s} {'p50':>9s} {'p95':>9s} {'max':>9s}")
+    for name, entry in sorted(summary.items(), key=lambda item: -item[1]["total_ms"]):
+        print(f"  {name:32s} {entry['count']:7d} {entry['total_ms'] / 1000:9.2f}s "
+              f"{entry['p50_ms']:7.0f}ms {entry['p95_ms']:7.0f}ms {entry['max_ms']:7.0f}ms")
+    print(f"  Trace: {outdir / 'trace.json'} (chrome://tracing oder ui.perfetto.dev)")
+    return summary
+
+# ============================================================================
+# MANIFEST (INKREMENTELLER EXPORT & RESUME)
+# ============================================================================
+
+def conversation_id_from_url(url):
+    """Ermittelt die Conversation-ID aus einer Chat-URL (/c/ID)"""
+    match = re.search(r"/c/([^/?#]+)", url)
+    return match.group(1) if match else url
+
+class ExportManifest:
+    """Persistentes JSONL-Manifest aller exportierten Chats
+
+    Jede Zeile ist entweder ein Lauf-Eintrag (type=run) oder ein Chat-Eintrag
+    (type=chat). Beim Laden gewinnt der letzte Eintrag pro Conversation-ID.
+    Zeilen werden sofort geschrieben, ein Absturz verliert höchstens den
+    gerade laufenden Chat.
+    """
+    
+    def __init__(self, path, incremental=False, log_path=None):
+        self.path = pathlib.Path(path)
+        # Shard-Prozesse lesen das gemeinsame Manifest, schreiben aber in eine eigene
+        # Datei (gleichzeitiges Anhängen mehrerer Prozesse kann Zeilen zerreißen)
+        self.log_path = pathlib.Path(log_path) if log_path else self.path
+        self.incremental = incremental
+        self.chats = {}        # conversation_id -> letzter Chat-Eintrag
+        self.runs = {}         # run_id -> letzter Lauf-Eintrag
+        self.last_run = None   # Zuletzt geschriebener Lauf-Eintrag (egal welcher run_id)
+        self.run_id = None
+        self.seen_ids = set()  # In diesem Lauf bereits bearbeitete Chats
+        self._load()
+    
+    def _load(self):
+        if not self.path.exists():
+            return
+        with self.path.open(encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Abgebrochene letzte Zeile nach Absturz ignorieren
+                    continue
+                self._apply(entry)
+    
+    def _apply(self, entry):
+        if entry.get("type") == "run":
+            self.runs[entry["run_id"]] = entry
+            self.last_run = entry
+        elif entry.get("type") == "chat":
+            self.chats[entry["conversation_id"]] = entry
+    
+    def _append(self, entry):
+        if entry["type"] == "run":
+            self.runs[entry["run_id"]] = entry
+            self.last_run = entry
+        with self.log_path.open("a", encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    
+    def merge(self, log_path):
+        """Übernimmt die vollständigen Zeilen eines Shard-Manifests; gibt deren Anzahl zurück"""
+        log_path = pathlib.Path(log_path)
+        if not log_path.exists():
+            return 0
+        lines = []
+        with log_path.open(encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._apply(entry)
+                lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+        with self.path.open("a", encoding='utf-8') as f:
+            f.writelines(lines)
+        return len(lines)
+    
+    def interrupted_run(self, name):
+        """Letzter nicht abgeschlossener Lauf mit gleichem Export-Namen (falls Ordner existiert)"""
+        # Nicht list(self.runs)[-1]: ein fortgesetzter Lauf behält seine alte Position im dict
+        last = self.last_run
+        if last is None:
+            return None
+        if last.get("status") == "finished" or last.get("name") != name:
+            return None
+        if not pathlib.Path(last["export_dir"]).exists():
+            return None
+        return last
+    
+    def begin_run(self, run_id, name, export_dir):
+        """Startet einen Lauf; bei Resume werden dessen Chats als erledigt markiert"""
+        self.run_id = run_id
+        for conv_id, entry in self.chats.items():
+            if entry.get("run_id") == run_id:
+                self.seen_ids.add(conv_id)
+        self._append({
+            "type": "run",
+            "run_id": run_id,
+            "name": name,
+            "status": "started",
+            "export_dir": str(export_dir),
+            "time": datetime.now().isoformat(),
+        })
+        return len(self.seen_ids)
+    
+    def finish_run(self, exported_count):
+        run = self.runs.get(self.run_id, {})
+        self._append({
+            "type": "run",
+            "run_id": self.run_id,
+            "name": run.get("name"),
+            "status": "finished",
+            "export_dir": run.get("export_dir", ""),
+            "exported": exported_count,
+            "time": datetime.now().isoformat(),
+        })
+    
+    def claim(self, conv_id):
+        """False wenn der Chat in diesem Lauf schon bearbeitet wurde (phasenübergreifend)"""
+        if conv_id in self.seen_ids:
+            return False
+        self.seen_ids.add(conv_id)
+        return True
+    
+    def is_unchanged(self, conv_id, sha256_markdown):
+        entry = self.chats.get(conv_id)
+        return bool(entry) and entry.get("sha256_markdown") == sha256_markdown
+    
+    def record(self, conv_id, url, project_name, sha256_markdown, artifacts, status="exported"):
+        entry = {
+            "type": "chat",
+            "conversation_id": conv_id,
+            "run_id": self.run_id,
+            "status": status,
+            "url": url,
+            "project": project_name,
+            "exported_at": datetime.now().isoformat(),
+            "sha256_markdown": sha256_markdown,
+            "artifacts": artifacts,
+        }
+        self.chats[conv_id] = entry
+        self._append(entry)
+        return entry
+
+# ============================================================================
+# KORPUS-KEYWORDS (TF-IDF)
+# ============================================================================
+
+def document_terms(text):
+    """Termhäufigkeiten eines Chats (Wörter ohne Stopwörter + Akronyme)"""
+    terms = Counter(WORD_RE.findall(text.lower()))
+    for word in STOPWORDS.intersection(terms):
+        del terms[word]
+    for _, acronym in CAPITALIZED_RE.findall(text):
+        if acronym:
+            terms[acronym.lower()] += 1
+    return terms
+
+def update_corpus_tfidf(manifest, outdir, state_path=None, num_keywords=5):
+    """Bewertet die Keywords aller Chats im Manifest per TF-IDF neu
+
+    Die Term-Vektoren (dünn besetzt, pro Chat auf TFIDF_MAX_TERMS_PER_DOC
+    gekürzt) werden im State gespeichert; bei späteren Läufen werden nur neue
+    oder geänderte Chats (anderer SHA256) neu eingelesen. Ergebnisse landen
+    als "tfidf_keywords" in den Metadaten und als corpus_keywords.json.
+    """
+    state_path = pathlib.Path(state_path or TFIDF_STATE_PATH)
+    state = {}
+    if state_path.exists():
+        try:
+            state = json.loads(state_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            state = {}
+    docs = state.get("docs", {})
+    
+    # Bundles einmal pro Durchlauf öffnen statt pro Lese-/Schreibzugriff
+    bundles = {}
+    try:
+        return _update_corpus_tfidf(manifest, outdir, state_path, docs, num_keywords, bundles)
+    finally:
+        for bundle in bundles.values():
+            bundle.close()
+
+def _update_corpus_tfidf(manifest, outdir, state_path, docs, num_keywords, bundles):
+    import heapq, math
+    
+    # Term-Vektoren aktualisieren (nur neue/geänderte Chats einlesen)
+    current = {}
+    reread = 0
+    for conv_id, entry in manifest.chats.items():
+        artifacts = entry.get("artifacts") or {}
+        md_path = artifacts.get("markdown")
+        if not md_path or not artifact_exists(md_path, artifacts):
+            continue
+        cached = docs.get(conv_id)
+        if cached and cached.get("sha") == entry.get("sha256_markdown"):
+            current[conv_id] = cached
+            continue
+        try:
+            terms = document_terms(read_artifact(md_path, artifacts, bundles).decode('utf-8'))
+        except (OSError, ValueError):
+            continue
+        current[conv_id] = {
+            "sha": entry.get("sha256_markdown"),
+            "tf": dict(terms.most_common(TFIDF_MAX_TERMS_PER_DOC)),
+        }
+        reread += 1
+    
+    # Dokumentfrequenzen
+    df = Counter()
+    for doc in current.values():
+        df.update(doc["tf"].keys())
+    n_docs = len(current)
+    idf = {term: math.log((1 + n_docs) / (1 + count)) + 1 for term, count in df.items()}
+    
+    # Pro Chat neu bewerten und Metadaten nur bei Änderung schreiben
+    corpus_scores = Counter()
+    updated = 0
+    for conv_id, doc in current.items():
+        scores = {term: (1 + math.log(tf)) * idf[term] for term, tf in doc["tf"].items()}
+        top = heapq.nlargest(num_keywords, scores.items(), key=lambda item: item[1])
+        corpus_scores.update(scores)
+        
+        artifacts = manifest.chats[conv_id].get("artifacts") or {}
+        meta_path = artifacts.get("metadata")
+        if not meta_path or not artifact_exists(meta_path, artifacts):
+            continue
+        try:
+            meta = json.loads(read_artifact(meta_path, artifacts, bundles).decode('utf-8'))
+        except (OSError, ValueError):
+            # Kaputte Metadaten (z.B. abgeschnitten) überspringen statt den Durchlauf abzubrechen
+            continue
+        
+        # Originalschreibweise aus den Auto-Keywords übernehmen (z.B. "MCP")
+        spelling = {kw.lower(): kw for kw in meta.get("auto_keywords", [])}
+        tfidf_keywords = [spelling.get(term, term.capitalize()) for term, _ in top]
+        if meta.get("tfidf_keywords") != tfidf_keywords:
+            meta["tfidf_keywords"] = tfidf_keywords
+            meta["tfidf_scores"] = {term: round(score, 4) for term, score in top}
+            write_artifact(meta_path, json.dumps(meta, indent=2, ensure_ascii=False).encode('utf-8'), artifacts,
+                           bundles)
+            updated += 1
+    
+    state_path.write_text(json.dumps({"docs": current}, ensure_ascii=False), encoding='utf-8')
+    
+    summary = {
+        "generated": datetime.now().isoformat(),
+        "documents": n_docs,
+        "vocabulary": len(df),
+        "most_common_terms": [{"term": term, "documents": count} for term, count in df.most_common(50)],
+        "top_tfidf_terms": [{"term": term, "score": round(score, 2)}
+                            for term, score in corpus_scores.most_common(50)],
+    }
+    (outdir / "corpus_keywords.json").write_text(
+        json.dumps(summary, indent=2, ensure_ascii=False), encoding='utf-8')
+    
+    print(f"\nTF-IDF: {n_docs} Chats, {len(df)} Terme, {reread} neu eingelesen, "
+          f"{updated} Metadaten aktualisiert")
+    return summary
+
+# ============================================================================
+# VOLLTEXTSUCHE (SQLITE FTS5)
+# ============================================================================
+
+class SearchIndex:
+    """Volltext-Index über alle exportierten Chats mit Turn-Granularität
+
+    Jeder Export ersetzt die Turns seiner Conversation-ID. Suchen laufen
+    offline gegen die SQLite-Datei, ohne Chrome zu starten. Einträge kommen
+    aus dem Thread-Pool des Schreibers, daher mit Lock.
+    """
+    
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=60)
+        migrate = not self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'turn_rows'").fetchone()
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS chats (
+                conversation_id TEXT PRIMARY KEY,
+                title TEXT,
+                project TEXT,
+                url TEXT,
+                markdown_path TEXT,
+                exported_at TEXT
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS turns USING fts5(
+                text,
+                role UNINDEXED,
+                project UNINDEXED,
+                conversation_id UNINDEXED,
+                turn_index UNINDEXED,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+            -- FTS5-Spalten haben keinen Index: Turn-Zeilen pro Chat hier nachschlagen
+            CREATE TABLE IF NOT EXISTS turn_rows (
+                turn_rowid INTEGER PRIMARY KEY,
+                conversation_id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS turn_rows_conversation ON turn_rows (conversation_id);
+        """)
+        if migrate:
+            # Index aus einer älteren Version: Zuordnung einmalig nachtragen
+            with self.conn:
+                self.conn.execute("INSERT INTO turn_rows SELECT rowid, conversation_id FROM turns")
+    
+    def add_chat(self, conv_id, title, url, project_name, turns, markdown_path=None):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM turns WHERE rowid IN (SELECT turn_rowid FROM turn_rows WHERE conversation_id = ?)",
+                (conv_id,))
+            self.conn.execute("DELETE FROM turn_rows WHERE conversation_id = ?", (conv_id,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO chats VALUES (?, ?, ?, ?, ?, ?)",
+                (conv_id, title, project_name or "", url, str(markdown_path or ""),
+                 datetime.now().isoformat(timespec="seconds")))
+            for i, turn in enumerate(turns):
+                self._insert_turn(turn["text"], turn["role"], project_name or "", conv_id, i)
+    
+    def _insert_turn(self, text, role, project, conv_id, turn_index):
+        cursor = self.conn.execute(
+            "INSERT INTO turns (text, role, project, conversation_id, turn_index) VALUES (?, ?, ?, ?, ?)",
+            (text, role, project, conv_id, turn_index))
+        self.conn.execute("INSERT INTO turn_rows VALUES (?, ?)", (cursor.lastrowid, conv_id))
+    
+    def merge(self, path):
+        """Übernimmt alle Chats eines Shard-Index (gleiche Conversation-IDs werden ersetzt)"""
+        with self.lock:
+            self.conn.execute("ATTACH DATABASE ? AS shard", (str(path),))
+            try:
+                with self.conn:
+                    shard_ids = "SELECT conversation_id FROM shard.chats"
+                    self.conn.execute(
+                        "DELETE FROM turns WHERE rowid IN "
+                        f"(SELECT turn_rowid FROM turn_rows WHERE conversation_id IN ({shard_ids}))")
+                    self.conn.execute(f"DELETE FROM turn_rows WHERE conversation_id IN ({shard_ids})")
+                    self.conn.execute("INSERT OR REPLACE INTO chats SELECT * FROM shard.chats")
+                    for row in self.conn.execute(
+                            "SELECT text, role, project, conversation_id, turn_index FROM shard.turns"):
+                        self._insert_turn(*row)
+                count = self.conn.execute("SELECT COUNT(*) FROM shard.chats").fetchone()[0]
+            finally:
+                self.conn.execute("DETACH DATABASE shard")
+        return count
+    
+    def search(self, query, limit=20, role=None, project=None):
+        """Liefert die besten Treffer (BM25) mit Snippet"""
+        sql = """
+            SELECT c.title, c.project, t.role, t.turn_index, c.markdown_path,
+                   snippet(turns, 0, '[', ']', '…', 16), bm25(turns)
+            FROM turns t JOIN chats c ON c.conversation_id = t.conversation_id
+            WHERE turns MATCH ?
+        """
+        params = [query]
+        if role:
+            sql += " AND t.role = ?"
+            params.append(role)
+        if project:
+            sql += " AND t.project = ?"
+            params.append(project)
+        sql += " ORDER BY bm25(turns) LIMIT ?"
+        params.append(limit)
+        with self.lock:
+            try:
+                rows = self.conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError:
+                # Freitext mit Sonderzeichen: jedes Wort als Phrase suchen
+                params[0] = " ".join('"' + w.replace('"', '""') + '"' for w in query.split())
+                rows = self.conn.execute(sql, params).fetchall()
+        return [
+            {"title": r[0], "project": r[1], "role": r[2], "turn": r[3],
+             "markdown": r[4], "snippet": r[5], "score": -r[6]}
+            for r in rows
+        ]
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+# Wird in run() geöffnet, export_chat trägt jeden Chat ein
+SEARCH_INDEX = None
+
+def search_command(query, limit=20, role=None, project=None):
+    """CLI: Durchsucht den Index und gibt Treffer mit Snippet aus"""
+    path = pathlib.Path(SEARCH_INDEX_PATH)
+    if not path.exists():
+        print(f"Kein Suchindex gefunden: {path}")
+        return 1
+    
+    index = SearchIndex(path)
+    start = time.perf_counter()
+    results = index.search(query, limit=limit, role=role, project=project)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    index.close()
+    
+    print(f"{len(results)} Treffer für '{query}' ({elapsed_ms:.1f} ms)\n")
+    for n, hit in enumerate(results, 1):
+        project_info = f" [{hit['project']}]" if hit['project'] else ""
+        print(f"{n}. {hit['title']}{project_info} - {hit['role']}, Turn {hit['turn'] + 1}")
+        print(f"   {hit['snippet']}")
+        if hit['markdown']:
+            print(f"   {hit['markdown']}")
+    return 0
+
 # ============================================================================
 # SIDEBAR & NAVIGATION
 # ============================================================================
@@ -377,34 +2415,39 @@ SIDEBAR_SELECTORS = [
 
 async def wait_for_sidebar(page, timeout_ms=120000):
     """Wartet auf Sidebar"""
-    end = asyncio.get_event_loop().time() + (timeout_ms / 1000)
-    while asyncio.get_event_loop().time() < end:
-        for sel in SIDEBAR_SELECTORS:
-            if await page.locator(sel).count() > 0:
-                return True
-        await asyncio.sleep(1.0)
-    return False
+    return await timed_wait("sidebar", page.wait_for_selector(
+        ", ".join(SIDEBAR_SELECTORS), state="attached", timeout=timeout_ms))
+
+# Projekt-Link in der Sidebar ({name} = Projektname)
+PROJECT_LINK_SELECTORS = [
+    'nav a:has-text("{name}")',
+    'aside a:has-text("{name}")',
+    '[data-testid="project-list"] a:has-text("{name}")',
+    'div[class*="project"] a:has-text("{name}")',
+]
 
 async def navigate_to_project(page, project_name):
     """Navigiert zu einem bestimmten Projekt"""
+    with span("navigate_to_project", project=project_name):
+        return await _navigate_to_project(page, project_name)
+
+async def _navigate_to_project(page, project_name):
     print(f"\nNavigiere zu Projekt: {project_name}")
     
     # Aktuelle URL merken
     url_before = page.url
     print(f"  URL vorher: {url_before}")
     
-    # Warte kurz für Projektliste
-    await asyncio.sleep(2.0)
+    # Suche nach Projekt-Link in der Sidebar (zuletzt erfolgreicher Selektor zuerst)
+    profile = selector_profile()
+    templates = profile.order("project_link", PROJECT_LINK_SELECTORS)
+    project_selectors = [template.format(name=project_name) for template in templates]
     
-    # Suche nach Projekt-Link in der Sidebar
-    project_selectors = [
-        f'nav a:has-text("{project_name}")',
-        f'aside a:has-text("{project_name}")',
-        f'[data-testid="project-list"] a:has-text("{project_name}")',
-        f'div[class*="project"] a:has-text("{project_name}")',
-    ]
+    # Warte bis die Projektliste einen passenden Link zeigt
+    await timed_wait("project_list", page.wait_for_selector(
+        ", ".join(project_selectors), state="attached", timeout=WAIT_MAX_MS))
     
-    for selector in project_selectors:
+    for template, selector in zip(templates, project_selectors):
         try:
             locator = page.locator(selector)
             count = await locator.count()
@@ -412,7 +2455,12 @@ async def navigate_to_project(page, project_name):
                 print(f"  Projekt gefunden mit Selektor: {selector}")
                 await locator.first.click()
                 await page.wait_for_load_state("domcontentloaded")
-                await asyncio.sleep(3.0)  # Mehr Zeit für Projekt-Chats laden
+                
+                # Warte auf URL-Wechsel und die ersten Projekt-Chats
+                await timed_wait("project_url", page.wait_for_url(
+                    lambda url: url != url_before, timeout=WAIT_MAX_MS))
+                await timed_wait("project_chats", page.wait_for_selector(
+                    'a[href*="/g/g-p-"][href*="/c/"]', state="attached", timeout=WAIT_MAX_MS))
                 
                 # Prüfe ob URL sich geändert hat
                 url_after = page.url
@@ -420,6 +2468,7 @@ async def navigate_to_project(page, project_name):
                 
                 if url_after != url_before:
                     print(f"  -> Erfolgreich zu Projekt navigiert")
+                    profile.record("project_link", template)
                     return True
                 else:
                     print(f"  -> URL unverändert, versuche nächsten Selektor...")
@@ -432,143 +2481,619 @@ async def navigate_to_project(page, project_name):
     print(f"  FEHLER: Projekt '{project_name}' nicht gefunden!")
     return False
 
-async def get_chat_links(page, in_project=False, export_all=False):
-    """Holt Chat-Links - jetzt mit Projekt-Unterscheidung"""
-    
-    # Alle Chat-Links holen
-    all_links = await page.locator('a[href*="/c/"]').all()
-    
-    if not all_links:
-        print("  WARNUNG: Keine Chat-Links gefunden!")
-        return []
-    
-    print(f"  Gesamt gefundene Links: {len(all_links)}")
-    
+# Sammelt neue Chat-Links (pro Harvest-Token nur einmal) und scrollt die
+# Chatliste einen Schritt weiter. Virtualisierte Listen werden so vollständig.
+HARVEST_SIDEBAR_JS = """
+(args) => {
+    const links = Array.from(document.querySelectorAll('a[href*="/c/"]'));
+    const hrefs = [];
+    for (const a of links) {
+        if (a.dataset.exportHarvest === args.token) continue;
+        a.dataset.exportHarvest = args.token;
+        hrefs.push(a.href);
+    }
+    // Scrollbaren Container der Chatliste finden
+    let box = links.length ? links[links.length - 1].parentElement : null;
+    while (box && !(box.scrollHeight > box.clientHeight + 1 &&
+                    /(auto|scroll)/.test(getComputedStyle(box).overflowY))) {
+        box = box.parentElement;
+    }
+    if (box) {
+        box.scrollTop = box.scrollTop + box.clientHeight * args.step;
+    }
+    return {hrefs: hrefs, total: links.length};
+}
+"""
+
+# Wahr sobald nach dem Scrollen neue (noch nicht gesammelte) Links auftauchen
+HARVEST_HAS_NEW_JS = """
+(token) => Array.from(document.querySelectorAll('a[href*="/c/"]'))
+    .some((a) => a.dataset.exportHarvest !== token)
+"""
+
+HARVEST_SCROLL_STEP = 0.9     # Anteil der Listenhöhe pro Scroll-Schritt
+HARVEST_SCROLL_WAIT_MS = 1500 # Max. Wartezeit auf neue Einträge nach dem Scrollen
+HARVEST_IDLE_ROUNDS = 2       # Abbruch nach so vielen Schritten ohne neue Links
+
+async def harvest_chat_urls(page, in_project=False, export_all=False):
+    """Scrollt die Chatliste schrittweise und liefert neue Chat-URLs als Async-Generator
+
+    Die Projekt-Filterung (/g/g-p-) passiert bereits beim Sammeln, damit der
+    Export nach dem ersten Schwung starten kann.
+    """
     if export_all:
-        # --all Modus: KEINE Filterung, alle Links zurückgeben
         print("  Modus --all: Exportiere ALLE Chats (Projekte + Normale)")
-        return all_links
-    
     elif in_project:
-        # Im Projekt: Nur Links die "/g/g-p-" in der URL haben
         print("  Filtere nach Projekt-Chats (URL enthält '/g/g-p-')...")
-        project_links = []
+    else:
+        print("  Filtere nach normalen Chats (URL ohne '/g/g-p-')...")
+    
+    token = f"{time.perf_counter_ns()}"
+    seen = set()
+    matched = 0
+    idle_rounds = 0
+    
+    while idle_rounds < HARVEST_IDLE_ROUNDS:
+        with span("harvest_sidebar"):
+            result = await page.evaluate(HARVEST_SIDEBAR_JS, {"token": token, "step": HARVEST_SCROLL_STEP})
         
-        for link in all_links:
-            href = await link.get_attribute("href")
-            if href and "/g/g-p-" in href:
-                project_links.append(link)
+        for href in result["hrefs"]:
+            if href in seen:
+                continue
+            seen.add(href)
+            if not export_all and (("/g/g-p-" in href) != in_project):
+                continue
+            matched += 1
+            yield href
         
-        print(f"  Projekt-Chat-Links gefunden: {len(project_links)} Stück")
-        return project_links
+        # Auf nachgeladene Einträge warten statt fest zu schlafen
+        has_new = await timed_wait("sidebar_scroll", page.wait_for_function(
+            HARVEST_HAS_NEW_JS, arg=token, polling=WAIT_POLL_MS, timeout=HARVEST_SCROLL_WAIT_MS))
+        idle_rounds = 0 if has_new else idle_rounds + 1
     
+    if not seen:
+        print("  WARNUNG: Keine Chat-Links gefunden!")
     else:
-        # Außerhalb von Projekten: Nur Links die NICHT "/g/g-p-" haben
-        print("  Filtere nach normalen Chats (URL ohne '/g/g-p-')...")
-        normal_links = []
-        
-        for link in all_links:
-            href = await link.get_attribute("href")
-            if href and "/g/g-p-" not in href:
-                normal_links.append(link)
-        
-        print(f"  Normale Chat-Links gefunden: {len(normal_links)} Stück")
-        return normal_links
-
-async def export_chat_list(page, chat_links, dirs, project_name, keywords, filter_keywords):
-    """Exportiert eine Liste von Chats"""
-    if not chat_links:
-        print("Keine Chats zum Exportieren.")
-        return 0
-    
-    # URLs aus Links extrahieren (bevor DOM sich ändert)
-    chat_urls = []
-    for link in chat_links:
-        href = await link.get_attribute("href")
-        if href:
-            # Relative URLs zu absoluten machen
-            if href.startswith('/'):
-                href = f"https://chatgpt.com{href}"
-            chat_urls.append(href)
-    
-    print(f"Chat-URLs extrahiert: {len(chat_urls)}")
-    
-    seen_urls = set()
-    exported_count = 0
-    skipped_count = 0
+        print(f"  Chatliste vollständig gelesen: {len(seen)} Links, davon {matched} passend")
+
+async def get_chat_links(page, in_project=False, export_all=False):
+    """Holt alle Chat-URLs auf einmal - jetzt mit Projekt-Unterscheidung"""
+    with span("get_chat_links"):
+        return [url async for url in harvest_chat_urls(page, in_project, export_all)]
+
+async def export_chat_url(page, url, dirs, project_name, keywords, filter_keywords, manifest=None):
+    """Öffnet eine Chat-URL und exportiert sie (inkl. Filter-Check).
+
+    Gibt "exported", "unchanged", "skipped" oder "failed" zurück.
+    """
+    turns = None
+    if EXTRACT_ENGINE == "network":
+        with span("goto"):
+            turns = await goto_and_capture_turns(page, url)
+        # Gerenderte Seite nur abwarten wenn PDF/Screenshots/HTML gebraucht werden
+        if turns is None or SAVE_PDF or SAVE_SCREENSHOTS or SAVE_RAW_HTML:
+            await wait_for_conversation_ready(page)
+    else:
+        # Direkt zur URL navigieren
+        with span("goto"):
+            await page.goto(url, wait_until="domcontentloaded")
+        await wait_for_conversation_ready(page)
     
-    for i, url in enumerate(chat_urls):
-        if url in seen_urls:
-            continue
+    if turns is None:
+        with span("extract_turns"):
+            turns = await extract_turns(page)
+    if not turns:
+        print(f"  -> Kein Inhalt, überspringe...")
+        return "skipped"
+    
+    # Ein Durchlauf: Markdown-Temp-Datei, SHA256, Filter- und Tagging-Keywords zusammen
+    matcher = None
+    if keywords or filter_keywords:
+        matcher = keyword_matcher(tuple(keywords or ()) + tuple(filter_keywords or ()))
+    with span("markdown"):
+        rendered = await run_in_writer(render_markdown, turns, dirs['markdown'], matcher)
+    
+    try:
+        # Filter-Check: Wenn filter_keywords gesetzt, erst Inhalt prüfen
+        if filter_keywords:
+            # Prüfen ob mindestens ein Filter-Keyword enthalten ist
+            has_keyword = any(KeywordMatcher.count(rendered.keyword_hits, kw) for kw in filter_keywords)
+            
+            if not has_keyword:
+                print(f"  -> Filter-Keywords nicht gefunden, überspringe...")
+                return "skipped"
         
-        print(f"\n[{i+1}/{len(chat_urls)}] Öffne Chat: {url.split('/')[-1][:20]}...")
+        # Inkrementell: Unveränderte Chats nicht erneut exportieren
+        conv_id = conversation_id_from_url(url)
+        sha = rendered.sha256
+        if manifest and manifest.incremental and manifest.is_unchanged(conv_id, sha):
+            print(f"  -> Unverändert seit {manifest.chats[conv_id]['exported_at'][:19]}, überspringe...")
+            previous = manifest.chats[conv_id]
+            manifest.record(conv_id, url, project_name, sha, previous.get("artifacts", {}), status="unchanged")
+            return "unchanged"
         
-        try:
-            # Direkt zur URL navigieren
-            await page.goto(url, wait_until="domcontentloaded")
-            await asyncio.sleep(2.0)
+        # Export durchführen (Seite ist bereits bereit, Markdown schon geschrieben)
+        result = await export_chat(page, dirs, project_name, keywords, wait=False, turns=turns,
+                                   rendered=rendered)
+    finally:
+        rendered.discard()
+    if not result:
+        return "failed"
+    
+    if manifest:
+        manifest.record(conv_id, url, project_name, result["sha256_markdown"], result["artifacts"])
+    return "exported"
+
+# Summen über alle export_chat_list-Aufrufe eines Laufs (Exit-Code, Daemon-Fortschritt)
+RUN_STATS = Counter()
+
+def count_status(stats, status):
+    stats[status] += 1
+    RUN_STATS[status] += 1
+
+# Freie Tabs zum Wiederverwenden (nur im Daemon; None = Tabs nach Gebrauch schließen)
+IDLE_PAGES = None
+
+async def acquire_page(ctx):
+    """Holt einen freien Tab aus dem Pool oder öffnet einen neuen"""
+    while IDLE_PAGES:
+        page = IDLE_PAGES.pop()
+        if not page.is_closed():
+            return page
+    return await ctx.new_page()
+
+async def release_page(page):
+    """Gibt einen Tab an den Pool zurück (oder schließt ihn)"""
+    if page.is_closed():
+        return
+    if IDLE_PAGES is not None and len(IDLE_PAGES) < DAEMON_PAGE_POOL:
+        IDLE_PAGES.append(page)
+    else:
+        await page.close()
+
+async def export_chat_list(page, chat_urls, dirs, project_name, keywords, filter_keywords, workers=1, manifest=None):
+    """Exportiert eine Liste von Chats
+
+    chat_urls ist eine Liste oder ein Async-Generator (harvest_chat_urls).
+    Mit workers > 1 werden N zusätzliche Tabs im selben Browser-Kontext
+    geöffnet, die die URLs parallel über eine begrenzte Queue abarbeiten,
+    während der Haupt-Tab weiter die Chatliste einliest.
+    Mit Manifest gilt die Duplikat-Erkennung für den ganzen Lauf.
+    """
+    if workers <= 1 and hasattr(chat_urls, "__aiter__"):
+        # Ein Tab: Chatliste erst vollständig lesen, dann navigieren
+        chat_urls = [url async for url in chat_urls]
+    
+    if isinstance(chat_urls, list):
+        if not chat_urls:
+            print("Keine Chats zum Exportieren.")
+            return 0
+        print(f"Chat-URLs extrahiert: {len(chat_urls)}")
+    
+    stats = {"exported": 0, "unchanged": 0, "skipped": 0, "failed": 0, "duplicate": 0}
+    seen_ids = set()
+    
+    def claim(url):
+        # Phasen- und projektübergreifend über das Manifest, sonst lokal
+        conv_id = conversation_id_from_url(url)
+        if manifest:
+            return manifest.claim(conv_id)
+        if conv_id in seen_ids:
+            return False
+        seen_ids.add(conv_id)
+        return True
+    
+    if workers <= 1:
+        for i, url in enumerate(chat_urls):
+            if not claim(url):
+                count_status(stats, "duplicate")
+                continue
             
-            # Filter-Check: Wenn filter_keywords gesetzt, erst Inhalt prüfen
-            if filter_keywords:
-                turns = await extract_turns(page)
-                if not turns:
-                    print(f"  -> Kein Inhalt, überspringe...")
-                    skipped_count += 1
-                    continue
-                
-                # Markdown erstellen für Filter-Check
-                md_content = as_markdown(turns)
-                content_lower = md_content.lower()
-                
-                # Prüfen ob mindestens ein Filter-Keyword enthalten ist
-                has_keyword = False
-                for filter_kw in filter_keywords:
-                    if filter_kw.lower() in content_lower:
-                        has_keyword = True
-                        break
-                
-                if not has_keyword:
-                    print(f"  -> Filter-Keywords nicht gefunden, überspringe...")
-                    skipped_count += 1
-                    continue
+            print(f"\n[{i+1}/{len(chat_urls)}] Öffne Chat: {url.split('/')[-1][:20]}...")
             
-            # Export durchführen
-            success = await export_chat(page, dirs, project_name, keywords)
+            try:
+                with span("chat", url=url) as chat_span:
+                    status = await export_chat_url(page, url, dirs, project_name, keywords, filter_keywords, manifest)
+                    if chat_span is not None:
+                        chat_span.args["status"] = status
+                count_status(stats, status)
             
-            if success:
-                exported_count += 1
-                seen_urls.add(url)
-        
-        except Exception as e:
-            print(f"  FEHLER beim Exportieren: {e}")
-            continue
+            except Exception as e:
+                print(f"  FEHLER beim Exportieren: {e}")
+                count_status(stats, "failed")
+                continue
+    else:
+        await _export_with_workers(page.context, chat_urls, stats, workers, claim,
+                                   dirs, project_name, keywords, filter_keywords, manifest)
     
-    if filter_keywords and skipped_count > 0:
-        print(f"\n  Übersprungen (Filter): {skipped_count} Chats")
+    if filter_keywords and stats["skipped"] > 0:
+        print(f"\n  Übersprungen (Filter): {stats['skipped']} Chats")
+    if stats["unchanged"]:
+        print(f"  Unverändert (inkrementell): {stats['unchanged']} Chats")
+    if stats["duplicate"]:
+        print(f"  Bereits in diesem Lauf bearbeitet: {stats['duplicate']} Chats")
+    if workers > 1:
+        print(f"\n  Worker-Pool ({workers} Tabs): {stats['exported']} exportiert, "
+              f"{stats['skipped']} übersprungen, {stats['failed']} fehlgeschlagen")
     
-    return exported_count
+    return stats["exported"]
+
+async def _export_with_workers(ctx, chat_urls, stats, workers, claim, dirs, project_name, keywords, filter_keywords, manifest):
+    """Arbeitet die Chat-URLs mit mehreren Tabs über eine begrenzte Queue ab"""
+    queue = asyncio.Queue(maxsize=workers * 2)
+    total = len(chat_urls) if isinstance(chat_urls, list) else "?"
+    
+    async def iterate_urls():
+        if isinstance(chat_urls, list):
+            for url in chat_urls:
+                yield url
+        else:
+            async for url in chat_urls:
+                yield url
+    
+    async def producer():
+        try:
+            i = 0
+            async for url in iterate_urls():
+                if not claim(url):
+                    count_status(stats, "duplicate")
+                    continue
+                await queue.put((i, url))
+                i += 1
+        finally:
+            # Worker immer beenden, auch wenn das Einlesen abbricht
+            for _ in range(workers):
+                await queue.put(None)
+    
+    async def worker(worker_id):
+        page = None
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                i, url = item
+                print(f"\n[W{worker_id}] [{i+1}/{total}] Öffne Chat: {url.split('/')[-1][:20]}...")
+                try:
+                    # Abgestürzte Tabs ersetzen, damit ein Fehler nicht den Worker beendet
+                    if page is None or page.is_closed():
+                        page = await acquire_page(ctx)
+                    with span("chat", url=url) as chat_span:
+                        status = await export_chat_url(page, url, dirs, project_name, keywords, filter_keywords, manifest)
+                        if chat_span is not None:
+                            chat_span.args["status"] = status
+                    count_status(stats, status)
+                except Exception as e:
+                    print(f"  [W{worker_id}] FEHLER beim Exportieren: {e}")
+                    count_status(stats, "failed")
+        finally:
+            if page is not None:
+                await release_page(page)
+    
+    results = await asyncio.gather(
+        asyncio.create_task(producer(), name="harvest"),
+        *(asyncio.create_task(worker(n + 1), name=f"worker-{n + 1}") for n in range(workers)),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"  Worker-Fehler: {result}")
+
+# ============================================================================
+# RENDER-PIPELINE (PDF & SCREENSHOTS ENTKOPPELT)
+# ============================================================================
+
+SCRIPT_TAG_RE = re.compile(r"<script\b[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL)
+HEAD_TAG_RE = re.compile(r"<head\b[^>]*>", re.IGNORECASE)
+
+def static_snapshot(html, base_url):
+    """Macht einen DOM-Snapshot statisch renderbar (ohne Skripte, mit Basis-URL für CSS/Bilder)"""
+    html = SCRIPT_TAG_RE.sub("", html)
+    base_tag = f'<base href="{base_url}">'
+    match = HEAD_TAG_RE.search(html)
+    if match:
+        return html[:match.end()] + base_tag + html[match.end():]
+    return base_tag + html
+
+class ArtifactPipeline:
+    """Erzeugt PDFs und Screenshots aus Snapshots auf eigenen Render-Tabs
+
+    Der Chat-Tab übergibt nur den Snapshot und navigiert weiter. Die Queue
+    ist begrenzt, damit der Crawl bei langsamem Rendern gebremst wird.
+    """
+    
+    def __init__(self, ctx, workers=RENDER_WORKERS, queue_size=RENDER_QUEUE_SIZE):
+        self.ctx = ctx
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.tasks = []
+        self.pages = {}  # worker_id -> Render-Tab (zum Aufräumen beim Abbruch)
+        self.stats = {"rendered": 0, "failed": 0}
+    
+    def start(self):
+        self.tasks = [asyncio.create_task(self._consumer(n + 1), name=f"render-{n + 1}")
+                      for n in range(self.workers)]
+        return self
+    
+    async def submit(self, url, html, title, ts, dirs, keywords):
+        await self.queue.put((url, html, title, ts, dirs, keywords))
+    
+    async def _consumer(self, worker_id):
+        page = None
+        while True:
+            job = await self.queue.get()
+            if job is None:
+                break
+            url, html, title, ts, dirs, keywords = job
+            try:
+                if page is None or page.is_closed():
+                    page = self.pages[worker_id] = await acquire_page(self.ctx)
+                with span("render:set_content"):
+                    await page.set_content(static_snapshot(html, url), wait_until="load", timeout=WAIT_MAX_MS)
+                print(f"  [R{worker_id}] Rendere {title}")
+                if SAVE_PDF:
+                    await save_pdf(page, title, ts, dirs)
+                if SAVE_SCREENSHOTS:
+                    await save_screenshots_for_chat(page, title, ts, dirs, keywords)
+                self.stats["rendered"] += 1
+            except Exception as e:
+                print(f"  [R{worker_id}] Rendern fehlgeschlagen für {title}: {e}")
+                self.stats["failed"] += 1
+        self.pages.pop(worker_id, None)
+        if page is not None:
+            await release_page(page)
+    
+    async def close(self, cancel=False):
+        """Wartet bis alle Snapshots gerendert sind und schließt die Render-Tabs
+
+        Mit cancel (Export ist mit Fehler abgebrochen) werden wartende Snapshots
+        verworfen, laufende Render-Aufträge abgebrochen und deren Tabs geschlossen.
+        """
+        if cancel:
+            dropped = 0
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                dropped += 1
+            for task in self.tasks:
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+            for page in self.pages.values():
+                with contextlib.suppress(Exception):
+                    await page.close()
+            self.pages.clear()
+            print(f"Render-Pipeline abgebrochen: {dropped} Snapshots verworfen")
+            return
+        for _ in self.tasks:
+            await self.queue.put(None)
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        print(f"Render-Pipeline: {self.stats['rendered']} gerendert, {self.stats['failed']} fehlgeschlagen")
+
+# Wird in run() gestartet wenn RENDER_WORKERS > 0
+ARTIFACT_PIPELINE = None
+
+# ============================================================================
+# CAPTURE-PROFILE (REQUEST-ROUTING)
+# ============================================================================
+
+CAPTURE_PROFILES = {
+    "full": {"block_types": frozenset(), "block_third_party": False},
+    "archival": {"block_types": frozenset({"media", "texttrack"}), "block_third_party": True},
+    "text-only": {"block_types": frozenset({"image", "media", "texttrack", "font", "manifest"}),
+                  "block_third_party": True},
+}
+
+# Hosts der Web-App (inkl. Subdomains) - alles andere gilt als Fremd-Host (Tracking, Widgets, ...)
+FIRST_PARTY_HOSTS = ("chatgpt.com", "openai.com", "oaistatic.com", "oaiusercontent.com",
+                     "challenges.cloudflare.com")
+
+# Übliche Größen, solange für einen Typ noch keine Antwort gemessen wurde (für die Ersparnis-Schätzung)
+TYPICAL_RESOURCE_BYTES = {"image": 30000, "font": 40000, "media": 500000, "script": 60000,
+                          "stylesheet": 20000, "xhr": 5000, "fetch": 5000}
+
+def resolve_capture_profile(name=None):
+    # Mit PDF/Screenshots kein Routing: "archival" blockt nur Fremd-Hosts/Medien,
+    # der verlorene HTTP-Cache (JS/CSS/Bilder pro Chat neu) kostet mehr als das spart
+    name = name or CAPTURE_PROFILE
+    if name == "auto":
+        return "full" if SAVE_PDF or SAVE_SCREENSHOTS else "text-only"
+    return name
+
+class CaptureRouter:
+    """Blockt per Route-Interception, was die gewählten Artefakte nicht brauchen, und zählt mit
+
+    Playwright deaktiviert mit ctx.route() den HTTP-Cache des ganzen Kontexts.
+    """
+    
+    def __init__(self, profile):
+        self.profile = profile
+        self.block_types = CAPTURE_PROFILES[profile]["block_types"]
+        self.block_third_party = CAPTURE_PROFILES[profile]["block_third_party"]
+        host = urlsplit(CHATGPT_URL).hostname
+        self.first_party = FIRST_PARTY_HOSTS + ((host,) if host else ())
+        self.reset()
+    
+    def reset(self):
+        self.allowed = 0
+        self.blocked = Counter()        # Grund (Ressourcentyp oder "third-party")
+        self.blocked_types = Counter()  # Ressourcentyp der geblockten Requests
+        self.loaded_bytes = Counter()   # Ressourcentyp -> geladene Bytes (Content-Length)
+        self.loaded_count = Counter()
+        self.shard_bytes_loaded = 0     # Bereits zusammengefasste Werte aus Shard-Prozessen
+        self.shard_bytes_saved = 0
+    
+    def is_first_party(self, host):
+        return any(host == domain or host.endswith("." + domain) for domain in self.first_party)
+    
+    def block_reason(self, request):
+        if request.resource_type in self.block_types:
+            return request.resource_type
+        if self.block_third_party:
+            host = urlsplit(request.url).hostname
+            if host and not self.is_first_party(host):
+                return "third-party"
+        return None
+    
+    async def handle(self, route):
+        reason = self.block_reason(route.request)
+        if reason:
+            self.blocked[reason] += 1
+            self.blocked_types[route.request.resource_type] += 1
+            await route.abort("blockedbyclient")
+        else:
+            self.allowed += 1
+            await route.continue_()
+    
+    def on_response(self, response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            resource_type = response.request.resource_type
+            self.loaded_bytes[resource_type] += int(length)
+            self.loaded_count[resource_type] += 1
+    
+    async def install(self, ctx):
+        await ctx.route("**/*", self.handle)
+        ctx.on("response", self.on_response)
+    
+    def summary(self):
+        saved = 0
+        for resource_type, count in self.blocked_types.items():
+            if self.loaded_count[resource_type]:
+                average = self.loaded_bytes[resource_type] / self.loaded_count[resource_type]
+            else:
+                average = TYPICAL_RESOURCE_BYTES.get(resource_type, 5000)
+            saved += count * average
+        return {
+            "profile": self.profile,
+            "requests_allowed": self.allowed,
+            "requests_blocked": sum(self.blocked.values()),
+            "blocked_by_reason": dict(self.blocked),
+            "bytes_loaded": sum(self.loaded_bytes.values()) + self.shard_bytes_loaded,
+            "bytes_saved_estimate": int(saved) + self.shard_bytes_saved,
+        }
+
+# Router des laufenden Browser-Kontexts (None bei "full")
+CAPTURE_ROUTER = None
+
+def save_capture_stats(outdir):
+    """Schreibt capture_stats.json und setzt die Zähler für den nächsten Lauf zurück"""
+    if CAPTURE_ROUTER is None:
+        return None
+    summary = CAPTURE_ROUTER.summary()
+    path = outdir / "capture_stats.json"
+    path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f"\nCapture-Profil {summary['profile']}: {summary['requests_blocked']} Requests geblockt, "
+          f"~{summary['bytes_saved_estimate'] / (1024 * 1024):.1f} MB gespart (geschätzt), "
+          f"{summary['bytes_loaded'] / (1024 * 1024):.1f} MB geladen")
+    CAPTURE_ROUTER.reset()
+    return summary
+
+# ============================================================================
+# BROWSER-START & LOGIN
+# ============================================================================
+
+BROWSER_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-extensions",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+async def launch_browser_context(pw, unattended=False, capture=True):
+    """Startet den Browser-Kontext und gibt (ctx, browser) zurück
+    
+    Normal: echtes Chrome-Profil (persistenter Kontext, browser ist None).
+    Unbeaufsichtigt: headless mit gespeichertem Storage-State - deutlich schneller.
+    Mit capture=True wird das Capture-Profil (Request-Routing) aktiviert.
+    """
+    global CAPTURE_ROUTER
+    
+    if unattended:
+        browser = await pw.chromium.launch(headless=True, channel=BROWSER_CHANNEL, args=BROWSER_ARGS)
+        ctx = await browser.new_context(storage_state=STORAGE_STATE_PATH)
+    else:
+        browser = None
+        ctx = await pw.chromium.launch_persistent_context(
+            user_data_dir=USER_DATA_DIR,
+            headless=BROWSER_HEADLESS,
+            channel=BROWSER_CHANNEL,
+            args=BROWSER_ARGS,
+        )
+    
+    # WebDriver-Flag entfernen (für alle Tabs des Kontexts)
+    await ctx.add_init_script("""
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => undefined
+        });
+    """)
+    
+    profile = resolve_capture_profile()
+    if capture and profile != "full":
+        CAPTURE_ROUTER = CaptureRouter(profile)
+        await CAPTURE_ROUTER.install(ctx)
+        print(f"Capture-Profil: {profile}")
+    return ctx, browser
+
+async def close_browser_context(ctx, browser):
+    await ctx.close()
+    if browser is not None:
+        await browser.close()
+
+async def save_login_state(ctx):
+    """Sichert Cookies + Local Storage für unbeaufsichtigte Läufe (nur für den Besitzer lesbar)"""
+    state = await ctx.storage_state()
+    atomic_write_bytes(STORAGE_STATE_PATH, json.dumps(state).encode("utf-8"), private=True)
+    print(f"Login-Status gespeichert: {pathlib.Path(STORAGE_STATE_PATH).absolute()}")
+
+async def login_command():
+    """CLI: Öffnet Chrome zum manuellen Login und speichert danach den Storage-State"""
+    async with async_playwright() as pw:
+        ctx, browser = await launch_browser_context(pw, capture=False)
+        page = await ctx.new_page()
+        await page.goto(f"{CHATGPT_URL}/", wait_until="domcontentloaded", timeout=30000)
+        
+        print("Bitte im geöffneten Chrome einloggen (inkl. CAPTCHA).")
+        print(f"Sobald die Chatliste sichtbar ist, wird der Login gespeichert "
+              f"(max. {LOGIN_WAIT_MS // 60000} Minuten)...")
+        logged_in = await wait_for_sidebar(page, timeout_ms=LOGIN_WAIT_MS)
+        if logged_in:
+            await save_login_state(ctx)
+        else:
+            print("Keine Chatliste erkannt - Login nicht gespeichert.")
+        await close_browser_context(ctx, browser)
+    return EXIT_OK if logged_in else EXIT_NOT_LOGGED_IN
 
 # ============================================================================
 # HAUPTPROGRAMM
 # ============================================================================
 
-async def export_chat(page, dirs, project_name=None, keywords=None):
-    """Exportiert einen einzelnen Chat mit allen Features"""
+async def export_chat(page, dirs, project_name=None, keywords=None, wait=True, turns=None, rendered=None):
+    """Exportiert einen einzelnen Chat mit allen Features
+
+    Gibt ein Ergebnis-Dict (SHA256 + Artefakt-Pfade) zurück, oder False wenn
+    kein Inhalt erkannt wurde. Bereits extrahierte Turns und das schon
+    gerenderte Markdown (MarkdownRender) können übergeben werden.
+    """
     
     # Warte auf Content
-    await page.wait_for_load_state("domcontentloaded")
-    await asyncio.sleep(2.0)  # Mehr Zeit für Rendering
+    if wait:
+        await page.wait_for_load_state("domcontentloaded")
+        await wait_for_conversation_ready(page)
     
     title = slug(await page.title())
     
     # Turns extrahieren
-    turns = await extract_turns(page)
+    if turns is None:
+        with span("extract_turns"):
+            turns = await extract_turns(page)
     
     if not turns or len(turns) == 0:
         print(f"  -> Kein Inhalt erkannt in '{title}', überspringe...")
         return False
     
     ts = datetime.now().isoformat(timespec="seconds").replace(":", "-")
+    # Dateiname mit Conversation-ID: Chats mit gleichem Titel, die in derselben
+    # Sekunde exportiert werden (Worker-Tabs, Shards), überschreiben sich sonst
+    name = f"{title}-{slug(conversation_id_from_url(page.url))[:40]}"
     
     # Bei Projekt-Chats: Unterordner erstellen
     actual_dirs = dirs
@@ -577,25 +3102,46 @@ async def export_chat(page, dirs, project_name=None, keywords=None):
         actual_dirs = {}
         for key, base_dir in dirs.items():
             project_dir = base_dir / project_slug
-            project_dir.mkdir(exist_ok=True)
+            if OUTPUT_BUNDLE is None:
+                project_dir.mkdir(exist_ok=True)
             actual_dirs[key] = project_dir
     
-    # Markdown speichern
-    md_content = as_markdown(turns)
-    md_path = actual_dirs['markdown'] / f"{title}-{ts}.md"
-    md_path.write_text(md_content, encoding="utf-8")
+    # Markdown speichern (gestreamt: Temp-Datei wird nur noch ans Ziel verschoben)
+    if rendered is None:
+        matcher = keyword_matcher(tuple(keywords)) if keywords else None
+        with span("markdown"):
+            rendered = await run_in_writer(render_markdown, turns, dirs['markdown'], matcher)
+    md_path = actual_dirs['markdown'] / f"{name}-{ts}.md"
+    rendered.place(md_path)
     print(f"  Markdown: {md_path.name}")
+    artifacts = {"markdown": str(md_path)}
+    if OUTPUT_BUNDLE is not None:
+        artifacts["bundle"] = str(OUTPUT_BUNDLE.path)
+    
+    # Volltext-Index
+    if SEARCH_INDEX:
+        with span("search_index"):
+            await run_in_background("Suchindex", SEARCH_INDEX.add_chat, conversation_id_from_url(page.url),
+                                    title, page.url, project_name, turns, md_path)
+    
+    # Mit Render-Pipeline: Snapshot jetzt, PDF/Screenshots später auf Render-Tabs
+    snapshot = None
+    if ARTIFACT_PIPELINE and (SAVE_PDF or SAVE_SCREENSHOTS):
+        with span("snapshot"):
+            snapshot = await page.content()
     
     # PDF speichern
-    try:
-        pdf_path = actual_dirs['pdf'] / f"{title}-{ts}.pdf"
-        await page.pdf(path=str(pdf_path), format="A4", print_background=True)
-        print(f"  PDF: {pdf_path.name}")
-    except Exception as e:
-        print(f"  PDF nicht möglich: {e}")
+    if SAVE_PDF and not snapshot:
+        pdf_path = await save_pdf(page, name, ts, actual_dirs)
+        if pdf_path:
+            artifacts["pdf"] = str(pdf_path)
     
     # Metadaten IMMER speichern
-    meta = await save_chat_metadata(page, title, ts, md_content, actual_dirs, project_name, keywords)
+    with span("metadata"):
+        meta = await save_chat_metadata(page, name, ts, None, actual_dirs, project_name, keywords,
+                                        rendered.keyword_hits, rendered.sha256, rendered.auto_keywords,
+                                        display_title=title)
+    artifacts["metadata"] = str(actual_dirs['metadata'] / f"{name}-{ts}.json")
     
     # Auto-Keywords immer ausgeben
     if meta.get("auto_keywords"):
@@ -604,26 +3150,84 @@ async def export_chat(page, dirs, project_name=None, keywords=None):
     # Manuelle Keyword-Ausgabe nur wenn Keywords angegeben wurden
     if keywords:
         if meta.get("manual_keywords_found"):
-            print(f"  Manuelle Keywords gefunden: {', '.join(meta['manual_keywords_found'])}")
+            found = [f"{kw} ({meta['manual_keyword_counts'][kw]}x)" for kw in meta['manual_keywords_found']]
+            print(f"  Manuelle Keywords gefunden: {', '.join(found)}")
         else:
             print(f"  Keine manuellen Keywords gefunden (gesucht: {', '.join(keywords)})")
     
     # Screenshots
-    if SAVE_SCREENSHOTS:
-        screenshots = await save_screenshots_for_chat(page, title, ts, actual_dirs, keywords)
+    if SAVE_SCREENSHOTS and not snapshot:
+        screenshots = await save_screenshots_for_chat(page, name, ts, actual_dirs, keywords)
         if screenshots:
             print(f"  Screenshots: {len(screenshots)}")
+            artifacts["screenshots"] = [str(p) for p in screenshots]
     
     # HTML
     if SAVE_RAW_HTML:
-        html = await save_raw_html(page, title, ts, actual_dirs)
+        with span("raw_html"):
+            html = await save_raw_html(page, name, ts, actual_dirs, html_content=snapshot)
         if html:
             print(f"  HTML: {html.name}")
+            artifacts["raw_html"] = str(html)
+    
+    # PDF/Screenshots an die Render-Pipeline übergeben (blockiert nur wenn die Queue voll ist)
+    if snapshot:
+        with span("render_queue"):
+            await ARTIFACT_PIPELINE.submit(page.url, snapshot, name, ts, actual_dirs, keywords)
+        if SAVE_PDF:
+            artifacts["pdf"] = str(actual_dirs['pdf'] / f"{name}-{ts}.pdf")
+        if SAVE_SCREENSHOTS:
+            number = None if SCREENSHOT_MODE == "full" else 1
+            artifacts["screenshots"] = [str(full_screenshot_path(actual_dirs, name, ts, number))]
+    
+    return {
+        "title": title,
+        "sha256_markdown": meta["sha256_markdown"],
+        "artifacts": artifacts,
+    }
+
+def open_run_services(export_dir, index_path=None):
+    """Öffnet Suchindex, Schreiber, Artifact-Store und Bundle und legt die Ordner an"""
+    global SEARCH_INDEX, OUTPUT_WRITER, OUTPUT_BUNDLE, ARTIFACT_STORE
+    
+    if FULLTEXT_INDEX:
+        SEARCH_INDEX = SearchIndex(index_path or SEARCH_INDEX_PATH)
+    OUTPUT_WRITER = OutputWriter()
+    if DEDUP_ARTIFACTS and OUTPUT_FORMAT == "files":
+        ARTIFACT_STORE = ArtifactStore(ARTIFACT_STORE_DIR)
+    
+    # Erstelle Ordnerstruktur
+    dirs = create_directory_structure(export_dir)
+    if OUTPUT_FORMAT == "bundle":
+        OUTPUT_BUNDLE = ExportBundle(export_dir / BUNDLE_NAME, root=export_dir)
+    return dirs
+
+async def close_run_services():
+    """Schließt alle offenen Schreibvorgänge und die Dienste des Laufs ab"""
+    global SEARCH_INDEX, OUTPUT_WRITER, OUTPUT_BUNDLE, ARTIFACT_STORE
     
-    return True
+    await OUTPUT_WRITER.close()
+    OUTPUT_WRITER = None
+    
+    if SEARCH_INDEX:
+        SEARCH_INDEX.close()
+        SEARCH_INDEX = None
+    
+    if OUTPUT_BUNDLE is not None:
+        print(f"Bundle: {OUTPUT_BUNDLE.path} ({len(OUTPUT_BUNDLE.index())} Dateien)")
+        OUTPUT_BUNDLE.close()
+        OUTPUT_BUNDLE = None
+    
+    if ARTIFACT_STORE is not None:
+        print(f"Artifact-Store: {ARTIFACT_STORE.summary()}")
+        ARTIFACT_STORE = None
 
-async def run(project_name=None, export_all=False, keywords=None, filter_keywords=None):
-    """Hauptfunktion mit Projektunterstützung"""
+def begin_export(project_name=None, export_all=False, keywords=None, filter_keywords=None, workers=1,
+                 incremental=False):
+    """Legt Exportordner und Manifest-Lauf an und öffnet die Dienste des Laufs
+    (Suchindex, Schreiber, Artifact-Store, Bundle). Gibt (export_dir, dirs, manifest) zurück.
+    """
+    RUN_STATS.clear()
     
     # Dynamischen Exportordner-Namen erstellen
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -639,12 +3243,20 @@ async def run(project_name=None, export_all=False, keywords=None, filter_keyword
         keywords_str = "_".join([slug(kw) for kw in keywords[:3]])  # Max 3 Keywords
         export_name_parts.append(f"kw_{keywords_str}")
     
-    export_name_parts.append(timestamp)
-    export_dir = pathlib.Path("_".join(export_name_parts))
+    export_name = "_".join(export_name_parts)
+    export_dir = pathlib.Path(f"{export_name}_{timestamp}")
     
-    # Erstelle Ordnerstruktur
-    dirs = create_directory_structure(export_dir)
+    # Manifest laden; inkrementell wird ein abgebrochener Lauf fortgesetzt
+    manifest = ExportManifest(MANIFEST_PATH, incremental=incremental)
+    run_id = timestamp
+    interrupted = manifest.interrupted_run(export_name) if incremental else None
+    if interrupted:
+        run_id = interrupted["run_id"]
+        export_dir = pathlib.Path(interrupted["export_dir"])
+    
+    dirs = open_run_services(export_dir)
     save_system_info(export_dir)
+    resumed = manifest.begin_run(run_id, export_name, export_dir)
     
     print("\n" + "="*60)
     print(f"Export-Verzeichnis: {export_dir.absolute()}")
@@ -657,6 +3269,7 @@ async def run(project_name=None, export_all=False, keywords=None, filter_keyword
     else:
         print("Modus: Nur Chats außerhalb von Projekten")
     
+    print(f"PDF: {'✓' if SAVE_PDF else '✗'}")
     print(f"Screenshots: {'✓' if SAVE_SCREENSHOTS else '✗'}")
     print(f"Raw HTML: {'✓' if SAVE_RAW_HTML else '✗'}")
     print(f"Metadaten: IMMER")
@@ -667,143 +3280,688 @@ async def run(project_name=None, export_all=False, keywords=None, filter_keyword
     if filter_keywords:
         print(f"Filter (nur Chats mit): {', '.join(filter_keywords)}")
     
+    if workers > 1:
+        print(f"Parallele Tabs: {workers}")
+    
+    print(f"Extraktion: {EXTRACT_ENGINE}")
+    print(f"Ausgabeformat: {OUTPUT_FORMAT}")
+    
+    if incremental:
+        print(f"Inkrementell: ✓ ({len(manifest.chats)} Chats im Manifest)")
+        if interrupted:
+            print(f"Setze abgebrochenen Lauf fort ({resumed} Chats bereits erledigt)")
+    
     if BACKUP_LOCATIONS:
         print(f"Backup-Orte: {len(BACKUP_LOCATIONS)} konfiguriert")
     print("="*60 + "\n")
+    return export_dir, dirs, manifest
+
+async def discover_projects(page, project_name=None, export_all=False):
+    """Projekte, deren Chats exportiert werden (bei --all alle aus der Sidebar)"""
+    projects_to_process = []
     
-    async with async_playwright() as pw:
-        print(f"Erkanntes Betriebssystem: {platform.system()}")
-        print(f"Chrome-Profil: {USER_DATA_DIR}")
-        print("Starte echtes Chrome-Profil...")
-        ctx = await pw.chromium.launch_persistent_context(
-            user_data_dir=USER_DATA_DIR,
-            headless=False,
-            channel="chrome",
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--disable-extensions",
-                "--no-first-run",
-                "--no-default-browser-check"
-            ]
-        )
-        from playwright._impl._errors import TargetClosedError
-        
-        page = await ctx.new_page()
-        
-        # WebDriver-Flag entfernen
-        await page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """)
-        
-        try:
-            await page.goto("https://chatgpt.com/", wait_until="domcontentloaded", timeout=30000)
-        except TargetClosedError:
-            page = await ctx.new_page()
-            await page.goto("https://chatgpt.com/", wait_until="domcontentloaded", timeout=30000)
-        except Exception as e:
-            print(f"Seite konnte nicht geladen werden: {e}")
-        
-        await asyncio.sleep(3.0)
-        
-        print("\n" + "="*60)
-        print("WICHTIG: Falls du noch nicht eingeloggt bist:")
-        print("   1. Logge dich jetzt MANUELL im geöffneten Chrome ein")
-        print("   2. Löse das Cloudflare-CAPTCHA falls nötig")
-        print("   3. Warte bis die Chatliste links sichtbar ist")
-        print("   4. Dann drücke hier ENTER um fortzufahren")
-        print("="*60)
-        input("\nENTER drücken wenn eingeloggt und Chatliste sichtbar ist... ")
-        
-        print("\nWarte auf Sidebar...")
-        ok = await wait_for_sidebar(page, timeout_ms=60000)
-        if not ok:
-            print("Sidebar nicht automatisch gefunden.")
-            input("Bitte Chatliste sichtbar machen, dann ENTER...")
-        
-        # Projektmodus?
-        projects_to_process = []
-        
-        if export_all:
-            # --all: Erst alle Projekt-Namen sammeln
-            print("\nSuche alle verfügbaren Projekte...")
-            project_elements = await page.locator('nav a[href*="/g/g-p-"], aside a[href*="/g/g-p-"]').all()
-            
-            seen_projects = set()
-            for elem in project_elements:
-                href = await elem.get_attribute("href")
-                if href and "/g/g-p-" in href:
-                    # Projekt-Name aus Href extrahieren
-                    try:
-                        text = await elem.inner_text()
-                        if text and text not in seen_projects:
-                            projects_to_process.append(text.strip())
-                            seen_projects.add(text)
-                    except:
-                        pass
-            
-            print(f"Gefundene Projekte: {len(projects_to_process)}")
-            for proj in projects_to_process:
-                print(f"  - {proj}")
+    if export_all:
+        # --all: Erst alle Projekt-Namen sammeln
+        print("\nSuche alle verfügbaren Projekte...")
+        project_elements = await page.locator('nav a[href*="/g/g-p-"], aside a[href*="/g/g-p-"]').all()
         
-        elif project_name:
-            # Nur ein spezifisches Projekt
-            projects_to_process.append(project_name)
+        seen_projects = set()
+        for elem in project_elements:
+            href = await elem.get_attribute("href")
+            if href and "/g/g-p-" in href:
+                # Projekt-Name aus Href extrahieren
+                try:
+                    text = await elem.inner_text()
+                    if text and text not in seen_projects:
+                        projects_to_process.append(text.strip())
+                        seen_projects.add(text)
+                except:
+                    pass
         
+        print(f"Gefundene Projekte: {len(projects_to_process)}")
+        for proj in projects_to_process:
+            print(f"  - {proj}")
+    
+    elif project_name:
+        # Nur ein spezifisches Projekt
+        projects_to_process.append(project_name)
+    
+    return projects_to_process
+
+async def export_phases(page, dirs, project_name=None, export_all=False, keywords=None, filter_keywords=None,
+                        workers=1, manifest=None):
+    """Phase 1 (normale Chats) und Phase 2 (Projekt-Chats) auf einem eingeloggten Tab"""
+    global ARTIFACT_PIPELINE
+    
+    if RENDER_WORKERS > 0:
+        ARTIFACT_PIPELINE = ArtifactPipeline(page.context, RENDER_WORKERS).start()
+    
+    completed = False
+    try:
+        projects_to_process = await discover_projects(page, project_name, export_all)
+    
         # Phase 1: Normale Chats (nur wenn nicht --project einzelnes Projekt)
         exported_count = 0
-        
+    
         if not project_name or export_all:
             print("\n" + "="*60)
             print("PHASE 1: Exportiere normale Chats (außerhalb von Projekten)")
             print("="*60)
-            
-            chat_links = await get_chat_links(page, in_project=False, export_all=False)
-            print(f"Gefundene normale Chats: {len(chat_links)}")
-            
-            exported_count += await export_chat_list(page, chat_links, dirs, None, keywords, filter_keywords)
         
+            chat_urls = harvest_chat_urls(page, in_project=False, export_all=False)
+            exported_count += await export_chat_list(page, chat_urls, dirs, None, keywords, filter_keywords,
+                                                     workers, manifest)
+    
         # Phase 2: Projekt-Chats
         if projects_to_process:
             print("\n" + "="*60)
             print(f"PHASE 2: Exportiere Chats aus {len(projects_to_process)} Projekt(en)")
             print("="*60)
-            
+        
             for proj_name in projects_to_process:
                 print(f"\n>>> Projekt: {proj_name}")
-                
+            
                 success = await navigate_to_project(page, proj_name)
                 if not success:
                     print(f"Überspringe Projekt '{proj_name}' - Navigation fehlgeschlagen")
                     continue
-                
-                chat_links = await get_chat_links(page, in_project=True, export_all=False)
-                print(f"Gefundene Chats in Projekt '{proj_name}': {len(chat_links)}")
-                
-                exported_count += await export_chat_list(page, chat_links, dirs, proj_name, keywords, filter_keywords)
-                
+            
+                chat_urls = harvest_chat_urls(page, in_project=True, export_all=False)
+                exported_count += await export_chat_list(page, chat_urls, dirs, proj_name, keywords, filter_keywords,
+                                                         workers, manifest)
+            
                 # Zurück zur Hauptseite
-                await page.goto("https://chatgpt.com/", wait_until="domcontentloaded")
-                await asyncio.sleep(2.0)
-        
-        print("\n" + "="*60)
+                await page.goto(f"{CHATGPT_URL}/", wait_until="domcontentloaded")
+                await wait_for_sidebar(page, timeout_ms=WAIT_MAX_MS)
+    
+        completed = True
+    finally:
+        # Auch bei Fehlern: Render-Tasks und ihre Tabs nicht liegen lassen (Daemon läuft weiter)
+        if ARTIFACT_PIPELINE:
+            await ARTIFACT_PIPELINE.close(cancel=not completed)
+            ARTIFACT_PIPELINE = None
+    
+    return exported_count
+
+async def finish_export(export_dir, manifest, exported_count, completed=True):
+    """Schließt den Lauf ab: Dienste, Timings, Manifest, TF-IDF, Backup
+
+    Ein abgebrochener Lauf (completed=False) schreibt nur noch alles Offene
+    weg; er bleibt im Manifest offen und wird beim nächsten Lauf fortgesetzt.
+    """
+    # Alle offenen Schreibvorgänge abschließen (TF-IDF liest die Dateien danach)
+    await close_run_services()
+    
+    print("\n" + "="*60)
+    if completed:
         print(f"Fertig! {exported_count} Chats exportiert")
-        print(f"Speicherort: {export_dir.absolute()}")
-        print("="*60)
+    else:
+        print(f"Abgebrochen nach {exported_count} Chats - wird beim nächsten Lauf fortgesetzt")
+    print(f"Speicherort: {export_dir.absolute()}")
+    print("="*60)
+    
+    save_wait_timings(export_dir)
+    save_trace(export_dir)
+    save_capture_stats(export_dir)
+    selector_profile().save()
+    
+    if completed:
+        manifest.finish_run(exported_count)
+        
+        # Keywords über den gesamten Export neu bewerten (eigener Thread: der Daemon bleibt erreichbar)
+        if CORPUS_TFIDF:
+            await asyncio.to_thread(update_corpus_tfidf, manifest, export_dir)
         
         # Backup
         if BACKUP_LOCATIONS:
-            copy_to_backup_locations(export_dir)
+            await asyncio.to_thread(copy_to_backup_locations, export_dir)
+    
+    if RUN_STATS["failed"]:
+        print(f"\nFehlgeschlagen: {RUN_STATS['failed']} Chats")
+    
+    # Messwerte gehören zu diesem Lauf (der Daemon startet danach den nächsten)
+    WAIT_TIMINGS.clear()
+    TRACE_EVENTS.clear()
+    _TRACE_LANES.clear()
+
+async def run(project_name=None, export_all=False, keywords=None, filter_keywords=None, workers=1,
+              incremental=False, unattended=False):
+    """Hauptfunktion mit Projektunterstützung
+
+    Gibt einen Exit-Code zurück (EXIT_OK, EXIT_NOT_LOGGED_IN, EXIT_PARTIAL).
+    Mit unattended=True läuft alles headless und ohne Rückfragen.
+    """
+    if unattended and not pathlib.Path(STORAGE_STATE_PATH).exists():
+        print(f"Kein gespeicherter Login ({STORAGE_STATE_PATH}). Einmalig ausführen:")
+        print("  python export_enhanced_v2.py login")
+        return EXIT_NOT_LOGGED_IN
+    
+    async with async_playwright() as pw:
+        print(f"Erkanntes Betriebssystem: {platform.system()}")
+        if unattended:
+            print(f"Starte headless Browser mit gespeichertem Login ({STORAGE_STATE_PATH})...")
+        else:
+            print(f"Chrome-Profil: {USER_DATA_DIR}")
+            print("Starte echtes Chrome-Profil...")
+        ctx, browser = await launch_browser_context(pw, unattended)
+        from playwright._impl._errors import TargetClosedError
+        
+        page = await ctx.new_page()
+        
+        try:
+            await page.goto(f"{CHATGPT_URL}/", wait_until="domcontentloaded", timeout=30000)
+        except TargetClosedError:
+            page = await ctx.new_page()
+            await page.goto(f"{CHATGPT_URL}/", wait_until="domcontentloaded", timeout=30000)
+        except Exception as e:
+            print(f"Seite konnte nicht geladen werden: {e}")
+        
+        await timed_wait("startup", page.wait_for_load_state("load", timeout=WAIT_MAX_MS))
+        
+        # Eingeloggt? Dann erscheint die Chatliste ohne Zutun
+        logged_in = await wait_for_sidebar(page, timeout_ms=LOGIN_DETECT_MS)
+        if logged_in:
+            print("Eingeloggt - Chatliste erkannt.")
+        elif unattended:
+            print("Nicht eingeloggt (keine Chatliste). Login erneuern mit: python export_enhanced_v2.py login")
+            await close_browser_context(ctx, browser)
+            return EXIT_NOT_LOGGED_IN
+        else:
+            print("\n" + "="*60)
+            print("WICHTIG: Falls du noch nicht eingeloggt bist:")
+            print("   1. Logge dich jetzt MANUELL im geöffneten Chrome ein")
+            print("   2. Löse das Cloudflare-CAPTCHA falls nötig")
+            print("   3. Warte bis die Chatliste links sichtbar ist")
+            print("   4. Dann drücke hier ENTER um fortzufahren")
+            print("="*60)
+            input("\nENTER drücken wenn eingeloggt und Chatliste sichtbar ist... ")
+            
+            print("\nWarte auf Sidebar...")
+            ok = await wait_for_sidebar(page, timeout_ms=60000)
+            if not ok:
+                print("Sidebar nicht automatisch gefunden.")
+                input("Bitte Chatliste sichtbar machen, dann ENTER...")
+        
+        export_dir, dirs, manifest = begin_export(project_name, export_all, keywords, filter_keywords,
+                                                  workers, incremental)
+        exported_count = await export_phases(page, dirs, project_name, export_all, keywords, filter_keywords,
+                                             workers, manifest)
+        await finish_export(export_dir, manifest, exported_count)
+        
+        if unattended:
+            # Cookies rotieren - aufgefrischten Login für den nächsten Lauf sichern
+            await save_login_state(ctx)
+        else:
+            input("\nENTER zum Schließen...")
+        await close_browser_context(ctx, browser)
+    
+    return EXIT_PARTIAL if RUN_STATS["failed"] else EXIT_OK
+
+# ============================================================================
+# DAEMON (WARMER BROWSER, JOB-API)
+# ============================================================================
+
+JOB_DEFAULTS = {
+    "project": None,
+    "all": False,
+    "keywords": None,
+    "filter_keywords": None,
+    "url": None,
+    "workers": 1,
+    "incremental": False,
+}
+
+def normalize_job(params):
+    """Prüft Job-Parameter und füllt Standardwerte auf (ValueError bei Unsinn)"""
+    if not isinstance(params, dict):
+        raise ValueError("Job muss ein JSON-Objekt sein")
+    unknown = set(params) - set(JOB_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unbekannte Felder: {', '.join(sorted(unknown))}")
+    
+    job = dict(JOB_DEFAULTS, **params)
+    for key in ("keywords", "filter_keywords"):
+        if job[key] is not None:
+            if not isinstance(job[key], list) or not all(isinstance(kw, str) for kw in job[key]):
+                raise ValueError(f"{key} muss eine Liste von Strings sein")
+            job[key] = list(dict.fromkeys(job[key])) or None
+    if job["url"] is not None and (not isinstance(job["url"], str) or "/c/" not in job["url"]):
+        raise ValueError("url muss eine Chat-URL sein (.../c/ID)")
+    if not isinstance(job["workers"], int) or job["workers"] < 1:
+        raise ValueError("workers muss eine Zahl >= 1 sein")
+    job["all"] = bool(job["all"])
+    job["incremental"] = bool(job["incremental"])
+    return job
+
+class ExportDaemon:
+    """Nimmt Export-Jobs per HTTP an und arbeitet sie mit warmem Browser-Kontext ab
+    
+    Jobs laufen nacheinander, weil ein Lauf die globalen Dienste (Schreiber,
+    Suchindex, Bundle, ...) belegt; parallel gearbeitet wird innerhalb eines
+    Jobs über "workers". Ein Job, der gleich schon wartet oder läuft, wird
+    nicht doppelt angelegt.
+    """
+    
+    def __init__(self, ctx, page):
+        self.ctx = ctx
+        self.page = page
+        self.jobs = {}
+        self.active = {}   # Dedup-Schlüssel -> Job-ID (wartend oder laufend)
+        self.queue = asyncio.Queue()
+        self.ids = itertools.count(1)
+        self.current = None
+        self.stopping = asyncio.Event()
+    
+    def submit(self, params):
+        """Reiht einen Job ein; gibt (job, duplicate) zurück"""
+        params = normalize_job(params)
+        # Reihenfolge der Keywords spielt für "gleicher Job" keine Rolle
+        key = json.dumps({name: sorted(value) if isinstance(value, list) else value
+                          for name, value in params.items()}, sort_keys=True)
+        if key in self.active:
+            return self.jobs[self.active[key]], True
+        job = {
+            "id": str(next(self.ids)),
+            "status": "queued",
+            "params": params,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "progress": {},
+            "result": None,
+        }
+        self.jobs[job["id"]] = job
+        self.active[key] = job["id"]
+        self.queue.put_nowait((key, job))
+        print(f"[Daemon] Job {job['id']} eingereiht: {key}")
+        return job, False
+    
+    def view(self, job):
+        data = dict(job)
+        if job is self.current:
+            data["progress"] = dict(RUN_STATS)
+        return data
+    
+    async def work(self):
+        """Arbeitet die Warteschlange ab (läuft als eigener Task)"""
+        while True:
+            key, job = await self.queue.get()
+            if job["status"] == "cancelled":
+                self.queue.task_done()
+                continue
+            self.current = job
+            job["status"] = "running"
+            job["started"] = datetime.now().isoformat(timespec="seconds")
+            print(f"\n[Daemon] Starte Job {job['id']}")
+            try:
+                job["result"] = await self.run_job(job["params"])
+                job["status"] = "done"
+            except Exception as e:
+                job["status"] = "failed"
+                job["error"] = f"{type(e).__name__}: {e}"
+                print(f"[Daemon] Job {job['id']} fehlgeschlagen: {job['error']}")
+            finally:
+                job["progress"] = dict(RUN_STATS)
+                job["finished"] = datetime.now().isoformat(timespec="seconds")
+                self.current = None
+                self.active.pop(key, None)
+                self.queue.task_done()
+            print(f"[Daemon] Job {job['id']}: {job['status']}")
+    
+    async def run_job(self, params):
+        if self.page.is_closed():
+            self.page = await self.ctx.new_page()
+        page = self.page
+        
+        # Der Tab steht evtl. noch auf einem Chat/Projekt vom letzten Job
+        await page.goto(f"{CHATGPT_URL}/", wait_until="domcontentloaded")
+        if not await wait_for_sidebar(page, timeout_ms=LOGIN_DETECT_MS):
+            raise RuntimeError("Nicht eingeloggt (keine Chatliste) - Login erneuern mit: login")
+        
+        export_dir, dirs, manifest = begin_export(params["project"], params["all"], params["keywords"],
+                                                  params["filter_keywords"], params["workers"],
+                                                  params["incremental"])
+        exported = 0
+        completed = False
+        try:
+            if params["url"]:
+                exported = await export_chat_list(page, [params["url"]], dirs, params["project"],
+                                                  params["keywords"], params["filter_keywords"], 1, manifest)
+            else:
+                exported = await export_phases(page, dirs, params["project"], params["all"], params["keywords"],
+                                               params["filter_keywords"], params["workers"], manifest)
+            completed = True
+        finally:
+            # Auch nach einem Fehler alles Geschriebene abschließen (der Lauf bleibt dann offen)
+            await finish_export(export_dir, manifest, exported, completed=completed)
+        
+        return {"export_dir": str(export_dir.absolute()), "exported": exported, "failed": RUN_STATS["failed"]}
+    
+    def route(self, method, path, body):
+        """Gibt (HTTP-Status, JSON-Antwort) zurück"""
+        path = path.split("?", 1)[0].rstrip("/")
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "queued": self.queue.qsize(),
+                         "running": self.current["id"] if self.current else None}
+        if method == "GET" and path == "/jobs":
+            return 200, [self.view(job) for job in self.jobs.values()]
+        if method == "GET" and path.startswith("/jobs/"):
+            job = self.jobs.get(path[len("/jobs/"):])
+            return (200, self.view(job)) if job else (404, {"error": "Job nicht gefunden"})
+        if method == "POST" and path == "/jobs":
+            if self.stopping.is_set():
+                return 503, {"error": "Daemon wird beendet"}
+            job, duplicate = self.submit(json.loads(body or b"{}"))
+            return (200 if duplicate else 202), dict(self.view(job), duplicate=duplicate)
+        if method == "POST" and path == "/shutdown":
+            self.stopping.set()
+            return 202, {"status": "stopping"}
+        return 404, {"error": "Unbekannter Pfad"}
+    
+    async def handle(self, reader, writer):
+        """Minimaler HTTP/1.1-Handler (eine Anfrage pro Verbindung)"""
+        request_line = ""
+        try:
+            request_line = (await reader.readline()).decode("latin-1")
+            method, path, _ = request_line.split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length") or 0))
+            
+            # Nur lokale Clients; JSON-Pflicht verhindert einfache Cross-Site-POSTs aus dem Browser
+            host = headers.get("host", "").rsplit(":", 1)[0]
+            if host not in ("127.0.0.1", "localhost", "[::1]"):
+                status, payload = 403, {"error": "Nur über localhost erreichbar"}
+            elif method == "POST" and not headers.get("content-type", "").startswith("application/json"):
+                status, payload = 415, {"error": "Content-Type: application/json erforderlich"}
+            else:
+                status, payload = self.route(method, path, body)
+        except (ValueError, json.JSONDecodeError, asyncio.IncompleteReadError) as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            # z.B. Job-Body mit falschen Typen: Client bekommt trotzdem eine Antwort
+            print(f"[Daemon] Fehler bei {request_line.strip()!r}: {type(e).__name__}: {e}")
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        
+        data = json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+        reason = {200: "OK", 202: "Accepted", 400: "Bad Request", 403: "Forbidden", 404: "Not Found",
+                  415: "Unsupported Media Type", 500: "Internal Server Error", 503: "Service Unavailable"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(data)}\r\n"
+                     f"Connection: close\r\n\r\n".encode("latin-1") + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+async def serve_command(host=DAEMON_HOST, port=DAEMON_PORT):
+    """CLI: Startet den Daemon (headless, gespeicherter Login) und wartet auf Jobs"""
+    global IDLE_PAGES
+    
+    if not pathlib.Path(STORAGE_STATE_PATH).exists():
+        print(f"Kein gespeicherter Login ({STORAGE_STATE_PATH}). Einmalig ausführen:")
+        print("  python export_enhanced_v2.py login")
+        return EXIT_NOT_LOGGED_IN
+    
+    IDLE_PAGES = []
+    async with async_playwright() as pw:
+        ctx, browser = await launch_browser_context(pw, unattended=True)
+        page = await ctx.new_page()
+        await page.goto(f"{CHATGPT_URL}/", wait_until="domcontentloaded", timeout=30000)
+        if not await wait_for_sidebar(page, timeout_ms=LOGIN_DETECT_MS):
+            print("Nicht eingeloggt (keine Chatliste). Login erneuern mit: python export_enhanced_v2.py login")
+            await close_browser_context(ctx, browser)
+            return EXIT_NOT_LOGGED_IN
+        
+        daemon = ExportDaemon(ctx, page)
+        server = await asyncio.start_server(daemon.handle, host, port)
+        worker = asyncio.create_task(daemon.work(), name="daemon-jobs")
+        
+        print("\n" + "="*60)
+        print(f"Export-Daemon läuft: http://{host}:{port}")
+        print("="*60)
+        print(f"  curl -X POST -H 'Content-Type: application/json' -d '{{\"all\": true, \"incremental\": true}}' "
+              f"http://{host}:{port}/jobs")
+        print(f"  curl http://{host}:{port}/jobs/1")
+        print(f"  curl -X POST -H 'Content-Type: application/json' http://{host}:{port}/shutdown")
+        
+        try:
+            await daemon.stopping.wait()
+            print("\n[Daemon] Beenden angefordert...")
+            # Wartende Jobs verwerfen, den laufenden zu Ende bringen
+            while not daemon.queue.empty():
+                key, job = daemon.queue.get_nowait()
+                job["status"] = "cancelled"
+                daemon.active.pop(key, None)
+                daemon.queue.task_done()
+            await daemon.queue.join()
+        finally:
+            server.close()
+            await server.wait_closed()
+            worker.cancel()
+            await save_login_state(ctx)
+            IDLE_PAGES = None
+            await close_browser_context(ctx, browser)
+    return EXIT_OK
+
+# ============================================================================
+# SHARDING (MEHRERE PROZESSE)
+# ============================================================================
+
+# Einstellungen, die der Koordinator an die Shard-Prozesse weitergibt (CLI-Overrides)
+SHARD_CONFIG = ("EXTRACT_ENGINE", "OUTPUT_FORMAT", "RENDER_WORKERS", "TRACE_ENABLED", "WAIT_MAX_MS",
+                "CAPTURE_PROFILE", "KEYWORD_SCREENSHOT_ALL", "SCREENSHOT_MODE", "SCREENSHOT_FORMAT",
+                "SCREENSHOT_QUALITY")
+
+async def collect_chat_targets(page, project_name=None, export_all=False):
+    """Liest alle passenden Chat-URLs einmal ein: Liste von (url, projekt)"""
+    targets = []
+    if not project_name or export_all:
+        targets += [(url, None) for url in await get_chat_links(page, in_project=False)]
+    
+    for proj_name in await discover_projects(page, project_name, export_all):
+        if not await navigate_to_project(page, proj_name):
+            print(f"Überspringe Projekt '{proj_name}' - Navigation fehlgeschlagen")
+            continue
+        targets += [(url, proj_name) for url in await get_chat_links(page, in_project=True)]
+        await page.goto(f"{CHATGPT_URL}/", wait_until="domcontentloaded")
+        await wait_for_sidebar(page, timeout_ms=WAIT_MAX_MS)
+    return targets
+
+def partition_targets(targets, shards, by=SHARD_BY):
+    """Verteilt (url, projekt) auf shards Listen - stabil per Hash oder projektweise"""
+    buckets = [[] for _ in range(shards)]
+    if by == "project":
+        groups = {}
+        for target in targets:
+            groups.setdefault(target[1] or "", []).append(target)
+        # Größte Projekte zuerst in den jeweils leersten Shard
+        for group in sorted(groups.values(), key=len, reverse=True):
+            min(buckets, key=len).extend(group)
+    else:
+        for target in targets:
+            conv_id = conversation_id_from_url(target[0])
+            buckets[int(hashlib.sha1(conv_id.encode("utf-8")).hexdigest()[:8], 16) % shards].append(target)
+    return buckets
+
+def merge_shard_measurements(shard_dir):
+    """Übernimmt Wartezeiten und Trace eines Shards in die Werte des Koordinators"""
+    timings_path = shard_dir / "wait_timings.json"
+    if timings_path.exists():
+        for name, shard_entry in json.loads(timings_path.read_text(encoding='utf-8')).items():
+            entry = WAIT_TIMINGS.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0})
+            entry["count"] += shard_entry["count"]
+            entry["total"] += shard_entry["total_s"]
+            entry["max"] = max(entry["max"], shard_entry["max_s"])
+            entry["timeouts"] += shard_entry["timeouts"]
+    
+    capture_path = shard_dir / "capture_stats.json"
+    if CAPTURE_ROUTER is not None and capture_path.exists():
+        shard_capture = json.loads(capture_path.read_text(encoding='utf-8'))
+        CAPTURE_ROUTER.allowed += shard_capture["requests_allowed"]
+        CAPTURE_ROUTER.blocked.update(shard_capture["blocked_by_reason"])
+        CAPTURE_ROUTER.shard_bytes_loaded += shard_capture["bytes_loaded"]
+        CAPTURE_ROUTER.shard_bytes_saved += shard_capture["bytes_saved_estimate"]
+    
+    trace_path = shard_dir / "trace.json"
+    if TRACE_ENABLED and trace_path.exists():
+        trace = json.loads(trace_path.read_text(encoding='utf-8'))
+        # Zeitachsen angleichen (jeder Prozess misst ab seinem eigenen Start)
+        shift = (trace.get("otherData", {}).get("origin_epoch", TRACE_ORIGIN_EPOCH) - TRACE_ORIGIN_EPOCH) * 1e6
+        for event in trace["traceEvents"]:
+            if "ts" in event:
+                event["ts"] = round(event["ts"] + shift, 1)
+            TRACE_EVENTS.append(event)
+
+async def _run_shard_process(shard_no, shard_file):
+    """Startet einen Shard-Prozess und gibt dessen Ausgabe mit Präfix weiter"""
+    # Ungepuffert und UTF-8, damit die Ausgabe zeilenweise und ohne Kodierfehler ankommt
+    env = dict(os.environ, PYTHONUNBUFFERED="1", PYTHONIOENCODING="utf-8")
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, os.path.abspath(__file__), "shard-worker", str(shard_file),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT, env=env,
+    )
+    async for line in process.stdout:
+        print(f"[S{shard_no}] {line.decode('utf-8', 'replace').rstrip()}")
+    return await process.wait()
+
+async def run_sharded(project_name=None, export_all=False, keywords=None, filter_keywords=None, workers=1,
+                      incremental=False, shards=2, shard_by=SHARD_BY):
+    """Koordinator: URLs einmal sammeln, auf Prozesse verteilen, Ergebnisse zusammenführen"""
+    if not pathlib.Path(STORAGE_STATE_PATH).exists():
+        print(f"Sharding braucht einen gespeicherten Login ({STORAGE_STATE_PATH}). Einmalig ausführen:")
+        print("  python export_enhanced_v2.py login")
+        return EXIT_NOT_LOGGED_IN
+    
+    async with async_playwright() as pw:
+        ctx, browser = await launch_browser_context(pw, unattended=True)
+        page = await ctx.new_page()
+        await page.goto(f"{CHATGPT_URL}/", wait_until="domcontentloaded", timeout=30000)
+        if not await wait_for_sidebar(page, timeout_ms=LOGIN_DETECT_MS):
+            print("Nicht eingeloggt (keine Chatliste). Login erneuern mit: python export_enhanced_v2.py login")
+            await close_browser_context(ctx, browser)
+            return EXIT_NOT_LOGGED_IN
         
-        input("\nENTER zum Schließen...")
-        await ctx.close()
+        export_dir, dirs, manifest = begin_export(project_name, export_all, keywords, filter_keywords,
+                                                  workers, incremental)
+        targets = await collect_chat_targets(page, project_name, export_all)
+        await save_login_state(ctx)
+        await close_browser_context(ctx, browser)
+    
+    # Duplikate und (bei Resume) bereits erledigte Chats nur hier aussortieren
+    targets = [t for t in targets if manifest.claim(conversation_id_from_url(t[0]))]
+    buckets = [bucket for bucket in partition_targets(targets, shards, shard_by) if bucket]
+    
+    print("\n" + "="*60)
+    print(f"SHARDING: {len(targets)} Chats auf {len(buckets)} Prozesse ({shard_by})")
+    print("="*60)
+    
+    shard_root = export_dir / "shards"
+    shard_root.mkdir(exist_ok=True)
+    config = {name: globals()[name] for name in SHARD_CONFIG}
+    jobs = []
+    for n, bucket in enumerate(buckets, start=1):
+        shard_file = shard_root / f"shard-{n}.json"
+        shard_file.write_text(json.dumps({
+            "shard": n,
+            "run_id": manifest.run_id,
+            "export_dir": str(export_dir),
+            "targets": bucket,
+            "keywords": keywords,
+            "filter_keywords": filter_keywords,
+            "workers": workers,
+            "incremental": incremental,
+            "config": config,
+        }, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"  Shard {n}: {len(bucket)} Chats")
+        jobs.append(_run_shard_process(n, shard_file))
+    
+    exit_codes = await asyncio.gather(*jobs)
+    
+    # Ergebnisse zusammenführen: Dateien liegen schon in export_dir, Manifest und
+    # Suchindex der Shards werden hier (nur ein Schreiber) übernommen - auch von
+    # abgestürzten Shards, damit deren fertige Chats beim Resume nicht fehlen
+    exported_count = 0
+    for n, code in enumerate(exit_codes, start=1):
+        shard_dir = shard_root / f"shard-{n}"
+        manifest.merge(shard_dir / "manifest.jsonl")
+        if SEARCH_INDEX and (shard_dir / "search.db").exists():
+            SEARCH_INDEX.merge(shard_dir / "search.db")
+        result_path = shard_dir / "result.json"
+        if not result_path.exists():
+            print(f"Shard {n} ohne Ergebnis beendet (Exit-Code {code})")
+            RUN_STATS["failed"] += len(buckets[n - 1])
+            continue
+        stats = json.loads(result_path.read_text(encoding='utf-8'))["stats"]
+        RUN_STATS.update(stats)
+        exported_count += stats.get("exported", 0)
+        merge_shard_measurements(shard_dir)
+    
+    await finish_export(export_dir, manifest, exported_count)
+    
+    return EXIT_PARTIAL if RUN_STATS["failed"] else EXIT_OK
+
+async def shard_worker_command(shard_file):
+    """CLI (intern): Exportiert die Chats eines Shards mit eigenem Browser"""
+    global ARTIFACT_PIPELINE
+    
+    shard = json.loads(pathlib.Path(shard_file).read_text(encoding='utf-8'))
+    for name in SHARD_CONFIG:
+        globals()[name] = shard["config"][name]
+    
+    export_dir = pathlib.Path(shard["export_dir"])
+    shard_dir = export_dir / "shards" / f"shard-{shard['shard']}"
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    
+    RUN_STATS.clear()
+    # Eigenes Manifest-Log und eigener Suchindex, der Koordinator führt sie zusammen
+    dirs = open_run_services(export_dir, index_path=shard_dir / "search.db")
+    manifest = ExportManifest(MANIFEST_PATH, incremental=shard["incremental"],
+                              log_path=shard_dir / "manifest.jsonl")
+    manifest.run_id = shard["run_id"]
+    
+    # Reihenfolge beibehalten, Chats eines Projekts zusammen abarbeiten
+    by_project = {}
+    for url, project in shard["targets"]:
+        by_project.setdefault(project, []).append(url)
+    
+    async with async_playwright() as pw:
+        ctx, browser = await launch_browser_context(pw, unattended=True)
+        page = await ctx.new_page()
+        if RENDER_WORKERS > 0:
+            ARTIFACT_PIPELINE = ArtifactPipeline(ctx, RENDER_WORKERS).start()
+        completed = False
+        try:
+            for project, urls in by_project.items():
+                await export_chat_list(page, urls, dirs, project, shard["keywords"], shard["filter_keywords"],
+                                       shard["workers"], manifest)
+            completed = True
+        finally:
+            if ARTIFACT_PIPELINE:
+                await ARTIFACT_PIPELINE.close(cancel=not completed)
+                ARTIFACT_PIPELINE = None
+            await close_browser_context(ctx, browser)
+    
+    await close_run_services()
+    save_wait_timings(shard_dir)
+    save_trace(shard_dir)
+    save_capture_stats(shard_dir)
+    selector_profile().save()
+    (shard_dir / "result.json").write_text(json.dumps({"stats": dict(RUN_STATS)}), encoding='utf-8')
+    return EXIT_PARTIAL if RUN_STATS["failed"] else EXIT_OK
 
 # ============================================================================
 # CLI-INTERFACE
 # ============================================================================
 
 def main():
+    global WAIT_MAX_MS, EXTRACT_ENGINE, RENDER_WORKERS, OUTPUT_FORMAT, TRACE_ENABLED, CAPTURE_PROFILE
+    global KEYWORD_SCREENSHOT_ALL, SCREENSHOT_MODE, SCREENSHOT_FORMAT, SCREENSHOT_QUALITY
+    unattended = False
     try:
         parser = argparse.ArgumentParser(
             description="ChatGPT Business Account Export mit Projekt-Support",
@@ -816,6 +3974,18 @@ Beispiele:
   python export_enhanced_v2.py --keywords NRW OWL           # Keywords für Tagging/Screenshots
   python export_enhanced_v2.py --filter-keywords MCP        # NUR Chats die "MCP" enthalten
   python export_enhanced_v2.py --all --filter-keywords MCP  # Alle Chats mit "MCP"
+  python export_enhanced_v2.py --all --workers 4            # 4 Chats parallel exportieren
+  python export_enhanced_v2.py --all --incremental          # Nur neue/geänderte Chats
+  python export_enhanced_v2.py search "Bad Sassendorf"      # Exportierte Chats durchsuchen
+  python export_enhanced_v2.py --all --output-format bundle # Alles in eine Bundle-Datei
+  python export_enhanced_v2.py unpack EXPORT/chats.bundle   # Bundle wieder entpacken
+  python export_enhanced_v2.py gc                           # Verwaiste Blobs im Store löschen
+  python export_enhanced_v2.py --all --trace                # Zeiten pro Stufe (trace.json)
+  python export_enhanced_v2.py login                        # Login einmalig für --unattended sichern
+  python export_enhanced_v2.py --all --incremental --unattended  # Geplanter Lauf ohne Rückfragen
+  python export_enhanced_v2.py serve                        # Daemon mit warmem Browser (Jobs per HTTP)
+  python export_enhanced_v2.py --all --shards 4             # Auf 4 Browser-Prozesse verteilen
+  python export_enhanced_v2.py --all --capture-profile text-only  # Keine Bilder/Fonts/Fremd-Hosts laden
         """
         )
         
@@ -843,14 +4013,194 @@ Beispiele:
             help='Exportiere NUR Chats die diese Keywords enthalten (z.B. --filter-keywords MCP)'
         )
         
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Anzahl paralleler Tabs für den Chat-Export (Standard: 1)'
+        )
+        
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Nur neue/geänderte Chats exportieren und abgebrochene Läufe fortsetzen'
+        )
+        
+        parser.add_argument(
+            '--render-workers',
+            type=int,
+            default=RENDER_WORKERS,
+            help='PDF/Screenshots auf N eigenen Render-Tabs erzeugen, entkoppelt vom Crawl (Standard: 0 = inline)'
+        )
+        
+        parser.add_argument(
+            '--output-format',
+            choices=['files', 'bundle'],
+            default=OUTPUT_FORMAT,
+            help='Einzelne Dateien in Ordnern oder alles in einer Bundle-Datei (chats.bundle)'
+        )
+        
+        parser.add_argument(
+            '--extract-engine',
+            choices=['dom', 'network'],
+            default=EXTRACT_ENGINE,
+            help='Chat-Inhalt aus dem DOM oder aus dem abgefangenen Conversation-JSON lesen'
+        )
+        
+        parser.add_argument(
+            '--capture-profile',
+            choices=['auto', 'text-only', 'archival', 'full'],
+            default=CAPTURE_PROFILE,
+            help='Welche Ressourcen geladen werden (Standard: auto = text-only ohne PDF/Screenshots, sonst full)'
+        )
+        
+        parser.add_argument(
+            '--max-wait',
+            type=float,
+            help=f'Max. Wartezeit in Sekunden bis ein Chat bereit ist (Standard: {WAIT_MAX_MS / 1000:g})'
+        )
+        
+        parser.add_argument(
+            '--screenshot-mode',
+            choices=['full', 'tiles', 'stitched'],
+            default=SCREENSHOT_MODE,
+            help='Vollbild als ein Screenshot, als Kacheln pro Bildschirmhöhe oder zusammengesetzt (Standard: full)'
+        )
+        
+        parser.add_argument(
+            '--screenshot-format',
+            choices=['png', 'jpeg', 'webp'],
+            default=SCREENSHOT_FORMAT,
+            help='Bildformat für Vollbild-Screenshots (Standard: png)'
+        )
+        
+        parser.add_argument(
+            '--screenshot-quality',
+            type=int,
+            default=SCREENSHOT_QUALITY,
+            metavar='1-100',
+            help=f'Qualität für jpeg/webp (Standard: {SCREENSHOT_QUALITY})'
+        )
+        
+        parser.add_argument(
+            '--keyword-screenshots',
+            choices=['first', 'all'],
+            default='all' if KEYWORD_SCREENSHOT_ALL else 'first',
+            help=f'Pro Keyword nur das erste Vorkommen oder alle (max. {KEYWORD_SCREENSHOT_MAX}) als Screenshot'
+        )
+        
+        parser.add_argument(
+            '--trace',
+            action='store_true',
+            help='Zeiten pro Stufe messen: trace.json (Chrome-Trace) und trace_summary.json im Exportordner'
+        )
+        
+        parser.add_argument(
+            '--unattended',
+            action='store_true',
+            help='Headless ohne Rückfragen mit gespeichertem Login (siehe "login"); Exit-Code für cron/Aufgabenplanung'
+        )
+        
+        parser.add_argument(
+            '--shards',
+            type=int,
+            default=1,
+            help='Chats auf K Prozesse mit eigenem Browser verteilen (braucht gespeicherten Login, siehe "login")'
+        )
+        
+        parser.add_argument(
+            '--shard-by',
+            choices=['hash', 'project'],
+            default=SHARD_BY,
+            help='Verteilung: stabil per Conversation-ID (hash) oder ganze Projekte pro Prozess'
+        )
+        
+        # Unterbefehle (ohne Browser)
+        commands = parser.add_subparsers(dest='command', metavar='BEFEHL')
+        
+        search_parser = commands.add_parser('search', help='Exportierte Chats offline durchsuchen')
+        search_parser.add_argument('query', help='Suchbegriff(e), FTS5-Syntax möglich (z.B. "MCP AND Bitwig")')
+        search_parser.add_argument('--limit', type=int, default=20, help='Max. Anzahl Treffer (Standard: 20)')
+        search_parser.add_argument('--role', choices=['user', 'assistant'], help='Nur Turns dieser Rolle')
+        search_parser.add_argument('--in-project', dest='search_project', help='Nur Chats aus diesem Projekt')
+        
+        unpack_parser = commands.add_parser('unpack', help='Bundle in die gewohnte Ordnerstruktur entpacken')
+        unpack_parser.add_argument('bundle', help='Pfad zur Bundle-Datei (chats.bundle)')
+        unpack_parser.add_argument('--target', help='Zielordner (Standard: Ordner des Bundles)')
+        
+        commands.add_parser('login', help='Chrome öffnen, manuell einloggen und Login für --unattended speichern')
+        
+        serve_parser = commands.add_parser('serve', help='Daemon: Browser warm halten und Export-Jobs per HTTP annehmen')
+        serve_parser.add_argument('--host', default=DAEMON_HOST, help=f'Adresse (Standard: {DAEMON_HOST})')
+        serve_parser.add_argument('--port', type=int, default=DAEMON_PORT, help=f'Port (Standard: {DAEMON_PORT})')
+        
+        shard_parser = commands.add_parser('shard-worker')  # intern, von --shards gestartet
+        shard_parser.add_argument('shard_file')
+        
+        gc_parser = commands.add_parser('gc', help='Nicht mehr referenzierte Blobs aus dem Artifact-Store löschen')
+        gc_parser.add_argument('--store', help=f'Store-Ordner (Standard: {ARTIFACT_STORE_DIR})')
+        gc_parser.add_argument('--dry-run', action='store_true', help='Nur anzeigen, nichts löschen')
+        
         args = parser.parse_args()
         
-        asyncio.run(run(
+        if args.command == 'search':
+            sys.exit(search_command(args.query, limit=args.limit, role=args.role, project=args.search_project))
+        if args.command == 'unpack':
+            sys.exit(unpack_command(args.bundle, args.target))
+        if args.command == 'gc':
+            sys.exit(gc_command(args.store, dry_run=args.dry_run))
+        if args.command == 'login':
+            sys.exit(asyncio.run(login_command()))
+        if args.command == 'shard-worker':
+            unattended = True
+            sys.exit(asyncio.run(shard_worker_command(args.shard_file)))
+        
+        # Daemon, Sharding und geplante Läufe fragen nie nach ENTER
+        unattended = args.unattended or args.command == 'serve' or args.shards > 1
+        
+        EXTRACT_ENGINE = args.extract_engine
+        OUTPUT_FORMAT = args.output_format
+        RENDER_WORKERS = max(0, args.render_workers)
+        TRACE_ENABLED = TRACE_ENABLED or args.trace
+        CAPTURE_PROFILE = args.capture_profile
+        KEYWORD_SCREENSHOT_ALL = args.keyword_screenshots == 'all'
+        SCREENSHOT_MODE = args.screenshot_mode
+        SCREENSHOT_FORMAT = args.screenshot_format
+        SCREENSHOT_QUALITY = min(100, max(1, args.screenshot_quality))
+        if Image is None and SCREENSHOT_FORMAT == "webp":
+            print("WebP braucht Pillow (pip install pillow) - verwende jpeg")
+            SCREENSHOT_FORMAT = "jpeg"
+        if Image is None and SCREENSHOT_MODE == "stitched":
+            print("Zusammensetzen braucht Pillow (pip install pillow) - speichere einzelne Kacheln")
+            SCREENSHOT_MODE = "tiles"
+        
+        if args.max_wait is not None:
+            WAIT_MAX_MS = int(args.max_wait * 1000)
+        
+        if args.command == 'serve':
+            sys.exit(asyncio.run(serve_command(args.host, args.port)))
+        
+        if args.shards > 1:
+            sys.exit(asyncio.run(run_sharded(
+                project_name=args.project,
+                export_all=args.all,
+                keywords=args.keywords,
+                filter_keywords=args.filter_keywords,
+                workers=max(1, args.workers),
+                incremental=args.incremental,
+                shards=args.shards,
+                shard_by=args.shard_by
+            )))
+        
+        sys.exit(asyncio.run(run(
             project_name=args.project, 
             export_all=args.all, 
             keywords=args.keywords,
-            filter_keywords=args.filter_keywords
-        ))
+            filter_keywords=args.filter_keywords,
+            workers=max(1, args.workers),
+            incremental=args.incremental,
+            unattended=unattended
+        )))
         
     except Exception as e:
         print("\n" + "="*60)
@@ -860,7 +4210,8 @@ Beispiele:
         import traceback
         traceback.print_exc()
         print("="*60)
-        input("\nENTER zum Schließen...")
+        if not unattended:
+            input("\nENTER zum Schließen...")
         raise
 
 if __name__ == "__main__":
@@ -0,0 +1,14 @@
+import pathlib
+import sys
+
+import pytest
+
+# Das Exporter-Script liegt im Repo-Wurzelverzeichnis (kein Paket)
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+@pytest.fixture
+def exporter():
+    """Importiert export_enhanced_v2 (braucht playwright, sonst wird übersprungen)"""
+    pytest.importorskip("playwright")
+    import export_enhanced_v2
+    return export_enhanced_v2
@@ -0,0 +1,71 @@
+import asyncio
+import io
+
+import pytest
+
+
+@pytest.fixture
+def image():
+    Image = pytest.importorskip("PIL.Image")
+    out = io.BytesIO()
+    Image.new("RGB", (100, 200), "white").save(out, format="PNG")
+    return out.getvalue()
+
+
+def test_crop_inside_image(exporter, image):
+    from PIL import Image
+    crops = exporter.crop_images(image, [(10, 20, 60, 80)], 4)
+    with Image.open(io.BytesIO(crops[0])) as crop:
+        assert crop.size == (58, 68)
+
+
+def test_crop_rejects_boxes_outside_image(exporter, image):
+    boxes = [
+        (0, -50, 80, 30),     # ragt oben aus dem Bild (Chat-Container nach unten gescrollt)
+        (0, -120, 80, -40),   # komplett oberhalb
+        (-10, 20, 50, 60),    # ragt links heraus
+        (10, 150, 60, 250),   # ragt unten heraus
+        (10, 20, 60, 80),
+    ]
+    crops = exporter.crop_images(image, boxes, 4)
+    assert crops[:4] == [None, None, None, None]
+    assert crops[4] is not None
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    async def screenshot(self):
+        self.page.calls.append(("element", self.selector))
+        return b"element"
+
+
+class FakePage:
+    def __init__(self):
+        self.calls = []
+
+    async def screenshot(self, clip=None, full_page=False):
+        self.calls.append(("clip", clip))
+        return b"clip"
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+
+@pytest.mark.parametrize("y", [-50, -200])
+def test_keyword_screenshot_falls_back_for_negative_boxes(exporter, y):
+    page = FakePage()
+    target = {"marker": "3", "x": 10, "y": y, "width": 200, "height": 100}
+    found = {"width": 800, "height": 900}
+    assert asyncio.run(exporter.keyword_screenshot(page, target, found)) == b"element"
+    assert page.calls == [("element", '[data-export-kw="3"]')]
+
+
+def test_keyword_screenshot_clips_inside_document(exporter):
+    page = FakePage()
+    target = {"marker": "0", "x": 10, "y": 100, "width": 200, "height": 100}
+    found = {"width": 800, "height": 900}
+    assert asyncio.run(exporter.keyword_screenshot(page, target, found)) == b"clip"
+    assert page.calls[0][1]["y"] == 100 - exporter.KEYWORD_SCREENSHOT_PADDING
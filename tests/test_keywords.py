@@ -0,0 +1,54 @@
+import pytest
+
+# Erwartete Keywords stammen aus der ursprünglichen extract_auto_keywords-Implementierung
+GOLDEN = [
+    ("### User\n\nWie kann ich Bitwig Studio über einen MCP-Server steuern? Ich möchte OSC-Nachrichten "
+     "an Bitwig schicken.\n\n### Assistant\n\nFür Bitwig gibt es eine OSC-Erweiterung. Der MCP-Server "
+     "nimmt Befehle entgegen und schickt sie per OSC an Bitwig. Die Erweiterung muss in Bitwig aktiviert "
+     "werden.\n",
+     ["MCP", "OSC", "Bitwig", "Server", "Erweiterung"]),
+    ("### User\n\nWas kann man in Bad Sassendorf am Wochenende unternehmen? Wir sind mit Kindern "
+     "unterwegs.\n\n### Assistant\n\nIn Bad Sassendorf lohnt sich die Saline, der Kurpark und das "
+     "Westfälische Landwirtschaftsmuseum. Bei Regen ist die Therme eine gute Wahl. Von Soest aus ist "
+     "Bad Sassendorf schnell erreichbar.\n",
+     ["Bad", "Sassendorf", "User", "Wochenende", "Kindern"]),
+    ("### User\n\nHow do I parse JSON in Python and write it back to a file? The JSON file is large.\n\n"
+     "### Assistant\n\nUse the json module. For large JSON files consider streaming with ijson. Python "
+     "reads the file, json.loads parses it, and json.dump writes it back. The API is the same for files "
+     "and strings.\n",
+     ["JSON", "User", "How", "Python", "Assistant"]),
+    ("### User\n\nthanks!\n\n### Assistant\n\nYou're welcome.\n",
+     ["User", "Assistant", "You"]),
+    ("### User\n\nKannst du mir den Unterschied zwischen REST und GraphQL erklären? Mein Team nutzt "
+     "REST, aber GraphQL klingt interessant.\n\n### Assistant\n\nREST arbeitet mit Ressourcen und "
+     "HTTP-Methoden, GraphQL mit einem Schema und einer Abfragesprache. Mit GraphQL holt der Client "
+     "genau die Felder, die er braucht. REST ist einfacher zu cachen. Für dein Team hängt die Wahl von "
+     "den Clients ab.\n",
+     ["REST", "Team", "User", "Kannst", "Unterschied"]),
+    ("", []),
+]
+
+@pytest.mark.parametrize("text, expected", GOLDEN)
+def test_extract_auto_keywords_golden(exporter, text, expected):
+    assert exporter.extract_auto_keywords(text, num_keywords=5) == expected
+
+def test_num_keywords_limits_result(exporter):
+    assert exporter.extract_auto_keywords(GOLDEN[1][0], num_keywords=3) == ["Bad", "Sassendorf", "User"]
+
+@pytest.mark.parametrize("size", [20, 37, 64])
+def test_chunked_feed_matches_whole_text(exporter, size):
+    for text, expected in GOLDEN:
+        turns = []
+        for block in text.split("### ")[1:]:
+            who, _, body = block.partition("\n\n")
+            turns.append({"role": "user" if who == "User" else "assistant", "text": body.rstrip("\n")})
+        counts = exporter.AutoKeywords()
+        for chunk in exporter.markdown_chunks(turns, size):
+            counts.feed(chunk)
+        assert counts.keywords(5) == exporter.extract_auto_keywords(exporter.as_markdown(turns), 5)
+
+def test_batch_matches_single_calls(exporter):
+    texts = [text for text, _ in GOLDEN] * (exporter.KEYWORD_BATCH_MIN_PARALLEL // len(GOLDEN) + 1)
+    expected = [keywords for _, keywords in GOLDEN] * (len(texts) // len(GOLDEN))
+    assert exporter.extract_auto_keywords_batch(texts, max_workers=1) == expected
+    assert exporter.extract_auto_keywords_batch(texts, max_workers=2) == expected
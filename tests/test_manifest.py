@@ -0,0 +1,26 @@
+def test_interrupted_run_after_resume(exporter, tmp_path):
+    path = tmp_path / "manifest.jsonl"
+    export_a = tmp_path / "export_a"
+    export_b = tmp_path / "export_b"
+    export_a.mkdir()
+    export_b.mkdir()
+
+    manifest = exporter.ExportManifest(path)
+    manifest.begin_run("a", "export", export_a)
+    manifest.begin_run("b", "export", export_b)
+    manifest.finish_run(1)
+    # Lauf a wird fortgesetzt und bricht wieder ab - er ist jetzt der jüngste
+    manifest.begin_run("a", "export", export_a)
+
+    assert exporter.ExportManifest(path).interrupted_run("export")["run_id"] == "a"
+
+
+def test_no_interrupted_run_after_finish(exporter, tmp_path):
+    path = tmp_path / "manifest.jsonl"
+    manifest = exporter.ExportManifest(path)
+    manifest.begin_run("a", "export", tmp_path)
+    manifest.begin_run("b", "export", tmp_path)
+    manifest.run_id = "a"
+    manifest.finish_run(3)
+
+    assert exporter.ExportManifest(path).interrupted_run("export") is None
@@ -0,0 +1,49 @@
+import json
+import pathlib
+from types import SimpleNamespace
+
+FIXTURES = pathlib.Path(__file__).resolve().parent / "fixtures"
+
+def load_fixture(name):
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+def test_turns_follow_current_node_branch(exporter):
+    turns = exporter.turns_from_conversation_json(load_fixture("conversation_branched.json"))
+    
+    assert [(t["role"], t["text"]) for t in turns] == [
+        ("user", "Wie steuere ich die Heizung per MCP-Server?"),
+        ("assistant", "Du brauchst einen MCP-Server, der die Thermostat-API kapselt.\n\n"
+                      "1. Tool definieren\n2. Server starten"),
+        ("user", "Hier ein Foto vom Thermostat. Welche Python-Bibliothek passt?"),
+        ("assistant", "import xy200\nxy200.connect()"),
+    ]
+    assert [t["id"][-2:] for t in turns] == ["02", "03", "05", "07"]
+    assert turns[0]["create_time"] == 1733912401.5
+
+def test_discarded_branch_hidden_and_tool_messages_are_skipped(exporter):
+    texts = " ".join(t["text"] for t in exporter.turns_from_conversation_json(
+        load_fixture("conversation_branched.json")))
+    assert "Verworfene Frage" not in texts
+    assert "Thermostat erkannt" not in texts
+
+def test_other_current_node_selects_other_branch(exporter):
+    data = load_fixture("conversation_branched.json")
+    data["current_node"] = "b7e1c0de-0004-4000-8000-000000000004"
+    turns = exporter.turns_from_conversation_json(data)
+    assert turns[-1] == {"role": "user", "text": "Verworfene Frage (vor dem Bearbeiten)",
+                         "id": "b7e1c0de-0004-4000-8000-000000000004", "create_time": 1733912500.0}
+    assert len(turns) == 3
+
+def test_empty_payload_gives_no_turns(exporter):
+    assert exporter.turns_from_conversation_json({}) == []
+    assert exporter.turns_from_conversation_json({"mapping": {}, "current_node": "missing"}) == []
+
+def test_conversation_response_matches_api_url_only(exporter):
+    def response(url, method="GET"):
+        return SimpleNamespace(url=url, request=SimpleNamespace(method=method))
+    
+    conv_id = "6759a1b2-0c3d-800e-9f10-aa11bb22cc33"
+    assert exporter._is_conversation_response(response(f"http://127.0.0.1:8000/backend-api/conversation/{conv_id}"))
+    assert exporter._is_conversation_response(response(f"https://chatgpt.com/backend-api/conversation/{conv_id}?x=1"))
+    assert not exporter._is_conversation_response(response(f"https://chatgpt.com/backend-api/conversation/{conv_id}/stream_status"))
+    assert not exporter._is_conversation_response(response("https://chatgpt.com/backend-api/conversation", "POST"))
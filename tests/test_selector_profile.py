@@ -0,0 +1,22 @@
+def test_turn_selectors_keep_their_rank(exporter, tmp_path):
+    profile = exporter.SelectorProfile(tmp_path / "profile.json")
+    profile.record("turns", exporter.TURN_SELECTORS[1])
+    assert profile.order("turns", exporter.TURN_SELECTORS) == exporter.TURN_SELECTORS
+
+
+def test_project_link_selector_is_promoted(exporter, tmp_path):
+    profile = exporter.SelectorProfile(tmp_path / "profile.json")
+    selectors = exporter.PROJECT_LINK_SELECTORS
+    profile.record("project_link", selectors[2])
+    profile.save()
+    reloaded = exporter.SelectorProfile(tmp_path / "profile.json")
+    assert reloaded.order("project_link", selectors)[0] == selectors[2]
+
+
+def test_generic_selectors_are_never_learned(exporter, tmp_path):
+    profile = exporter.SelectorProfile(tmp_path / "profile.json")
+    selectors = exporter.PROJECT_LINK_SELECTORS
+    profile.record("project_link", selectors[-1])
+    assert profile.order("project_link", selectors) == selectors
+    profile.save()
+    assert not (tmp_path / "profile.json").exists()